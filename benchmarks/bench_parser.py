@@ -0,0 +1,67 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import HEADER, generate_history
+from i94calculator.us_days import parse_iso_date, parse_travel_log
+
+def legacy_parse_travel_log(travel_log):
+    # parse_travel_log as it was before the fast parser: per-line split()
+    # and strptime, with a list of all lines built up front
+    lines = [line for line in travel_log.strip().split('\n') if line.strip()]
+    if lines and (lines[0].lower().startswith('row') or 'date' in lines[0].lower()):
+        lines = lines[1:]
+    entries = []
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 4:
+            continue
+        try:
+            entries.append((datetime.strptime(parts[1], "%Y-%m-%d").date(), parts[2], parts[3]))
+        except Exception:
+            continue
+    entries.sort(key=lambda x: x[0])
+    return entries
+
+def make_export(target_bytes, seed=0):
+    # Concatenated synthetic histories, each newest first like the I-94 site
+    rng = random.Random(seed)
+    lines = [HEADER]
+    size = 0
+    while size < target_bytes:
+        history = generate_history(rng, trips_per_year=8, years=6)[1:]
+        lines.extend(history)
+        size += sum(len(line) + 1 for line in history)
+    return "\n".join(lines)
+
+def best_of(func, arg, repeat):
+    best = None
+    for _ in range(repeat):
+        parse_iso_date.cache_clear()
+        start = time.perf_counter()
+        result = func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare parse_travel_log with the old strptime-based parser.")
+    parser.add_argument("--megabytes", type=float, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'size':>8}  {'rows':>9}  {'legacy (s)':>10}  {'fast (s)':>9}  {'speedup':>7}")
+    for megabytes in args.megabytes:
+        export = make_export(int(megabytes * 1024 * 1024))
+        legacy_time, legacy_entries = best_of(legacy_parse_travel_log, export, args.repeat)
+        fast_time, fast_entries = best_of(parse_travel_log, export, args.repeat)
+        assert fast_entries == legacy_entries
+        print(f"{megabytes:>6}MB  {len(fast_entries):>9}  {legacy_time:>10.3f}  {fast_time:>9.3f}  {legacy_time / fast_time:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import io
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import HEADER, LOCATIONS
+from i94calculator.us_days import build_us_intervals, count_us_days, parse_iso_date, parse_travel_log
+from i94calculator.columnar import EntryStore
+from i94calculator.export import calendar_columns
+from i94calculator.incremental import IncrementalCalculator
+from i94calculator.ingest import group_combined_log
+from i94calculator.interval_index import IntervalIndex
+from i94calculator.reconcile import count_reconciled_days
+from i94calculator.store import HistoryStore, write_store
+from i94calculator.stream import count_us_days_streaming
+from i94calculator.timeline import DayTimeline
+
+# Runtime of each day-count engine on one history of n rows, for n from 10
+# to 10^6, with the same 'as of' queries at every size. Every engine's
+# counts are checked against count_us_days, and the growth exponent
+# (slope of log time against log n) is reported per engine:
+#
+#   python benchmarks/bench_scaling.py
+#   python benchmarks/bench_scaling.py --sizes 1000 10000 100000 --max-exponent 1.2
+#
+# Exits with status 1 if an engine disagrees with count_us_days or grows
+# faster than --max-exponent. Histories of 10^6 rows span thousands of
+# years, so they start in 1900 and run forward from there.
+
+QUERIES = 8
+START_DAY = date(1900, 1, 1)
+
+def make_log(rows, seed=0):
+    # Alternating Arrival/Departure rows, one or two days apart, newest first
+    rng = random.Random(seed)
+    day = START_DAY
+    history = []
+    for row in range(rows):
+        day += timedelta(days=rng.randint(1, 2))
+        history.append((day, "Arrival" if row % 2 == 0 else "Departure"))
+    lines = [HEADER]
+    for row, (day, typ) in enumerate(reversed(history), start=1):
+        lines.append(f"{row}\t{day.isoformat()}\t{typ}\t{rng.choice(LOCATIONS)}")
+    return "\n".join(lines)
+
+def query_dates(entries):
+    # Spread over the history, the last one after it
+    first, last = entries[0][0], entries[-1][0]
+    span = (last - first).days
+    return [first + timedelta(days=span * (i + 1) // QUERIES) for i in range(QUERIES - 1)] + \
+        [last + timedelta(days=30)]
+
+def engines(log, entries, dates, directory):
+    log_path = os.path.join(directory, "history.txt")
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.write(log)
+    combined = "TRAVELER\t" + log.replace("\n", "\nt\t")
+
+    def store():
+        path = os.path.join(directory, "history.i94")
+        write_store(path, [("t", entries)])
+        with HistoryStore(path) as opened:
+            return [opened.days_as_of("t", d) for d in dates]
+
+    def calendar():
+        _, counts = calendar_columns(entries, dates[0], dates[-1])
+        return [counts[(d - dates[0]).days] for d in dates]
+
+    def ingest():
+        grouped = group_combined_log(io.StringIO(combined))["t"]
+        return [count_us_days(grouped, d) for d in dates]
+
+    def index():
+        built = IntervalIndex.from_entries(entries)
+        return [built.days_as_of(d) for d in dates]
+
+    def incremental():
+        calculator = IncrementalCalculator(entries)
+        return [calculator.days_as_of(d) for d in dates]
+
+    def columnar():
+        columns = EntryStore.from_entries(entries)
+        return [count_us_days(columns, d) for d in dates]
+
+    return {
+        "count_us_days": lambda: [count_us_days(entries, d) for d in dates],
+        "timeline": lambda: [DayTimeline(build_us_intervals(entries, d)).days_as_of(d) for d in dates],
+        "interval_index": index,
+        "incremental": incremental,
+        "columnar": columnar,
+        "reconcile": lambda: [count_reconciled_days(entries, d) for d in dates],
+        "calendar_columns": calendar,
+        "stream": lambda: [count_us_days_streaming(log_path, d) for d in dates],
+        "store": store,
+        "ingest": ingest,
+    }
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        parse_iso_date.cache_clear()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def exponent(sizes, seconds):
+    # Least-squares slope of log(seconds) against log(rows), over sizes
+    # large enough for timer noise not to dominate
+    points = [(math.log(n), math.log(s)) for n, s in zip(sizes, seconds) if n >= 1000 and s > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    return (sum((x - mean_x) * (y - mean_y) for x, y in points) /
+            sum((x - mean_x) ** 2 for x, _ in points))
+
+def main():
+    parser = argparse.ArgumentParser(description="Runtime scaling and agreement of the day-count engines.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000, 1000000],
+                        help="history sizes in rows")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="run only these engines")
+    parser.add_argument("--max-exponent", type=float, default=1.3,
+                        help="fail if an engine's time grows faster than rows ** this (default: 1.3)")
+    parser.add_argument("--save", metavar="FILE", help="write the timings as JSON")
+    args = parser.parse_args()
+
+    timings = {}
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.sizes:
+            log = make_log(rows)
+            entries = parse_travel_log(log)
+            dates = query_dates(entries)
+            expected = None
+            for name, func in engines(log, entries, dates, directory).items():
+                if args.only and name not in args.only and name != "count_us_days":
+                    continue
+                seconds, counts = best_of(func, args.repeat)
+                if expected is None:
+                    expected = counts
+                elif counts != expected:
+                    print(f"FAIL: {name} disagrees with count_us_days at {rows} rows", file=sys.stderr)
+                    failed = True
+                timings.setdefault(name, {})[rows] = seconds
+                print(f"{rows:>9,} rows  {name:<18} {seconds:>10.5f}s", flush=True)
+
+    print(f"\n{'engine':<18}" + "".join(f"{rows:>11,}" for rows in args.sizes) + f"{'exponent':>10}")
+    for name, by_size in timings.items():
+        sizes = [rows for rows in args.sizes if rows in by_size]
+        slope = exponent(sizes, [by_size[rows] for rows in sizes])
+        print(f"{name:<18}" + "".join(f"{by_size[rows]:>10.4f}s" for rows in sizes) +
+              (f"{slope:>10.2f}" if slope is not None else f"{'-':>10}"))
+        if slope is not None and slope > args.max_exponent:
+            print(f"FAIL: {name} grows as rows ** {slope:.2f}", file=sys.stderr)
+            failed = True
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({name: {str(rows): round(s, 6) for rows, s in by_size.items()}
+                       for name, by_size in timings.items()}, f, indent=2)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
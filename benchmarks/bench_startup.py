@@ -0,0 +1,67 @@
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Measures what `python calculate_us_days_gui.py` imports before the window
+# can appear, using `python -X importtime`, and fails if it goes over the
+# budget or pulls in modules that should only load when a tab is shown:
+#
+#   python benchmarks/bench_startup.py --budget-ms 150
+#
+# Import times vary between runs, so the best of --repeat runs is used.
+
+DEFERRED = ("tkcalendar", "babel", "tabs.calculate_days_tab", "tabs.next_trip_tab",
+            "tabs.heatmap_tab")
+
+def import_times(module):
+    # Returns {module: (self_us, cumulative_us)} for one cold interpreter
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    top_level = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nested imports are indented; only top-level entries add up to the total
+        if not name.startswith("  "):
+            top_level += int(cumulative_us)
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times, top_level
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the GUI's startup import time against a budget.")
+    parser.add_argument("--module", default="calculate_us_days_gui")
+    parser.add_argument("--budget-ms", type=float, default=150)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="list the N slowest modules")
+    args = parser.parse_args()
+
+    best_total, best_times = None, None
+    for _ in range(args.repeat):
+        times, total = import_times(args.module)
+        if best_total is None or total < best_total:
+            best_total, best_times = total, times
+
+    print(f"{'module':<40} {'self ms':>8} {'cumul ms':>9}")
+    slowest = sorted(best_times.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{name:<40} {self_us / 1000:>8.2f} {cumulative_us / 1000:>9.2f}")
+    print(f"total: {best_total / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    eager = [name for name in best_times if name.startswith(DEFERRED)]
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}", file=sys.stderr)
+        failed = True
+    if best_total / 1000 > args.budget_ms:
+        print("FAIL: startup imports are over budget", file=sys.stderr)
+        failed = True
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
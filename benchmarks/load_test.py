@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_fleet
+from i94calculator.server import DEFAULT_PORT
+
+# Sends /days requests to a running server from many keep-alive connections
+# and reports throughput and latency percentiles:
+#
+#   python -m i94calculator.server --port 8094 &
+#   python benchmarks/load_test.py --port 8094 --connections 64 --requests 5000
+#
+# --unique-logs sets how many distinct histories are sent; a small number
+# means many identical requests in flight at once, which the server coalesces.
+
+async def client(host, port, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            writer.write(f"POST /days HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0].decode("latin-1"))
+    finally:
+        writer.close()
+
+async def run(args):
+    fleet = generate_fleet(args.unique_logs, seed=args.seed, years=args.years)
+    payloads = [json.dumps({"log": log, "as_of": args.as_of}).encode("utf-8") for log in fleet.values()]
+    per_connection = [[payloads[i % len(payloads)] for i in range(c, args.requests, args.connections)]
+                      for c in range(args.connections)]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, bodies, latencies, errors) for bodies in per_connection))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test a running day-count server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="total requests across all connections")
+    parser.add_argument("--unique-logs", type=int, default=100)
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--as-of", default="2025-01-01")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    elapsed, latencies, errors = asyncio.run(run(args))
+    if not latencies:
+        sys.exit("no requests were sent")
+    print(f"requests     {len(latencies):>10}")
+    print(f"errors       {len(errors):>10}")
+    print(f"seconds      {elapsed:>10.3f}")
+    print(f"requests/s   {len(latencies) / elapsed:>10.1f}")
+    for label, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        print(f"{label} ms       {percentile(latencies, fraction) * 1000:>10.2f}")
+    if errors:
+        print(f"first error: {errors[0]}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
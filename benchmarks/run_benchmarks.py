@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_fleet
+from i94calculator.us_days import (
+    parse_iso_date,
+    parse_travel_log,
+    build_us_intervals,
+    calculate_overlap_days,
+    count_us_days
+)
+from i94calculator.batch import calculate_days_batch
+from i94calculator.crossings import threshold_crossings
+from i94calculator.store import HistoryStore, build_store, iter_days_from_store
+
+# Times each stage of the us_days pipeline on a synthetic fleet. Results can
+# be saved as a JSON baseline and later runs compared against it:
+#
+#   python benchmarks/run_benchmarks.py --save baseline.json
+#   python benchmarks/run_benchmarks.py --compare baseline.json
+
+AS_OF_DATE = date(2025, 1, 1)
+
+def time_case(func, repeat):
+    best = None
+    for _ in range(repeat):
+        parse_iso_date.cache_clear()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run(args):
+    fleet = generate_fleet(args.travelers, seed=args.seed, trips_per_year=args.trips_per_year,
+                           years=args.years, malformed_rate=args.malformed_rate)
+    logs = list(fleet.values())
+    entries = [parse_travel_log(log) for log in logs]
+    intervals = [build_us_intervals(e, AS_OF_DATE) for e in entries]
+    window_start = AS_OF_DATE - timedelta(days=365)
+    rows = sum(len(e) for e in entries)
+
+    store_dir = tempfile.TemporaryDirectory()
+    store_path = os.path.join(store_dir.name, "fleet.i94")
+    build_store(store_path, fleet)
+
+    def query_store():
+        with HistoryStore(store_path) as store:
+            return list(iter_days_from_store(store, [AS_OF_DATE]))
+
+    cases = {
+        "parse_travel_log": lambda: [parse_travel_log(log) for log in logs],
+        "build_us_intervals": lambda: [build_us_intervals(e, AS_OF_DATE) for e in entries],
+        "calculate_overlap_days": lambda: [calculate_overlap_days(i, window_start, AS_OF_DATE) for i in intervals],
+        "end_to_end": lambda: [count_us_days(parse_travel_log(log), AS_OF_DATE) for log in logs],
+        "calculate_days_batch": lambda: calculate_days_batch(fleet, AS_OF_DATE),
+        "threshold_crossings": lambda: [threshold_crossings(i) for i in intervals],
+        "build_store": lambda: build_store(store_path, fleet),
+        "query_store": query_store,
+    }
+    results = {}
+    for name, func in cases.items():
+        if args.only and name not in args.only:
+            continue
+        seconds = time_case(func, args.repeat)
+        results[name] = {"seconds": round(seconds, 6), "rows_per_second": round(rows / seconds) if seconds else None}
+        print(f"{name:<24} {seconds:>9.4f}s  {results[name]['rows_per_second']:>12,} rows/s")
+    store_dir.cleanup()
+    return {
+        "params": {
+            "travelers": args.travelers,
+            "trips_per_year": args.trips_per_year,
+            "years": args.years,
+            "malformed_rate": args.malformed_rate,
+            "seed": args.seed,
+            "rows": rows,
+        },
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def compare(report, baseline, tolerance):
+    # Returns the names of cases that got slower than the baseline allows
+    if report["params"] != baseline["params"]:
+        print("warning: baseline was recorded with different parameters", file=sys.stderr)
+    regressions = []
+    for name, result in report["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        status = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        print(f"{name:<24} {old['seconds']:>9.4f}s -> {result['seconds']:>9.4f}s  ({ratio:.2f}x)  {status}")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the us_days pipeline on synthetic I-94 histories.")
+    parser.add_argument("--travelers", type=int, default=2000)
+    parser.add_argument("--trips-per-year", type=float, default=8)
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--malformed-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="run only these cases")
+    parser.add_argument("--save", metavar="FILE", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before a case counts as a regression (default: 0.25)")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
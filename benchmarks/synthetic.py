@@ -0,0 +1,51 @@
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+# Synthetic I-94 histories for benchmarks and tests. Output looks like a
+# paste from the I-94 website: a header row, then one row per arrival or
+# departure, newest first, tab-separated.
+
+HEADER = "Row\tDATE\tTYPE\tLOCATION"
+LOCATIONS = ["SFO", "LAX", "JFK", "SEA", "ATL", "CHI", "TOR", "VCV", "DMA", "PHI"]
+
+def _malformed_row(rng: random.Random, row: int, day: date) -> str:
+    kind = rng.randrange(3)
+    if kind == 0:
+        return f"{row}\t{day.year}-13-{rng.randint(32, 99)}\tArrival\t{rng.choice(LOCATIONS)}"
+    if kind == 1:
+        return f"{row}\t{day.isoformat()}\tDeparture"
+    return "#" * rng.randint(1, 20)
+
+def generate_history(rng: random.Random, trips_per_year: float = 6, years: float = 3,
+                     end: date = date(2025, 1, 1), malformed_rate: float = 0.0) -> List[str]:
+    # Trips alternate an Arrival and a Departure, with stays and gaps drawn
+    # so that about trips_per_year stays fit in each year of history
+    span = int(365 * years)
+    mean_cycle = 365 / trips_per_year
+    day = end - timedelta(days=span)
+    rows = []
+    while True:
+        day += timedelta(days=rng.randint(1, max(1, int(mean_cycle))))
+        if day >= end:
+            break
+        rows.append((day, "Arrival"))
+        day += timedelta(days=rng.randint(1, max(1, int(mean_cycle))))
+        if day >= end:
+            break
+        rows.append((day, "Departure"))
+    lines = [HEADER]
+    for row, (day, typ) in enumerate(reversed(rows), start=1):
+        if malformed_rate and rng.random() < malformed_rate:
+            lines.append(_malformed_row(rng, row, day))
+        else:
+            lines.append(f"{row}\t{day.isoformat()}\t{typ}\t{rng.choice(LOCATIONS)}")
+    return lines
+
+def generate_log(seed: Optional[int] = 0, **kwargs) -> str:
+    return "\n".join(generate_history(random.Random(seed), **kwargs))
+
+def generate_fleet(travelers: int, seed: int = 0, **kwargs) -> Dict[str, str]:
+    # kwargs are passed to generate_history for every traveler
+    rng = random.Random(seed)
+    return {f"traveler{i:06d}": "\n".join(generate_history(rng, **kwargs)) for i in range(travelers)}
@@ -1,16 +1,43 @@
+import importlib
 import tkinter as tk
 from tkinter import ttk
-from tabs.calculate_days_tab import create_calculate_days_tab
-from tabs.next_trip_tab import create_next_trip_tab
 
-root = tk.Tk()
-root.title("US Days Calculator")
+# Tabs are created empty and filled in the first time they are shown, so
+# the window appears before the tab modules (and tkcalendar, which loads
+# babel locale data) are imported. Each entry is the tab title, the module
+# and the function that fills an empty frame.
+TABS = [
+    ("Calculate Days", "tabs.calculate_days_tab", "populate_calculate_days_tab"),
+    ("Next Trip", "tabs.next_trip_tab", "populate_next_trip_tab"),
+    ("Heatmap", "tabs.heatmap_tab", "populate_heatmap_tab"),
+]
 
-notebook = ttk.Notebook(root)
-notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+def populate_tab(frame: tk.Frame, module_name: str, function_name: str) -> None:
+    module = importlib.import_module(module_name)
+    getattr(module, function_name)(frame)
 
-# Add tabs from separate files
-create_calculate_days_tab(notebook)
-create_next_trip_tab(notebook)
+def main() -> None:
+    root = tk.Tk()
+    root.title("US Days Calculator")
 
-root.mainloop()
+    notebook = ttk.Notebook(root)
+    notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    pending = {}
+    for title, module_name, function_name in TABS:
+        frame = tk.Frame(notebook)
+        notebook.add(frame, text=title)
+        pending[str(frame)] = (frame, module_name, function_name)
+
+    def on_tab_changed(event):
+        tab = pending.pop(notebook.select(), None)
+        if tab is not None:
+            # Let the window draw before the tab's imports run
+            root.update_idletasks()
+            populate_tab(*tab)
+
+    notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
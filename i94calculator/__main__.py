@@ -0,0 +1,5 @@
+import sys
+
+from i94calculator.cli import main
+
+sys.exit(main())
@@ -0,0 +1,63 @@
+import argparse
+import os
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from i94calculator.us_days import parse_travel_log, count_us_days
+from i94calculator.parallel import iter_days_parallel
+
+def calculate_days_batch(travel_logs: Mapping[str, str], as_of_date: date, window_days: int = 365,
+                         workers: int = 1) -> Dict[str, int]:
+    # workers > 1 (or None for one per CPU) spreads the logs over a process pool
+    if workers != 1:
+        results: Dict[str, int] = {}
+        for result in iter_days_parallel(travel_logs, [as_of_date], window_days, workers):
+            if result.error is not None:
+                raise ValueError(f"{result.traveler_id}: {result.error}")
+            results[result.traveler_id] = result.days[0]
+        return results
+    results = {}
+    for traveler_id, travel_log in travel_logs.items():
+        entries = parse_travel_log(travel_log)
+        results[traveler_id] = count_us_days(entries, as_of_date, window_days)
+    return results
+
+def iter_log_files(paths: Iterable[str]) -> Iterable[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                full_path = os.path.join(path, name)
+                if os.path.isfile(full_path) and not name.startswith('.'):
+                    yield full_path
+        else:
+            yield path
+
+def traveler_id_for_path(path: str) -> str:
+    # Travelers are keyed by file name without extension
+    return os.path.splitext(os.path.basename(path))[0]
+
+def traveler_files(paths: Iterable[str]) -> List[Tuple[str, str]]:
+    # (traveler ID, path) for every log file. Files with the same name stem
+    # (alice.txt and alice.csv, or alice.txt in two directories) would share
+    # a traveler ID and one would be lost, so that is an error.
+    files: Dict[str, str] = {}
+    for path in iter_log_files(paths):
+        traveler_id = traveler_id_for_path(path)
+        if traveler_id in files:
+            raise ValueError(f"duplicate traveler ID {traveler_id!r}: {files[traveler_id]} and {path}")
+        files[traveler_id] = path
+    return list(files.items())
+
+def parse_date_arg(value: str) -> date:
+    # argparse type for the YYYY-MM-DD dates every command-line tool takes
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date (expected YYYY-MM-DD): {value}")
+
+def load_travel_logs(paths: Iterable[str]) -> Dict[str, str]:
+    travel_logs: Dict[str, str] = {}
+    for traveler_id, path in traveler_files(paths):
+        with open(path, encoding="utf-8") as f:
+            travel_logs[traveler_id] = f.read()
+    return travel_logs
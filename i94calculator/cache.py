@@ -0,0 +1,68 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import date
+from typing import List, Tuple
+
+from i94calculator.us_days import parse_travel_log
+from i94calculator.incremental import IncrementalCalculator
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+def log_digest(travel_log: str) -> bytes:
+    return hashlib.blake2b(travel_log.encode("utf-8"), digest_size=16).digest()
+
+class LogCache:
+    # Memoizes parsing and interval building per raw log, keyed by a hash of
+    # its text, with least-recently-used eviction. Each cached log keeps its
+    # sorted entries and intervals, so queries for any 'as of' date reuse
+    # them instead of parsing and sorting again.
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._logs: "OrderedDict[bytes, IncrementalCalculator]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def calculator(self, travel_log: str) -> IncrementalCalculator:
+        # The cached calculator is shared; callers must not add rows to it
+        key = log_digest(travel_log)
+        with self._lock:
+            calculator = self._logs.get(key)
+            if calculator is not None:
+                self._logs.move_to_end(key)
+                self.hits += 1
+                return calculator
+            self.misses += 1
+        calculator = IncrementalCalculator(parse_travel_log(travel_log))
+        with self._lock:
+            self._logs[key] = calculator
+            self._logs.move_to_end(key)
+            while len(self._logs) > self.maxsize:
+                self._logs.popitem(last=False)
+        return calculator
+
+    def entries(self, travel_log: str) -> List[Tuple[date, str, str]]:
+        # Same as parse_travel_log(travel_log); the list is a copy
+        return list(self.calculator(travel_log).entries)
+
+    def intervals(self, travel_log: str, as_of_date: date) -> List[Tuple[date, date]]:
+        # Same as build_us_intervals(parse_travel_log(travel_log), as_of_date)
+        return self.calculator(travel_log).intervals_as_of(as_of_date)
+
+    def count_us_days(self, travel_log: str, as_of_date: date, window_days: int = 365) -> int:
+        return self.calculator(travel_log).days_as_of(as_of_date, window_days)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._logs))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._logs.clear()
+            self.hits = 0
+            self.misses = 0
+
+# Shared by the GUI tabs
+default_cache = LogCache()
@@ -0,0 +1,185 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from contextlib import nullcontext
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+from i94calculator.batch import iter_log_files, parse_date_arg, traveler_id_for_path, traveler_files
+from i94calculator.parallel import TravelerResult, iter_days_parallel
+from i94calculator.instrumentation import instrument
+from i94calculator.store import HistoryStore, iter_days_from_store
+from i94calculator.ingest import iter_combined_log, iter_ingested_days
+
+# Headless entry point (python -m i94calculator). Only the core modules are
+# imported here, never tkinter or the GUI tabs, so it starts quickly and
+# runs in containers and cron jobs.
+
+FIELDS = ["traveler", "as_of", "days", "days_remaining"]
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m i94calculator",
+        description="Count days spent in the US in the rolling window before one or more dates.")
+    parser.add_argument("paths", nargs="*",
+                        help="travel log files or directories of them (one traveler per file, named by file); "
+                             "'-' reads one log from stdin. With --store, traveler IDs (default: all)")
+    parser.add_argument("--combined", action="store_true",
+                        help="each file is a combined export of many travelers with a traveler ID column")
+    parser.add_argument("--partitions", type=int, metavar="N",
+                        help="with --combined, group rows through N spill files instead of in memory "
+                             "(for exports larger than memory)")
+    parser.add_argument("--store", metavar="FILE",
+                        help="read parsed histories from a store file (see python -m i94calculator.store)")
+    parser.add_argument("--as-of", type=parse_date_arg, action="append", default=[], metavar="DATE",
+                        help="'as of' date, may be repeated (default: today)")
+    parser.add_argument("--from", dest="date_from", type=parse_date_arg, metavar="DATE",
+                        help="first 'as of' date of a range")
+    parser.add_argument("--to", dest="date_to", type=parse_date_arg, metavar="DATE",
+                        help="last 'as of' date of a range (inclusive)")
+    parser.add_argument("--step", type=int, default=1, help="days between dates in a range (default: 1)")
+    parser.add_argument("--window", type=int, default=365, help="window length in days (default: 365)")
+    parser.add_argument("--limit", type=int, default=180, help="day limit for days_remaining (default: 180)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes; 0 means one per CPU (default: 1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-stage timings to stderr (stages run in worker processes are not included)")
+    parser.add_argument("--format", choices=["json", "jsonl", "csv"], default="json", help="output format")
+    parser.add_argument("--output", "-o", default="-", help="output file (default: stdout)")
+    return parser
+
+def as_of_dates(args: argparse.Namespace) -> List[date]:
+    dates = list(args.as_of)
+    if args.date_from or args.date_to:
+        day = args.date_from or args.date_to
+        last_day = args.date_to or args.date_from
+        while day <= last_day:
+            dates.append(day)
+            day += timedelta(days=args.step)
+    return dates or [date.today()]
+
+def iter_travel_logs(paths: List[str]) -> Iterator[Tuple[str, str]]:
+    # Files are read one at a time as the workers need them
+    for path in paths:
+        if path == "-":
+            yield "stdin", sys.stdin.read()
+            continue
+        for log_path in iter_log_files([path]):
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                yield traveler_id_for_path(log_path), f.read()
+
+def iter_combined_results(paths: List[str], dates: List[date], window_days: int,
+                          partitions: Optional[int]) -> Iterator[TravelerResult]:
+    for path in paths:
+        if path == "-":
+            yield from iter_ingested_days(sys.stdin, dates, window_days, partitions=partitions)
+            continue
+        for log_path in iter_log_files([path]):
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                yield from iter_ingested_days(f, dates, window_days, partitions=partitions)
+
+def check_combined_headers(paths: List[str]) -> None:
+    # iter_combined_log checks a file's header before its first row, so
+    # reading up to that row finds a bad header before any results are written
+    for log_path in iter_log_files([path for path in paths if path != "-"]):
+        with open(log_path, encoding="utf-8", errors="replace") as f:
+            try:
+                next(iter_combined_log(f), None)
+            except ValueError as e:
+                raise ValueError(f"{log_path}: {e}") from None
+
+def iter_results(results: Iterator[TravelerResult], dates: List[date], day_limit: int,
+                 errors: List[TravelerResult]) -> Iterator[dict]:
+    for result in results:
+        if result.error is not None:
+            errors.append(result)
+            continue
+        for as_of_date, days in zip(dates, result.days):
+            yield {
+                "traveler": result.traveler_id,
+                "as_of": as_of_date.isoformat(),
+                "days": days,
+                "days_remaining": max(day_limit - days, 0),
+            }
+
+def write_results(results: Iterator[dict], output_format: str, out: TextIO) -> None:
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(results)
+    elif output_format == "jsonl":
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+    else:
+        json.dump(list(results), out, indent=2)
+        out.write("\n")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.step < 1:
+        parser.error("--step must be at least 1")
+    if args.workers < 0:
+        parser.error("--workers must not be negative")
+    if args.date_from and args.date_to and args.date_from > args.date_to:
+        parser.error("--from must not be after --to")
+    if args.partitions is not None and (not args.combined or args.partitions < 1):
+        parser.error("--partitions needs --combined and must be at least 1")
+    if args.store:
+        if not os.path.exists(args.store):
+            parser.error(f"no such file: {args.store}")
+    elif not args.paths:
+        parser.error("no travel logs given")
+    else:
+        for path in args.paths:
+            if path != "-" and not os.path.exists(path):
+                parser.error(f"no such file or directory: {path}")
+        # Checked before any results are written
+        try:
+            if args.combined:
+                check_combined_headers(args.paths)
+            else:
+                traveler_files(path for path in args.paths if path != "-")
+        except ValueError as e:
+            parser.error(str(e))
+
+    store = None
+    if args.store:
+        try:
+            store = HistoryStore(args.store)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    dates = as_of_dates(args)
+    errors: List[TravelerResult] = []
+    with instrument() if args.profile else nullcontext() as recorder, \
+            store if store is not None else nullcontext():
+        if store is not None:
+            # Stored histories are already parsed, so they are counted in this process
+            results = iter_days_from_store(store, dates, args.window, args.paths or None)
+        elif args.combined:
+            # Rows are grouped and counted in this process as the file is read
+            results = iter_combined_results(args.paths, dates, args.window, args.partitions)
+        else:
+            results = iter_days_parallel(iter_travel_logs(args.paths), dates, args.window, args.workers or None)
+        rows = iter_results(results, dates, args.limit, errors)
+        try:
+            if args.output == "-":
+                write_results(rows, args.format, sys.stdout)
+            else:
+                with open(args.output, "w", encoding="utf-8", newline="") as out:
+                    write_results(rows, args.format, out)
+        except ValueError as e:
+            # Standard input cannot be checked up front; its header is
+            # checked when it is reached
+            if not (args.combined and "-" in args.paths):
+                raise
+            parser.error(f"-: {e}")
+    if recorder is not None:
+        sys.stderr.write(recorder.report() + "\n")
+    # Failed logs are reported after the others have been written
+    for result in errors:
+        sys.stderr.write(f"{parser.prog}: {result.traveler_id}: {result.error}\n")
+    return 1 if errors else 0
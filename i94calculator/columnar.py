@@ -0,0 +1,150 @@
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Compact column storage for parsed travel logs. Instead of one
+# (date, str, str) tuple per row, an EntryStore keeps three flat arrays:
+# int32 day ordinals, a 1-byte TYPE code and a LOCATION index into a port
+# table that can be shared by every traveler in a fleet. The arrays support
+# the buffer protocol, so numpy.frombuffer() can view them without copying.
+
+ARRIVAL = 0
+DEPARTURE = 1
+
+class StringTable:
+    # Assigns each distinct string a small integer code, in first-seen order
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+def new_type_table() -> StringTable:
+    # Arrival and Departure always get the codes ARRIVAL and DEPARTURE
+    return StringTable(["Arrival", "Departure"])
+
+class IntervalStore:
+    # (start, end) US intervals as two int32 ordinal columns. Indexing
+    # returns and accepts (date, date) tuples, so add_window_start_interval
+    # works on it unchanged.
+
+    def __init__(self):
+        self.starts = array('i')
+        self.ends = array('i')
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[Tuple[date, date]]) -> "IntervalStore":
+        store = cls()
+        for start, end in intervals:
+            store.append(start, end)
+        return store
+
+    def append(self, start: date, end: date) -> None:
+        self.starts.append(start.toordinal())
+        self.ends.append(end.toordinal())
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> Tuple[date, date]:
+        return (date.fromordinal(self.starts[i]), date.fromordinal(self.ends[i]))
+
+    def __setitem__(self, i: int, interval: Tuple[date, date]) -> None:
+        self.starts[i] = interval[0].toordinal()
+        self.ends[i] = interval[1].toordinal()
+
+    def to_intervals(self) -> List[Tuple[date, date]]:
+        fromordinal = date.fromordinal
+        return [(fromordinal(start), fromordinal(end)) for start, end in zip(self.starts, self.ends)]
+
+    def overlap_days(self, window_start: date, window_end: date) -> int:
+        # Same result as calculate_overlap_days on the tuple intervals
+        window_start_day = window_start.toordinal()
+        window_end_day = window_end.toordinal()
+        total_days = 0
+        for start, end in zip(self.starts, self.ends):
+            overlap_start = start if start > window_start_day else window_start_day
+            overlap_end = end if end < window_end_day else window_end_day
+            if overlap_start < overlap_end:
+                total_days += overlap_end - overlap_start
+        return total_days
+
+class EntryStore:
+    def __init__(self, ports: Optional[StringTable] = None, types: Optional[StringTable] = None):
+        self.days = array('i')
+        self.types = array('B')
+        self.locations = array('I')
+        self.ports = ports if ports is not None else StringTable()
+        self.type_table = types if types is not None else new_type_table()
+        # build_us_intervals compares TYPE codes with ARRIVAL and DEPARTURE
+        if self.type_table.values[:2] != ["Arrival", "Departure"]:
+            raise ValueError("type table must start with Arrival and Departure (see new_type_table)")
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Tuple[date, str, str]], ports: Optional[StringTable] = None,
+                     types: Optional[StringTable] = None) -> "EntryStore":
+        store = cls(ports, types)
+        store.extend(entries)
+        return store
+
+    def append(self, entry: Tuple[date, str, str]) -> None:
+        dt, typ, location = entry
+        type_code = self.type_table.codes.get(typ)
+        if type_code is None:
+            # Checked before the TYPE is added, so a failed append leaves the table as it was
+            if len(self.type_table) > 0xFF:
+                raise ValueError(f"too many distinct TYPE values to store in one byte: {typ!r}")
+            type_code = self.type_table.code(typ)
+        self.days.append(dt.toordinal())
+        self.types.append(type_code)
+        self.locations.append(self.ports.code(location))
+
+    def extend(self, entries: Iterable[Tuple[date, str, str]]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __getitem__(self, i: int) -> Tuple[date, str, str]:
+        return (date.fromordinal(self.days[i]), self.type_table[self.types[i]], self.ports[self.locations[i]])
+
+    def to_entries(self) -> List[Tuple[date, str, str]]:
+        fromordinal = date.fromordinal
+        type_names = self.type_table.values
+        port_names = self.ports.values
+        return [(fromordinal(day), type_names[typ], port_names[location])
+                for day, typ, location in zip(self.days, self.types, self.locations)]
+
+    def build_us_intervals(self, as_of_date: date) -> IntervalStore:
+        # Same state machine as us_days.build_us_intervals, on ordinals
+        as_of_day = as_of_date.toordinal()
+        intervals = IntervalStore()
+        in_us = False
+        last_day = 0
+        for day, typ in zip(self.days, self.types):
+            if day > as_of_day:
+                continue
+            if typ == ARRIVAL:
+                if not in_us:
+                    last_day = day
+                    in_us = True
+            elif typ == DEPARTURE:
+                if in_us:
+                    intervals.starts.append(last_day)
+                    intervals.ends.append(day)
+                    in_us = False
+        return intervals
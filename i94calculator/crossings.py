@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from i94calculator.us_days import parse_travel_log, build_us_intervals
+from i94calculator.timeline import DayTimeline
+
+# Finds every 'as of' date on which the rolling window count is over the
+# day limit, counted the way count_us_days counts: the window_days days
+# before the date. The whole rolling series comes from DayTimeline's prefix
+# sums in one pass, and runs over the limit are located with bytes.find
+# rather than a Python loop over the days.
+
+class Crossing(NamedTuple):
+    # first_day through last_day (inclusive) are the 'as of' dates with
+    # more than day_limit days in the window; the count peaks at peak_days
+    # on peak_day (the first such day if it peaks more than once)
+    first_day: date
+    last_day: date
+    peak_day: date
+    peak_days: int
+
+OVER = b"\x01"
+NOT_OVER = b"\x00"
+
+def threshold_crossings(intervals: Iterable[Tuple[date, date]], day_limit: int = 180, window_days: int = 365,
+                        planned_trips: Sequence[Tuple[date, date]] = ()) -> List[Crossing]:
+    # planned_trips are (start, end) pairs counted like the Next Trip tab
+    # counts a trip: start .. end - 1 in the US
+    timeline = DayTimeline(list(intervals) + list(planned_trips))
+    # A window can never hold more days than the whole timeline
+    if timeline.prefix[timeline.length] <= day_limit:
+        return []
+    first_day = timeline.first_day + timedelta(days=1)
+    last_day = timeline.last_day + timedelta(days=window_days)
+    counts = timeline.rolling_counts(first_day, last_day, window_days)
+    over = bytes(map(day_limit.__lt__, counts))
+
+    crossings = []
+    start = over.find(OVER)
+    while start >= 0:
+        stop = over.find(NOT_OVER, start)
+        if stop < 0:
+            stop = len(over)
+        peak_days = max(counts[start:stop])
+        peak = counts.index(peak_days, start, stop)
+        crossings.append(Crossing(first_day + timedelta(days=start), first_day + timedelta(days=stop - 1),
+                                  first_day + timedelta(days=peak), peak_days))
+        start = over.find(OVER, stop)
+    return crossings
+
+def crossings_for_entries(entries: List[Tuple[date, str, str]], day_limit: int = 180, window_days: int = 365,
+                          planned_trips: Sequence[Tuple[date, date]] = ()) -> List[Crossing]:
+    # Uses the intervals of the whole history; as in build_us_intervals, a
+    # stay with no departure yet is not counted
+    intervals = build_us_intervals(entries, max(e[0] for e in entries)) if entries else []
+    return threshold_crossings(intervals, day_limit, window_days, planned_trips)
+
+def first_crossing(entries: List[Tuple[date, str, str]], day_limit: int = 180, window_days: int = 365,
+                   planned_trips: Sequence[Tuple[date, date]] = ()) -> Optional[date]:
+    crossings = crossings_for_entries(entries, day_limit, window_days, planned_trips)
+    return crossings[0].first_day if crossings else None
+
+def iter_fleet_crossings(travel_logs: Union[Mapping[str, str], Iterable[Tuple[str, str]]], day_limit: int = 180,
+                         window_days: int = 365,
+                         planned_trips: Optional[Mapping[str, Sequence[Tuple[date, date]]]] = None
+                         ) -> Iterator[Tuple[str, List[Crossing]]]:
+    # Yields (traveler ID, crossings) for each traveler with at least one
+    # crossing; travelers that stay under the limit are skipped
+    if isinstance(travel_logs, Mapping):
+        travel_logs = travel_logs.items()
+    planned_trips = planned_trips or {}
+    for traveler_id, travel_log in travel_logs:
+        crossings = crossings_for_entries(parse_travel_log(travel_log), day_limit, window_days,
+                                          planned_trips.get(traveler_id, ()))
+        if crossings:
+            yield traveler_id, crossings
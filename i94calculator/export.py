@@ -0,0 +1,185 @@
+import argparse
+import csv
+import sys
+from array import array
+from datetime import date
+from itertools import repeat
+from operator import sub
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from i94calculator.us_days import build_us_intervals, parse_travel_log
+from i94calculator.timeline import DayTimeline
+from i94calculator.batch import parse_date_arg, traveler_files
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Writes a day-by-day calendar per traveler for reporting tools: one row
+# per traveler and date with
+#
+#   traveler      traveler ID
+#   date          the calendar date
+#   in_us         1 if the traveler was in the US that day (a stay covers
+#                 its arrival day up to the day before departure)
+#   rolling_days  count_us_days(entries, date), the days in the US in the
+#                 window before that date
+#
+# Each traveler's calendar comes from one DayTimeline sweep. Rows are
+# buffered in column arrays and written out every chunk_rows rows, so
+# memory stays bounded however many travelers and days are exported.
+#
+# Parquet and Arrow IPC files need pyarrow; without it "auto" writes CSV.
+
+FORMATS = ("auto", "parquet", "arrow", "csv")
+FIELDS = ["traveler", "date", "in_us", "rolling_days"]
+# date.toordinal() of 1970-01-01, the epoch of Arrow's date32
+UNIX_EPOCH_ORDINAL = 719163
+
+def calendar_columns(entries: List[Tuple[date, str, str]], first_day: date, last_day: date,
+                     window_days: int = 365) -> Tuple[bytes, array]:
+    # (in_us, rolling_days) for every day from first_day to last_day inclusive
+    count = last_day.toordinal() - first_day.toordinal() + 1
+    if count <= 0:
+        return b"", array('i')
+    intervals = build_us_intervals(entries, max(e[0] for e in entries)) if entries else []
+    timeline = DayTimeline(intervals)
+    first = first_day.toordinal()
+
+    offset = first - timeline.origin
+    head = min(max(-offset, 0), count)
+    tail = min(max(offset + count - timeline.length, 0), count - head)
+    in_us = b"\0" * head + bytes(map(bool, timeline.presence[offset + head:offset + count - tail])) + b"\0" * tail
+
+    counts = timeline.rolling_counts(first_day, last_day, window_days)
+    # count_us_days leaves out a stay that has not ended by the 'as of'
+    # date, so on days inside a stay take off what the timeline counted of it
+    for start, end in intervals:
+        a = max(start.toordinal() + 1, first)
+        b = min(end.toordinal(), first + count)
+        if a >= b:
+            continue
+        counted = range(a - start.toordinal(), b - start.toordinal())
+        ramp = map(min, counted, repeat(window_days))
+        counts[a - first:b - first] = array('i', map(sub, counts[a - first:b - first], ramp))
+    return in_us, counts
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file, lineterminator="\n")
+        self.writer.writerow(FIELDS)
+        # Every traveler covers the same dates, so each is formatted once
+        self.iso_dates: Dict[int, str] = {}
+
+    def _iso_date(self, day: int) -> str:
+        iso_date = self.iso_dates[day] = date.fromordinal(day).isoformat()
+        return iso_date
+
+    def write(self, travelers: List[str], days: array, in_us: bytearray, counts: array) -> None:
+        iso_dates = self.iso_dates
+        formatted = [iso_dates[day] if day in iso_dates else self._iso_date(day) for day in days]
+        self.writer.writerows(zip(travelers, formatted, in_us, counts))
+
+    def close(self) -> None:
+        self.file.close()
+
+class _ArrowWriter:
+    def __init__(self, path: str, output_format: str):
+        self.schema = pyarrow.schema([
+            ("traveler", pyarrow.string()),
+            ("date", pyarrow.date32()),
+            ("in_us", pyarrow.bool_()),
+            ("rolling_days", pyarrow.int32()),
+        ])
+        if output_format == "parquet":
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pyarrow.ipc.new_file(path, self.schema)
+
+    def write(self, travelers: List[str], days: array, in_us: bytearray, counts: array) -> None:
+        epoch_days = [day - UNIX_EPOCH_ORDINAL for day in days]
+        batch = pyarrow.record_batch([
+            pyarrow.array(travelers, pyarrow.string()),
+            pyarrow.array(epoch_days, pyarrow.date32()),
+            pyarrow.array(list(map(bool, in_us)), pyarrow.bool_()),
+            pyarrow.array(counts, pyarrow.int32()),
+        ], schema=self.schema)
+        self.writer.write_batch(batch)
+
+    def close(self) -> None:
+        self.writer.close()
+
+def resolve_format(output_format: str) -> str:
+    if output_format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    if output_format == "auto":
+        return "parquet" if pyarrow is not None else "csv"
+    if output_format != "csv" and pyarrow is None:
+        raise RuntimeError(f"writing {output_format} files needs pyarrow (pip install pyarrow)")
+    return output_format
+
+def export_calendar(path: str, histories: Iterable[Tuple[str, List[Tuple[date, str, str]]]], first_day: date,
+                    last_day: date, window_days: int = 365, output_format: str = "auto",
+                    chunk_rows: int = 1 << 16) -> str:
+    # Writes the calendar of every (traveler ID, entries) pair, such as
+    # ingest.iter_traveler_histories yields, and returns the format written
+    output_format = resolve_format(output_format)
+    writer = _CsvWriter(path) if output_format == "csv" else _ArrowWriter(path, output_format)
+    span = array('i', range(first_day.toordinal(), last_day.toordinal() + 1))
+    travelers: List[str] = []
+    days, in_us, counts = array('i'), bytearray(), array('i')
+    try:
+        for traveler_id, entries in histories:
+            traveler_in_us, traveler_counts = calendar_columns(entries, first_day, last_day, window_days)
+            travelers.extend(repeat(traveler_id, len(span)))
+            days.extend(span)
+            in_us.extend(traveler_in_us)
+            counts.extend(traveler_counts)
+            if len(days) >= chunk_rows:
+                writer.write(travelers, days, in_us, counts)
+                travelers, days, in_us, counts = [], array('i'), bytearray(), array('i')
+        if days:
+            writer.write(travelers, days, in_us, counts)
+    finally:
+        writer.close()
+    return output_format
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m i94calculator.export",
+                                     description="Write a day-by-day in-US calendar for every traveler.")
+    parser.add_argument("output", help="file to write")
+    parser.add_argument("paths", nargs="+", help="travel log files or directories of them (one traveler per file)")
+    parser.add_argument("--from", dest="date_from", type=parse_date_arg, required=True, metavar="DATE",
+                        help="first calendar date")
+    parser.add_argument("--to", dest="date_to", type=parse_date_arg, required=True, metavar="DATE",
+                        help="last calendar date (inclusive)")
+    parser.add_argument("--window", type=int, default=365, help="window length in days (default: 365)")
+    parser.add_argument("--format", choices=FORMATS, default="auto",
+                        help="file format; auto is Parquet if pyarrow is installed, else CSV")
+    args = parser.parse_args(argv)
+    if args.date_from > args.date_to:
+        parser.error("--from must not be after --to")
+    try:
+        files = traveler_files(args.paths)
+    except ValueError as e:
+        parser.error(str(e))
+
+    def iter_histories() -> Iterator[Tuple[str, List[Tuple[date, str, str]]]]:
+        for traveler_id, log_path in files:
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                yield traveler_id, parse_travel_log(f)
+
+    try:
+        written = export_calendar(args.output, iter_histories(), args.date_from, args.date_to, args.window,
+                                  args.format)
+    except RuntimeError as e:
+        parser.error(str(e))
+    sys.stderr.write(f"wrote {written} calendar to {args.output}\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from operator import itemgetter
+from typing import Iterable, List, Tuple
+
+from i94calculator.us_days import build_us_intervals, parse_travel_log_line
+
+class IncrementalCalculator:
+    # Keeps a traveler's entries sorted and their US intervals built, and
+    # updates both as rows arrive instead of re-parsing the whole history.
+    #
+    # The Arrival/Departure state machine in build_us_intervals forgets its
+    # past at every Departure: afterwards the traveler is outside the US no
+    # matter what came before. So a new row can only change the intervals
+    # between the last Departure before it and the first Departure after
+    # it; only that stretch is re-run and spliced into the interval list.
+
+    def __init__(self, entries: Iterable[Tuple[date, str, str]] = ()):
+        self.entries: List[Tuple[date, str, str]] = sorted(entries, key=itemgetter(0))
+        self._dates: List[date] = [e[0] for e in self.entries]
+        self.intervals: List[Tuple[date, date]] = (
+            build_us_intervals(self.entries, self._dates[-1]) if self.entries else [])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entry: Tuple[date, str, str]) -> None:
+        # Rows on the same date go after the existing ones, as in parse_travel_log's stable sort
+        position = bisect_right(self._dates, entry[0])
+        self._dates.insert(position, entry[0])
+        self.entries.insert(position, entry)
+        self._rebuild_around(position)
+
+    def add_line(self, line: str) -> bool:
+        parsed = parse_travel_log_line(line)
+        if parsed is None:
+            return False
+        self.add(parsed)
+        return True
+
+    def extend(self, entries: Iterable[Tuple[date, str, str]]) -> None:
+        for entry in entries:
+            self.add(entry)
+
+    def _is_reset_point(self, i: int) -> bool:
+        # A Departure that is the last row of its date: nothing after it
+        # depends on anything before it, and later dates are strictly greater
+        return self.entries[i][1] == "Departure" and self._dates[i + 1] > self._dates[i]
+
+    def _rebuild_around(self, position: int) -> None:
+        entries = self.entries
+        last = len(entries) - 1
+        first = position - 1
+        while first >= 0 and not self._is_reset_point(first):
+            first -= 1
+        stop = position + 1
+        while stop < last and not self._is_reset_point(stop):
+            stop += 1
+
+        region: List[Tuple[date, date]] = []
+        in_us = False
+        last_date = None
+        for dt, typ, _ in entries[first + 1:stop + 1]:
+            if typ == "Arrival":
+                if not in_us:
+                    last_date = dt
+                    in_us = True
+            elif typ == "Departure":
+                if in_us:
+                    region.append((last_date, dt))
+                    in_us = False
+
+        # Intervals before the region end on or before its first reset date,
+        # and intervals after it start after its last one
+        lo = bisect_right(self.intervals, (self._dates[first], date.max)) if first >= 0 else 0
+        hi = bisect_right(self.intervals, (self._dates[stop], date.max)) if stop < last else len(self.intervals)
+        self.intervals[lo:hi] = region
+
+    def intervals_as_of(self, as_of_date: date) -> List[Tuple[date, date]]:
+        # Same as build_us_intervals(entries, as_of_date): the intervals that
+        # start by as_of_date, minus a stay that is still open on that date
+        count = bisect_right(self.intervals, (as_of_date, date.max))
+        if count and self.intervals[count - 1][1] > as_of_date:
+            count -= 1
+        return self.intervals[:count]
+
+    def days_as_of(self, as_of_date: date, window_days: int = 365) -> int:
+        # Same as count_us_days(entries, as_of_date, window_days), looking
+        # only at the intervals that can touch the window
+        window_start = as_of_date - timedelta(days=window_days)
+        intervals = self.intervals
+        i = max(bisect_left(intervals, (window_start,)) - 1, 0)
+        total_days = 0
+        while i < len(intervals) and intervals[i][0] < as_of_date:
+            start, end = intervals[i]
+            # A stay still open on as_of_date is not counted, as in build_us_intervals
+            if end <= as_of_date:
+                overlap_start = max(start, window_start)
+                if overlap_start < end:
+                    total_days += (end - overlap_start).days
+            i += 1
+        return total_days
@@ -0,0 +1,155 @@
+import io
+import os
+import sys
+import tempfile
+import zlib
+from datetime import date
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from i94calculator.us_days import parse_iso_date, is_header_line
+from i94calculator.interval_index import IntervalIndex
+from i94calculator.parallel import TravelerResult
+
+# Reads combined exports that hold many travelers' rows, told apart by a
+# traveler ID column, e.g.
+#
+#   TRAVELER  Row  DATE        TYPE       LOCATION
+#   alice     1    2025-04-21  Departure  DMA
+#   bob       1    2025-04-19  Arrival    SFR
+#
+# The export is read once. Rows are grouped by traveler either in memory
+# or, for exports larger than memory, by hash-partitioning them into spill
+# files that are then grouped one at a time. Each traveler's rows come out
+# exactly as parse_travel_log would return them for that traveler alone.
+# Fields are split on whitespace, like parse_travel_log, so traveler IDs
+# cannot contain spaces.
+
+class Columns(NamedTuple):
+    # Zero-based column positions; the default is a traveler ID followed by
+    # the usual Row, DATE, TYPE and LOCATION columns
+    traveler: int = 0
+    date: int = 2
+    type: int = 3
+    location: int = 4
+
+TRAVELER_HEADERS = ("traveler", "traveler_id", "traveller", "employee", "employee_id", "person", "id")
+
+def detect_columns(header: str) -> Columns:
+    names = header.lower().split()
+    traveler = next((names.index(name) for name in TRAVELER_HEADERS if name in names), None)
+    if traveler is None:
+        raise ValueError(f"no traveler ID column in header: {header.strip()!r}")
+    # A header that places some columns must place them all; positions
+    # from the header are not mixed with the defaults
+    missing = [field.upper() for field in ("date", "type", "location") if field not in names]
+    if missing:
+        raise ValueError(f"no {', '.join(missing)} column in header: {header.strip()!r}")
+    return Columns(traveler, names.index("date"), names.index("type"), names.index("location"))
+
+def _is_data_row(line: str, columns: Columns) -> bool:
+    parts = line.split(None, max(columns) + 1)
+    return len(parts) > max(columns) and parse_iso_date(parts[columns.date]) is not None
+
+def iter_combined_log(source: Union[str, Iterable[str]],
+                      columns: Optional[Columns] = None) -> Iterator[Tuple[str, Tuple[date, str, str]]]:
+    # Yields (traveler ID, entry) in input order. Column positions come from
+    # `columns`, else from a header on the first non-blank line, else the
+    # Columns defaults. Malformed rows are skipped as parse_travel_log does.
+    lines = iter(io.StringIO(source) if isinstance(source, str) else source)
+    first = []
+    for line in lines:
+        if not line.strip():
+            continue
+        # Traveler IDs are free-form ("Rowan", "candidate7"), so a line that
+        # parses as a row is a row even if is_header_line would call it a header
+        if _is_data_row(line, columns or Columns()):
+            first.append(line)
+        elif is_header_line(line) or any(name in line.lower().split() for name in TRAVELER_HEADERS):
+            if columns is None:
+                columns = detect_columns(line)
+        break
+    columns = columns or Columns()
+    traveler_col, date_col, type_col, location_col = columns
+    width = max(columns) + 1
+    parse_date = parse_iso_date
+    intern = sys.intern
+    for rows in (first, lines):
+        for line in rows:
+            parts = line.split(None, width)
+            if len(parts) < width:
+                continue
+            dt = parse_date(parts[date_col])
+            if dt is not None:
+                yield parts[traveler_col], (dt, intern(parts[type_col]), intern(parts[location_col]))
+
+def _sorted_groups(groups: Dict[str, List[Tuple[date, str, str]]]) -> Iterator[Tuple[str, List[Tuple[date, str, str]]]]:
+    for traveler_id, entries in groups.items():
+        # Stable, so same-day rows keep their file order as in parse_travel_log
+        entries.sort(key=itemgetter(0))
+        yield traveler_id, entries
+
+def group_combined_log(source: Union[str, Iterable[str]],
+                       columns: Optional[Columns] = None) -> Dict[str, List[Tuple[date, str, str]]]:
+    # Traveler ID -> entries, in order of each traveler's first row
+    groups: Dict[str, List[Tuple[date, str, str]]] = {}
+    for traveler_id, entry in iter_combined_log(source, columns):
+        entries = groups.get(traveler_id)
+        if entries is None:
+            entries = groups[traveler_id] = []
+        entries.append(entry)
+    return dict(_sorted_groups(groups))
+
+def iter_partitioned(source: Union[str, Iterable[str]], partitions: int = 64, columns: Optional[Columns] = None,
+                     directory: Optional[str] = None) -> Iterator[Tuple[str, List[Tuple[date, str, str]]]]:
+    # Like group_combined_log for exports that do not fit in memory. Parsed
+    # rows are spread over `partitions` spill files (in a temporary
+    # directory under `directory`) by a hash of the traveler ID, so each
+    # traveler lands in one file; only one file's groups are held at a
+    # time. Travelers come out partition by partition.
+    if partitions < 1:
+        raise ValueError("partitions must be at least 1")
+    with tempfile.TemporaryDirectory(prefix="i94-ingest-", dir=directory) as spill_dir:
+        spills = []
+        try:
+            for k in range(partitions):
+                spills.append(open(os.path.join(spill_dir, f"{k:04d}.tsv"), "w+", encoding="utf-8", newline="\n"))
+            crc32 = zlib.crc32
+            for traveler_id, (dt, typ, location) in iter_combined_log(source, columns):
+                spills[crc32(traveler_id.encode("utf-8")) % partitions].write(
+                    f"{traveler_id}\t{dt.toordinal()}\t{typ}\t{location}\n")
+
+            fromordinal = date.fromordinal
+            intern = sys.intern
+            for spill in spills:
+                spill.seek(0)
+                groups: Dict[str, List[Tuple[date, str, str]]] = {}
+                for line in spill:
+                    traveler_id, day, typ, location = line.rstrip("\n").split("\t")
+                    entries = groups.get(traveler_id)
+                    if entries is None:
+                        entries = groups[traveler_id] = []
+                    entries.append((fromordinal(int(day)), intern(typ), intern(location)))
+                spill.close()
+                yield from _sorted_groups(groups)
+        finally:
+            for spill in spills:
+                spill.close()
+
+def iter_traveler_histories(source: Union[str, Iterable[str]], columns: Optional[Columns] = None,
+                            partitions: Optional[int] = None,
+                            directory: Optional[str] = None) -> Iterator[Tuple[str, List[Tuple[date, str, str]]]]:
+    # (traveler ID, entries) pairs, grouped in memory unless `partitions`
+    # is given. The pairs can go straight to store.write_store.
+    if partitions is None:
+        return iter(group_combined_log(source, columns).items())
+    return iter_partitioned(source, partitions, columns, directory)
+
+def iter_ingested_days(source: Union[str, Iterable[str]], as_of_dates: Sequence[date], window_days: int = 365,
+                       columns: Optional[Columns] = None, partitions: Optional[int] = None,
+                       directory: Optional[str] = None) -> Iterator[TravelerResult]:
+    # Day counts for every traveler in a combined export, as
+    # iter_days_parallel gives for separate logs
+    for traveler_id, entries in iter_traveler_histories(source, columns, partitions, directory):
+        index = IntervalIndex.from_entries(entries)
+        yield TravelerResult(traveler_id, tuple(index.days_as_of(as_of_date, window_days) for as_of_date in as_of_dates))
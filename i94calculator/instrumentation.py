@@ -0,0 +1,110 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Opt-in timing for the us_days pipeline. While an instrument() block is
+# active, parse_travel_log, build_us_intervals and calculate_overlap_days
+# report each stage to the active Recorder. Outside such a block the only
+# cost is one check of `active` per call.
+#
+#     with instrument() as recorder:
+#         count_us_days(parse_travel_log(log), as_of_date)
+#     print(recorder.report())
+#
+# The recorder is process-wide, so calls made from worker threads are
+# recorded too; worker processes are not.
+
+class StageRecord(NamedTuple):
+    stage: str
+    seconds: float
+    rows_in: int = 0
+    rows_out: int = 0
+    rejected: int = 0
+    # Net bytes still allocated when the stage ended; 0 unless allocations are tracked
+    allocated_bytes: int = 0
+
+class StageStats:
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.rejected = 0
+        self.allocated_bytes = 0
+
+    def add(self, record: StageRecord) -> None:
+        self.calls += 1
+        self.seconds += record.seconds
+        self.rows_in += record.rows_in
+        self.rows_out += record.rows_out
+        self.rejected += record.rejected
+        self.allocated_bytes += record.allocated_bytes
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rejected": self.rejected,
+            "allocated_bytes": self.allocated_bytes,
+        }
+
+class Recorder:
+    def __init__(self, callback: Optional[Callable[[StageRecord], None]] = None,
+                 track_allocations: bool = False):
+        self.callback = callback
+        self.track_allocations = track_allocations
+        self.stages: Dict[str, StageStats] = {}
+
+    def begin(self) -> Tuple[float, int]:
+        traced = tracemalloc.get_traced_memory()[0] if self.track_allocations else 0
+        return time.perf_counter(), traced
+
+    def end(self, stage: str, token: Tuple[float, int], rows_in: int = 0, rows_out: int = 0,
+            rejected: int = 0) -> StageRecord:
+        seconds = time.perf_counter() - token[0]
+        allocated = tracemalloc.get_traced_memory()[0] - token[1] if self.track_allocations else 0
+        record = StageRecord(stage, seconds, rows_in, rows_out, rejected, allocated)
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats(stage)
+        stats.add(record)
+        if self.callback is not None:
+            self.callback(record)
+        return record
+
+    def as_dict(self) -> Dict[str, dict]:
+        return {stage: stats.as_dict() for stage, stats in self.stages.items()}
+
+    def report(self) -> str:
+        lines: List[str] = [
+            f"{'stage':<24} {'calls':>7} {'seconds':>9} {'rows in':>9} {'rows out':>9} {'rejected':>8} {'alloc KiB':>10}"
+        ]
+        for stats in self.stages.values():
+            lines.append(
+                f"{stats.stage:<24} {stats.calls:>7} {stats.seconds:>9.4f} {stats.rows_in:>9} "
+                f"{stats.rows_out:>9} {stats.rejected:>8} {stats.allocated_bytes / 1024:>10.1f}")
+        return "\n".join(lines)
+
+# The Recorder of the innermost active instrument() block, or None
+active: Optional[Recorder] = None
+
+@contextmanager
+def instrument(callback: Optional[Callable[[StageRecord], None]] = None,
+               track_allocations: bool = False) -> Iterator[Recorder]:
+    global active
+    recorder = Recorder(callback, track_allocations)
+    started_tracing = track_allocations and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    previous = active
+    active = recorder
+    try:
+        yield recorder
+    finally:
+        active = previous
+        if started_tracing:
+            tracemalloc.stop()
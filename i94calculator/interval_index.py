@@ -0,0 +1,101 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+class IntervalIndex:
+    # Sorted, non-overlapping US intervals held as day-ordinal arrays, with
+    # prefix sums of their lengths. Any [window_start, window_end) count is
+    # then two bisects and a subtraction instead of a walk over every
+    # interval.
+    #
+    # Overlapping input intervals are merged, so each day counts once
+    # (calculate_overlap_days counts a day once per interval covering it).
+    # The two agree on build_us_intervals output, which never overlaps.
+    # Touching intervals are kept apart so intervals_as_of can still
+    # return them as build_us_intervals would.
+
+    def __init__(self, intervals: Iterable[Tuple[date, date]] = ()):
+        self.starts = array('i')
+        self.ends = array('i')
+        for start, end in sorted((start.toordinal(), end.toordinal()) for start, end in intervals):
+            if end < start:
+                continue
+            if self.ends and start < self.ends[-1]:
+                if end > self.ends[-1]:
+                    self.ends[-1] = end
+                continue
+            self.starts.append(start)
+            self.ends.append(end)
+        # prefix[i] is the total length of the first i intervals
+        self.prefix = array('q', [0])
+        self.prefix.extend(accumulate(map(int.__sub__, self.ends, self.starts)))
+
+    @classmethod
+    def from_arrays(cls, starts: Sequence[int], ends: Sequence[int]) -> "IntervalIndex":
+        # Wraps ordinal columns that are already sorted and non-overlapping
+        # (such as memoryviews over a store file) without copying them
+        index = cls()
+        index.starts = starts
+        index.ends = ends
+        index.prefix.extend(accumulate(map(int.__sub__, ends, starts)))
+        return index
+
+    @classmethod
+    def from_entries(cls, entries: List[Tuple[date, str, str]]) -> "IntervalIndex":
+        # Indexes the whole history once; intervals_as_of and days_as_of then
+        # answer for any 'as of' date without rebuilding. Imported here
+        # because us_days delegates to this module.
+        from i94calculator.us_days import build_us_intervals
+        if not entries:
+            return cls()
+        return cls(build_us_intervals(entries, max(entry[0] for entry in entries)))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[date, date]]:
+        fromordinal = date.fromordinal
+        for start, end in zip(self.starts, self.ends):
+            yield fromordinal(start), fromordinal(end)
+
+    def __getitem__(self, i: int) -> Tuple[date, date]:
+        return date.fromordinal(self.starts[i]), date.fromordinal(self.ends[i])
+
+    def to_intervals(self) -> List[Tuple[date, date]]:
+        return list(self)
+
+    def _overlap(self, window_start: int, window_end: int, count: int) -> int:
+        # Days of the first `count` intervals inside [window_start, window_end)
+        if window_start >= window_end:
+            return 0
+        first = bisect_right(self.ends, window_start, 0, count)
+        last = bisect_left(self.starts, window_end, first, count)
+        if first >= last:
+            return 0
+        total_days = self.prefix[last] - self.prefix[first]
+        if self.starts[first] < window_start:
+            total_days -= window_start - self.starts[first]
+        if self.ends[last - 1] > window_end:
+            total_days -= self.ends[last - 1] - window_end
+        return total_days
+
+    def overlap_days(self, window_start: date, window_end: date) -> int:
+        return self._overlap(window_start.toordinal(), window_end.toordinal(), len(self.starts))
+
+    def _count_as_of(self, as_of_date: date) -> int:
+        # Intervals that have ended by as_of_date; a stay still open then is
+        # left out, as in build_us_intervals
+        return bisect_right(self.ends, as_of_date.toordinal())
+
+    def intervals_as_of(self, as_of_date: date) -> List[Tuple[date, date]]:
+        # Same as build_us_intervals(entries, as_of_date) for an index made
+        # with from_entries(entries)
+        return [self[i] for i in range(self._count_as_of(as_of_date))]
+
+    def days_as_of(self, as_of_date: date, window_days: int = 365) -> int:
+        # Same as count_us_days(entries, as_of_date, window_days) for an
+        # index made with from_entries(entries)
+        window_start = as_of_date - timedelta(days=window_days)
+        return self._overlap(window_start.toordinal(), as_of_date.toordinal(), self._count_as_of(as_of_date))
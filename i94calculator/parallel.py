@@ -0,0 +1,87 @@
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from i94calculator.us_days import parse_travel_log
+from i94calculator.interval_index import IntervalIndex
+
+# Runs the us_days pipeline for many travel logs across worker processes.
+# Logs are sent to the pool in chunks so per-task overhead is paid once per
+# chunk rather than once per traveler, and only a few chunks per worker are
+# in flight at a time, so memory stays bounded for very large batches.
+
+class TravelerResult(NamedTuple):
+    traveler_id: str
+    # One count per requested 'as of' date, or None if the log failed
+    days: Optional[Tuple[int, ...]]
+    error: Optional[str] = None
+
+def count_travelers(chunk: List[Tuple[str, str]], as_of_dates: Sequence[date],
+                    window_days: int = 365) -> List[TravelerResult]:
+    results = []
+    for traveler_id, travel_log in chunk:
+        try:
+            # Built once per log; each date is then a couple of bisects
+            index = IntervalIndex.from_entries(parse_travel_log(travel_log))
+            days = tuple(index.days_as_of(as_of_date, window_days) for as_of_date in as_of_dates)
+            results.append(TravelerResult(traveler_id, days))
+        except Exception as e:
+            # One bad log must not take down the rest of the batch
+            results.append(TravelerResult(traveler_id, None, f"{type(e).__name__}: {e}"))
+    return results
+
+def _chunks(travel_logs: Iterable[Tuple[str, str]], chunksize: int) -> Iterator[List[Tuple[str, str]]]:
+    iterator = iter(travel_logs)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_days_parallel(travel_logs: Union[Mapping[str, str], Iterable[Tuple[str, str]]], as_of_dates: Sequence[date],
+                       window_days: int = 365, workers: Optional[int] = None, chunksize: int = 256,
+                       executor: Optional[Executor] = None) -> Iterator[TravelerResult]:
+    # Yields one TravelerResult per log, in input order. `workers` defaults
+    # to the CPU count; workers=1 runs in this process without a pool.
+    if isinstance(travel_logs, Mapping):
+        travel_logs = travel_logs.items()
+    as_of_dates = tuple(as_of_dates)
+    workers = workers or os.cpu_count() or 1
+    if executor is None and workers == 1:
+        for chunk in _chunks(travel_logs, chunksize):
+            yield from count_travelers(chunk, as_of_dates, window_days)
+        return
+
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    pending: Deque = deque()
+    try:
+        for chunk in _chunks(travel_logs, chunksize):
+            pending.append((chunk, executor.submit(count_travelers, chunk, as_of_dates, window_days)))
+            if len(pending) >= 2 * workers:
+                yield from _chunk_results(*pending.popleft())
+        while pending:
+            yield from _chunk_results(*pending.popleft())
+    finally:
+        # Reached early if the caller stops iterating; drop queued chunks
+        for _, future in pending:
+            future.cancel()
+        if owns_executor:
+            executor.shutdown()
+
+def _chunk_results(chunk: List[Tuple[str, str]], future) -> List[TravelerResult]:
+    try:
+        return future.result()
+    except Exception as e:
+        # The whole chunk failed (e.g. a worker died); report it per log
+        error = f"{type(e).__name__}: {e}"
+        return [TravelerResult(traveler_id, None, error) for traveler_id, _ in chunk]
+
+def calculate_days_parallel(travel_logs: Union[Mapping[str, str], Iterable[Tuple[str, str]]],
+                            as_of_dates: Sequence[date], window_days: int = 365, workers: Optional[int] = None,
+                            chunksize: int = 256) -> List[TravelerResult]:
+    return list(iter_days_parallel(travel_logs, as_of_dates, window_days, workers, chunksize))
@@ -0,0 +1,119 @@
+from collections import deque
+from datetime import date, timedelta
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from i94calculator.us_days import build_us_intervals
+from i94calculator.timeline import DayTimeline
+
+class TripPlanner:
+    # Answers "how long can the next trip be" questions against one history.
+    # A trip from start to end counts the same way the Next Trip tab counts
+    # it: days start .. end - 1 are in the US. A trip fits if every rolling
+    # window that includes one of its days stays at or under day_limit.
+    # The history is turned into a DayTimeline once, so each check is a
+    # sweep over the affected windows, not a full recomputation.
+
+    def __init__(self, entries: List[Tuple[date, str, str]], day_limit: int = 180, window_days: int = 365):
+        self.day_limit = day_limit
+        self.window_days = window_days
+        intervals = build_us_intervals(entries, max(e[0] for e in entries)) if entries else []
+        self.timeline = DayTimeline(intervals)
+
+    def peak_days(self, trip_start: date, trip_end: date) -> int:
+        # Highest rolling count over the windows ending on trip_start + 1 day
+        # through trip_end + window_days, with the trip added to the history
+        first_day = trip_start + timedelta(days=1)
+        last_day = trip_end + timedelta(days=self.window_days)
+        base_counts = self.timeline.rolling_counts(first_day, last_day, self.window_days)
+        start = trip_start.toordinal()
+        end = trip_end.toordinal()
+        day = first_day.toordinal()
+        peak = 0
+        for base in base_counts:
+            overlap = min(end, day) - max(start, day - self.window_days)
+            count = base + overlap if overlap > 0 else base
+            if count > peak:
+                peak = count
+            day += 1
+        return peak
+
+    def trip_fits(self, trip_start: date, trip_end: date) -> bool:
+        return self.peak_days(trip_start, trip_end) <= self.day_limit
+
+    def max_trip_end(self, trip_start: date) -> Optional[date]:
+        # Latest end date for a trip starting on trip_start, or None if not
+        # even a one-day trip fits. Adding days never lowers a window count,
+        # so the answer is found by binary search. Trips are capped at
+        # day_limit days, the longest that can fit in a full window.
+        low = 1
+        high = self.day_limit
+        if high < low or not self.trip_fits(trip_start, trip_start + timedelta(days=low)):
+            return None
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.trip_fits(trip_start, trip_start + timedelta(days=middle)):
+                low = middle
+            else:
+                high = middle - 1
+        return trip_start + timedelta(days=low)
+
+    def earliest_trip_start(self, trip_days: int, not_before: date) -> Optional[date]:
+        # Earliest start on or after not_before for a trip of trip_days days.
+        # Past the last recorded stay plus one window the history no longer
+        # matters, so the search stops there.
+        #
+        # One sweep instead of a trip_fits call per start. For a trip of L
+        # days starting on s, the window ending on day d holds T(d) trip
+        # days: d - s while the trip is filling the window (d < s + a, with
+        # a = min(L, window)), then a, then falling back to 0 on day
+        # s + L + window. The trip fits when base(d) + T(d) <= day_limit on
+        # every one of those days, which is three sliding maxima over the
+        # base counts, of base + d, base and base - d.
+        if trip_days > self.day_limit:
+            return None
+        trip_days = max(trip_days, 0)
+        window = self.window_days
+        horizon = not_before
+        if self.timeline.last_day is not None:
+            horizon = max(horizon, self.timeline.last_day + timedelta(days=window + 1))
+        starts = (horizon - not_before).days + 1
+        a = min(trip_days, window)
+        b = max(trip_days, window)
+        # base[k] is the count for the window ending on not_before + k + 1 days
+        first_day = not_before + timedelta(days=1)
+        base = self.timeline.rolling_counts(first_day, first_day + timedelta(days=starts + trip_days + window - 2),
+                                            window)
+        rising = _sliding_max([count + k for k, count in enumerate(base)], a - 1, starts)
+        plateau = _sliding_max(base[max(a, 1) - 1:], b - max(a, 1) + 1, starts)
+        falling = _sliding_max([count - k for k, count in enumerate(base)][b:], a, starts)
+        limit = self.day_limit
+        for i in range(starts):
+            if rising[i] - i + 1 > limit or plateau[i] + a > limit or \
+                    falling[i] + i + trip_days + window - 1 > limit:
+                continue
+            return not_before + timedelta(days=i)
+        return None
+
+def _sliding_max(values: Sequence[int], width: int, count: int) -> List[float]:
+    # max(values[i:i + width]) for i in range(count), -inf for an empty range
+    if width <= 0:
+        return [float("-inf")] * count
+    result = []
+    window: Deque[int] = deque()
+    for j in range(count + width - 1):
+        while window and values[window[-1]] <= values[j]:
+            window.pop()
+        window.append(j)
+        if window[0] <= j - width:
+            window.popleft()
+        if j >= width - 1:
+            result.append(values[window[0]])
+    return result
+
+def max_trip_end(entries: List[Tuple[date, str, str]], trip_start: date, day_limit: int = 180,
+                 window_days: int = 365) -> Optional[date]:
+    return TripPlanner(entries, day_limit, window_days).max_trip_end(trip_start)
+
+def earliest_trip_start(entries: List[Tuple[date, str, str]], trip_days: int, not_before: date,
+                        day_limit: int = 180, window_days: int = 365) -> Optional[date]:
+    return TripPlanner(entries, day_limit, window_days).earliest_trip_start(trip_days, not_before)
@@ -0,0 +1,181 @@
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from i94calculator.us_days import parse_travel_log, add_window_start_interval, calculate_overlap_days
+from i94calculator.batch import parse_date_arg, traveler_files
+
+# Interval building for messy histories. build_reconciled_intervals runs the
+# same single pass as build_us_intervals, but every row that does not fit
+# the Arrival/Departure alternation is reported as an Anomaly, and how it
+# is resolved is chosen by a ReconcilePolicy. The default policy resolves
+# everything the way build_us_intervals does, so its intervals are the
+# same; only the report is new.
+
+# Anomaly kinds
+DOUBLE_ARRIVAL = "double_arrival"          # Arrival while already in the US
+ORPHAN_DEPARTURE = "orphan_departure"      # Departure while not in the US
+SAME_DAY_PAIR = "same_day_pair"            # Arrival and Departure on one date
+MISSING_DEPARTURE = "missing_departure"    # Stay still open on the 'as of' date
+UNKNOWN_TYPE = "unknown_type"              # TYPE other than Arrival/Departure
+
+# double_arrival: keep the stay's first arrival, or restart it at the later one
+KEEP_FIRST = "keep_first"
+KEEP_LAST = "keep_last"
+# orphan_departure: ignore it, or count a stay from the previous event's date
+IGNORE = "ignore"
+SINCE_PREVIOUS = "since_previous"
+# same_day_order: take same-day rows in file order, or in the order that
+# fits the current state (Arrival first when outside, Departure first when
+# inside). Newest-first exports list a same-day pair the wrong way round.
+FILE_ORDER = "file_order"
+BY_STATE = "by_state"
+# open_stay: leave a stay with no departure uncounted, or count it up to
+# the 'as of' date
+EXCLUDE = "exclude"
+UNTIL_AS_OF = "until_as_of"
+
+class ReconcilePolicy(NamedTuple):
+    double_arrival: str = KEEP_FIRST
+    orphan_departure: str = IGNORE
+    same_day_order: str = FILE_ORDER
+    open_stay: str = EXCLUDE
+
+DEFAULT_POLICY = ReconcilePolicy()
+# Orders same-day pairs by state, counts an orphan departure's stay from
+# the previous event and an open stay up to the 'as of' date
+STRICT_POLICY = ReconcilePolicy(KEEP_FIRST, SINCE_PREVIOUS, BY_STATE, UNTIL_AS_OF)
+
+class Anomaly(NamedTuple):
+    kind: str
+    date: date
+    # Position of the row in the entries list
+    row: int
+    detail: str = ""
+
+class Reconciliation(NamedTuple):
+    intervals: List[Tuple[date, date]]
+    anomalies: List[Anomaly]
+
+def _check_policy(policy: ReconcilePolicy) -> None:
+    for field, allowed in (("double_arrival", (KEEP_FIRST, KEEP_LAST)), ("orphan_departure", (IGNORE, SINCE_PREVIOUS)),
+                           ("same_day_order", (FILE_ORDER, BY_STATE)), ("open_stay", (EXCLUDE, UNTIL_AS_OF))):
+        if getattr(policy, field) not in allowed:
+            raise ValueError(f"{field} must be one of {', '.join(allowed)}, not {getattr(policy, field)!r}")
+
+def _by_state(group: List[int], entries: List[Tuple[date, str, str]], in_us: bool) -> List[int]:
+    # Alternates a same-day group's Arrivals and Departures starting with
+    # the one that fits the current state; leftovers and other rows follow
+    arrivals = [i for i in group if entries[i][1] == "Arrival"]
+    departures = [i for i in group if entries[i][1] == "Departure"]
+    first, second = (departures, arrivals) if in_us else (arrivals, departures)
+    ordered = []
+    for k in range(max(len(first), len(second))):
+        ordered.extend(first[k:k + 1])
+        ordered.extend(second[k:k + 1])
+    ordered.extend(i for i in group if entries[i][1] not in ("Arrival", "Departure"))
+    return ordered
+
+def build_reconciled_intervals(entries: List[Tuple[date, str, str]], as_of_date: date,
+                               policy: ReconcilePolicy = DEFAULT_POLICY) -> Reconciliation:
+    # entries must be sorted by date, as parse_travel_log returns them.
+    # Rows after as_of_date are not looked at. O(n): each row is visited
+    # once, plus once more within its date's group.
+    _check_policy(policy)
+    intervals: List[Tuple[date, date]] = []
+    anomalies: List[Anomaly] = []
+    in_us = False
+    last_date: Optional[date] = None
+    # Row of the Arrival that opened the current stay
+    opened_row = 0
+    previous_date: Optional[date] = None
+    count = len(entries)
+    i = 0
+    while i < count and entries[i][0] <= as_of_date:
+        day = entries[i][0]
+        j = i + 1
+        while j < count and entries[j][0] == day:
+            j += 1
+        group = list(range(i, j))
+        if j - i > 1:
+            types = {entries[k][1] for k in group}
+            if "Arrival" in types and "Departure" in types:
+                anomalies.append(Anomaly(SAME_DAY_PAIR, day, i, f"{j - i} rows"))
+                if policy.same_day_order == BY_STATE:
+                    group = _by_state(group, entries, in_us)
+        for k in group:
+            typ = entries[k][1]
+            if typ == "Arrival":
+                if not in_us:
+                    last_date = day
+                    opened_row = k
+                    in_us = True
+                else:
+                    anomalies.append(Anomaly(DOUBLE_ARRIVAL, day, k, f"in the US since {last_date}"))
+                    if policy.double_arrival == KEEP_LAST:
+                        last_date = day
+                        opened_row = k
+            elif typ == "Departure":
+                if in_us:
+                    intervals.append((last_date, day))
+                    in_us = False
+                else:
+                    anomalies.append(Anomaly(ORPHAN_DEPARTURE, day, k))
+                    if policy.orphan_departure == SINCE_PREVIOUS:
+                        intervals.append((previous_date or day, day))
+            else:
+                anomalies.append(Anomaly(UNKNOWN_TYPE, day, k, typ))
+            previous_date = day
+        i = j
+    if in_us:
+        anomalies.append(Anomaly(MISSING_DEPARTURE, last_date, opened_row, f"open on {as_of_date}"))
+        if policy.open_stay == UNTIL_AS_OF:
+            intervals.append((last_date, as_of_date))
+    return Reconciliation(intervals, anomalies)
+
+def count_reconciled_days(entries: List[Tuple[date, str, str]], as_of_date: date, window_days: int = 365,
+                          policy: ReconcilePolicy = DEFAULT_POLICY) -> int:
+    # count_us_days with the intervals from build_reconciled_intervals
+    window_start = as_of_date - timedelta(days=window_days)
+    intervals = build_reconciled_intervals(entries, as_of_date, policy).intervals
+    intervals = add_window_start_interval(entries, intervals, window_start)
+    return calculate_overlap_days(intervals, window_start, as_of_date)
+
+def iter_fleet_anomalies(travel_logs: Union[Mapping[str, str], Iterable[Tuple[str, str]]], as_of_date: date,
+                         policy: ReconcilePolicy = DEFAULT_POLICY) -> Iterator[Tuple[str, Reconciliation]]:
+    # (traveler ID, reconciliation) for each traveler with at least one anomaly
+    if isinstance(travel_logs, Mapping):
+        travel_logs = travel_logs.items()
+    for traveler_id, travel_log in travel_logs:
+        reconciliation = build_reconciled_intervals(parse_travel_log(travel_log), as_of_date, policy)
+        if reconciliation.anomalies:
+            yield traveler_id, reconciliation
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m i94calculator.reconcile",
+                                     description="List anomalies in travel logs as JSON lines.")
+    parser.add_argument("paths", nargs="+", help="travel log files or directories of them (one traveler per file)")
+    parser.add_argument("--as-of", type=parse_date_arg, default=None, metavar="DATE",
+                        help="'as of' date (default: today)")
+    args = parser.parse_args(argv)
+    as_of_date = args.as_of or date.today()
+    try:
+        files = traveler_files(args.paths)
+    except ValueError as e:
+        parser.error(str(e))
+
+    def iter_logs():
+        for traveler_id, log_path in files:
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                yield traveler_id, f.read()
+
+    for traveler_id, reconciliation in iter_fleet_anomalies(iter_logs(), as_of_date):
+        for anomaly in reconciliation.anomalies:
+            sys.stdout.write(json.dumps({"traveler": traveler_id, "kind": anomaly.kind, "date": anomaly.date.isoformat(),
+                                         "row": anomaly.row, "detail": anomaly.detail}) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from fractions import Fraction
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from i94calculator.us_days import build_us_intervals
+from i94calculator.timeline import DayTimeline
+from i94calculator.interval_index import IntervalIndex
+
+class Rule(NamedTuple):
+    # A day-count rule evaluated 'as of' a date.
+    #
+    # Periods are either rolling windows of window_days ending on as_of_date
+    # or, with window_days=None, calendar years ending with the year of the
+    # day before as_of_date. weights[0] applies to the latest period,
+    # weights[1] to the one before it, and so on. The rule is met when the
+    # weighted total reaches threshold and the latest period has at least
+    # min_current_days; a threshold of None only reports the counts.
+    # inclusive=True counts the departure day as a day in the US too, as
+    # the IRS does; otherwise days are counted like count_us_days.
+    name: str
+    threshold: Optional[float] = None
+    window_days: Optional[int] = 365
+    weights: Tuple[float, ...] = (1,)
+    inclusive: bool = False
+    min_current_days: int = 0
+
+class RuleResult(NamedTuple):
+    name: str
+    total: float
+    # Unweighted days in each period, latest first
+    period_days: Tuple[int, ...]
+    met: Optional[bool]
+
+# More than 180 days in the rolling 365 days (the Next Trip tab limit)
+ROLLING_180_IN_365 = Rule("180 days in 365", threshold=181, window_days=365)
+# IRS substantial presence test: 31 days this year and 183 weighted days over three years
+SUBSTANTIAL_PRESENCE = Rule("substantial presence", threshold=183, window_days=None,
+                            weights=(1, Fraction(1, 3), Fraction(1, 6)), inclusive=True, min_current_days=31)
+CALENDAR_YEAR_TOTAL = Rule("calendar year total", window_days=None)
+
+DEFAULT_RULES = (ROLLING_180_IN_365, SUBSTANTIAL_PRESENCE, CALENDAR_YEAR_TOTAL)
+
+def _periods(rule: Rule, as_of_date: date) -> List[Tuple[date, date]]:
+    periods = []
+    if rule.window_days is None:
+        year = (as_of_date - timedelta(days=1)).year
+        for k in range(len(rule.weights)):
+            start = date(year - k, 1, 1)
+            periods.append((start, min(date(year - k + 1, 1, 1), as_of_date)))
+    else:
+        window = timedelta(days=rule.window_days)
+        end = as_of_date
+        for _ in rule.weights:
+            periods.append((end - window, end))
+            end -= window
+    return periods
+
+def evaluate_rules(intervals: List[Tuple[date, date]], as_of_date: date,
+                   rules: Sequence[Rule] = DEFAULT_RULES) -> List[RuleResult]:
+    # Builds at most two timelines from the intervals (one per counting
+    # convention) and answers every period of every rule from them
+    timelines: Dict[bool, DayTimeline] = {}
+    results = []
+    for rule in rules:
+        timeline = timelines.get(rule.inclusive)
+        if timeline is None:
+            if rule.inclusive:
+                one_day = timedelta(days=1)
+                # A departure and re-arrival on the same day make the widened
+                # intervals overlap on that day; IntervalIndex merges them so
+                # it is counted once
+                timeline = DayTimeline(IntervalIndex((start, end + one_day) for start, end in intervals))
+            else:
+                timeline = DayTimeline(intervals)
+            timelines[rule.inclusive] = timeline
+        period_days = tuple(timeline.days_in_window(start, end) for start, end in _periods(rule, as_of_date))
+        # Summed exactly, so a total of exactly the threshold (31 + 292/3 +
+        # 328/6 == 183) is not lost to float rounding; reported as a float
+        exact = sum(Fraction(weight) * days for weight, days in zip(rule.weights, period_days))
+        met = None
+        if rule.threshold is not None:
+            met = exact >= Fraction(rule.threshold) and period_days[0] >= rule.min_current_days
+        results.append(RuleResult(rule.name, float(exact), period_days, met))
+    return results
+
+def evaluate_rules_for_entries(entries: List[Tuple[date, str, str]], as_of_date: date,
+                               rules: Sequence[Rule] = DEFAULT_RULES) -> List[RuleResult]:
+    return evaluate_rules(build_us_intervals(entries, as_of_date), as_of_date, rules)
@@ -0,0 +1,94 @@
+from array import array
+from datetime import date
+from operator import add
+from typing import Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from i94calculator.us_days import build_us_intervals
+from i94calculator.timeline import DayTimeline
+from i94calculator.crossings import OVER
+
+# Compares candidate itineraries against one history. The history's rolling
+# series is computed once for the span every plan touches; each plan then
+# only adds the rolling counts of its own trips to its slice of that
+# series, instead of rebuilding the history with the trips appended.
+#
+# Trips count the way the Next Trip tab counts them (start .. end - 1 in
+# the US), and a plan is judged on the 'as of' dates from the day after
+# its first trip starts until a full window after its last trip ends.
+
+class Plan(NamedTuple):
+    name: str
+    # (start, end) pairs
+    trips: Tuple[Tuple[date, date], ...]
+
+class ScenarioResult(NamedTuple):
+    name: str
+    # Highest rolling count over the plan's dates, and the first date it is reached
+    peak_days: int
+    peak_day: date
+    # First date over day_limit, or None if the plan stays within it
+    first_violation: Optional[date]
+    days_remaining: int
+
+    @property
+    def fits(self) -> bool:
+        return self.first_violation is None
+
+def _plan_span(plan: Plan, window_days: int) -> Tuple[int, int]:
+    # First and last 'as of' ordinal the plan is judged on
+    if not plan.trips:
+        raise ValueError(f"plan {plan.name!r} has no trips")
+    for start, end in plan.trips:
+        if end <= start:
+            raise ValueError(f"plan {plan.name!r}: trip ending {end} does not start before it ends")
+    first = min(start for start, _ in plan.trips).toordinal() + 1
+    last = max(end for _, end in plan.trips).toordinal() + window_days
+    return first, last
+
+class ScenarioEvaluator:
+    def __init__(self, entries: List[Tuple[date, str, str]], day_limit: int = 180, window_days: int = 365):
+        self.day_limit = day_limit
+        self.window_days = window_days
+        intervals = build_us_intervals(entries, max(e[0] for e in entries)) if entries else []
+        self.timeline = DayTimeline(intervals)
+
+    def evaluate(self, plan: Plan) -> ScenarioResult:
+        return self.evaluate_all([plan], ranked=False)[0]
+
+    def evaluate_all(self, plans: Union[Iterable[Plan], Mapping[str, Sequence[Tuple[date, date]]]],
+                     ranked: bool = True) -> List[ScenarioResult]:
+        # Results are ranked best first: plans that fit before plans that
+        # do not, then by lower peak, then in the order given
+        if isinstance(plans, Mapping):
+            plans = [Plan(name, tuple(trips)) for name, trips in plans.items()]
+        plans = [Plan(plan.name, tuple(plan.trips)) for plan in plans]
+        if not plans:
+            return []
+        spans = [_plan_span(plan, self.window_days) for plan in plans]
+        origin = min(first for first, _ in spans)
+        base = self.timeline.rolling_counts(date.fromordinal(origin), date.fromordinal(max(last for _, last in spans)),
+                                            self.window_days)
+
+        results = []
+        for plan, (first, last) in zip(plans, spans):
+            delta = DayTimeline(plan.trips).rolling_counts(date.fromordinal(first), date.fromordinal(last),
+                                                           self.window_days)
+            counts = array('i', map(add, base[first - origin:last - origin + 1], delta))
+            peak_days = max(counts)
+            violation = bytes(map(self.day_limit.__lt__, counts)).find(OVER)
+            results.append(ScenarioResult(
+                plan.name,
+                peak_days,
+                date.fromordinal(first + counts.index(peak_days)),
+                date.fromordinal(first + violation) if violation >= 0 else None,
+                max(self.day_limit - peak_days, 0),
+            ))
+        if ranked:
+            order = sorted(range(len(results)), key=lambda i: (not results[i].fits, results[i].peak_days, i))
+            results = [results[i] for i in order]
+        return results
+
+def evaluate_plans(entries: List[Tuple[date, str, str]],
+                   plans: Union[Iterable[Plan], Mapping[str, Sequence[Tuple[date, date]]]],
+                   day_limit: int = 180, window_days: int = 365) -> List[ScenarioResult]:
+    return ScenarioEvaluator(entries, day_limit, window_days).evaluate_all(plans)
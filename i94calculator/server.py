@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, datetime
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from i94calculator.cache import log_digest
+from i94calculator.parallel import TravelerResult, count_travelers
+
+# A small HTTP/JSON service for day-count queries, built on asyncio and the
+# stdlib only. Calculations run in an executor (a process pool with
+# --workers), so the event loop keeps accepting requests while they run.
+# Identical /days requests that arrive while one is being calculated share
+# its result instead of being calculated again.
+#
+#   POST /days   {"log": "<pasted I-94 history>", "as_of": "2025-06-01"}
+#             -> {"days": 172}
+#   POST /batch  {"logs": {"alice": "...", "bob": "..."}, "as_of": ["2025-06-01", "2025-07-01"]}
+#             -> {"results": [{"traveler": "alice", "days": [172, 160], "error": null}, ...]}
+#   GET /health -> {"status": "ok"}
+#
+# "as_of" is one date or a list of dates (a list gives a list of counts),
+# and "window_days" is optional (default 365). The server binds to
+# 127.0.0.1 by default and has no authentication; do not expose it.
+
+DEFAULT_PORT = 8094
+
+class RequestError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _parse_dates(value) -> Tuple[Tuple[date, ...], bool]:
+    # Returns the dates and whether a single date (not a list) was given
+    single = not isinstance(value, list)
+    values = [value] if single else value
+    try:
+        return tuple(datetime.strptime(v, "%Y-%m-%d").date() for v in values), single
+    except (TypeError, ValueError):
+        raise RequestError(HTTPStatus.BAD_REQUEST, "'as_of' must be a YYYY-MM-DD date or a list of them")
+
+def _parse_window(payload: dict) -> int:
+    window_days = payload.get("window_days", 365)
+    if not isinstance(window_days, int) or window_days < 1:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "'window_days' must be a positive integer")
+    return window_days
+
+class DayCountServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, executor: Optional[Executor] = None,
+                 max_body_bytes: int = 64 << 20, chunksize: int = 256):
+        self.host = host
+        self.port = port
+        self.executor = executor
+        self.max_body_bytes = max_body_bytes
+        self.chunksize = chunksize
+        self.coalesced = 0
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Port 0 asks the OS for a free port; report the one actually bound
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _run(self, chunk: List[Tuple[str, str]], dates: Tuple[date, ...],
+                   window_days: int) -> List[TravelerResult]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, count_travelers, chunk, dates, window_days)
+
+    async def count_days(self, travel_log: str, dates: Tuple[date, ...], window_days: int) -> TravelerResult:
+        key = (log_digest(travel_log), dates, window_days)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return (await asyncio.shield(future))[0]
+        future = asyncio.ensure_future(self._run([("log", travel_log)], dates, window_days))
+        self._in_flight[key] = future
+        try:
+            return (await asyncio.shield(future))[0]
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def count_batch(self, travel_logs: List[Tuple[str, str]], dates: Tuple[date, ...],
+                          window_days: int) -> List[TravelerResult]:
+        chunks = [travel_logs[i:i + self.chunksize] for i in range(0, len(travel_logs), self.chunksize)]
+        results = await asyncio.gather(*(self._run(chunk, dates, window_days) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> dict:
+        if path == "/health":
+            if method != "GET":
+                raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET")
+            return {"status": "ok"}
+        if path not in ("/days", "/batch"):
+            raise RequestError(HTTPStatus.NOT_FOUND, f"unknown path: {path}")
+        if method != "POST":
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, "use POST")
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "request body must be a JSON object")
+        dates, single = _parse_dates(payload.get("as_of"))
+        window_days = _parse_window(payload)
+
+        if path == "/days":
+            travel_log = payload.get("log")
+            if not isinstance(travel_log, str):
+                raise RequestError(HTTPStatus.BAD_REQUEST, "'log' must be a string")
+            result = await self.count_days(travel_log, dates, window_days)
+            if result.error is not None:
+                raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY, result.error)
+            return {"days": result.days[0] if single else list(result.days)}
+
+        logs = payload.get("logs")
+        if not isinstance(logs, dict) or not all(isinstance(v, str) for v in logs.values()):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "'logs' must map traveler IDs to log strings")
+        results = await self.count_batch(list(logs.items()), dates, window_days)
+        return {"results": [{
+            "traveler": result.traveler_id,
+            "days": None if result.days is None else (result.days[0] if single else list(result.days)),
+            "error": result.error,
+        } for result in results]}
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise RequestError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "request headers too large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        if length < 0:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method, target.split("?", 1)[0], headers, body
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload = HTTPStatus.OK, await self._dispatch(method, path, body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:
+                    # E.g. a broken process pool; the client still gets an answer
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m i94calculator.server",
+                                     description="Serve day-count queries over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1, local only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="calculation processes (default: one per CPU; 1 uses threads in this process)")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    server = DayCountServer(args.host, args.port, executor)
+    sys.stderr.write(f"serving on http://{args.host}:{args.port}\n")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from i94calculator.batch import traveler_files
+from i94calculator.columnar import EntryStore, StringTable, new_type_table
+from i94calculator.interval_index import IntervalIndex
+from i94calculator.parallel import TravelerResult
+from i94calculator.us_days import parse_travel_log
+
+# Binary file of parsed travel logs for many travelers, so repeated batch
+# runs skip parsing. Opening a store maps the file into memory and reads
+# only the header; a traveler's rows are read when that traveler is
+# queried.
+#
+# Layout (little-endian, every section starts on a 4-byte boundary):
+#
+#   header       HEADER: magic, version, counts and section sizes
+#   travelers    RECORD per traveler, sorted by traveler ID: ID offset and
+#                length in the ID blob, first entry and entry count, first
+#                interval and interval count
+#   IDs          UTF-8 traveler IDs, back to back
+#   days         int32 day ordinal per entry
+#   locations    uint32 index into the port table per entry
+#   starts/ends  int32 day ordinals per interval
+#   types        uint8 index into the type table per entry
+#   strings      JSON {"types": [...], "ports": [...]}
+#
+# Entries are kept in parse_travel_log order. The intervals are those of
+# the whole history (as IntervalIndex.from_entries builds them), so any
+# 'as of' date is answered from them without replaying the entries.
+
+MAGIC = b"I94HIST\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQQQQ")
+RECORD_FIELDS = 6
+RECORD = struct.Struct(f"<{RECORD_FIELDS}I")
+UINT32_MAX = (1 << 32) - 1
+
+def _align(offset: int) -> int:
+    return (offset + 3) & ~3
+
+def _layout(travelers: int, entries: int, intervals: int, ids_size: int) -> Dict[str, int]:
+    # Start offset of each section; the string table follows "types"
+    offsets = {}
+    offset = HEADER.size
+    for name, size in (("travelers", travelers * RECORD.size), ("ids", ids_size), ("days", entries * 4),
+                       ("locations", entries * 4), ("starts", intervals * 4), ("ends", intervals * 4),
+                       ("types", entries), ("strings", 0)):
+        offset = _align(offset)
+        offsets[name] = offset
+        offset += size
+    return offsets
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder != "little":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+def write_store(path: str, histories: Union[Mapping[str, List[Tuple[date, str, str]]],
+                                            Iterable[Tuple[str, List[Tuple[date, str, str]]]]]) -> int:
+    # Writes parsed histories (traveler ID -> parse_travel_log output) to
+    # path and returns the number of travelers. A traveler ID given twice
+    # is an error.
+    if isinstance(histories, Mapping):
+        histories = histories.items()
+    ports, types = StringTable(), new_type_table()
+    stores: Dict[str, EntryStore] = {}
+    for traveler_id, entries in histories:
+        if traveler_id in stores:
+            raise ValueError(f"duplicate traveler ID: {traveler_id!r}")
+        stores[traveler_id] = EntryStore.from_entries(entries, ports, types)
+
+    records = array('I')
+    ids = bytearray()
+    columns = EntryStore(ports, types)
+    starts, ends = array('i'), array('i')
+    for traveler_id in sorted(stores, key=lambda t: t.encode("utf-8")):
+        store = stores[traveler_id]
+        encoded = traveler_id.encode("utf-8")
+        intervals = store.build_us_intervals(date.fromordinal(max(store.days))) if len(store) else None
+        record = (len(ids), len(encoded), len(columns.days), len(store),
+                  len(starts), len(intervals) if intervals is not None else 0)
+        # Checked before array('I') is given the record, which would raise
+        # OverflowError on its own; each section must also end within range
+        if max(record[0] + record[1], record[2] + record[3], record[4] + record[5]) > UINT32_MAX:
+            raise ValueError("too many entries for one store file")
+        records.extend(record)
+        ids += encoded
+        columns.days.extend(store.days)
+        columns.types.extend(store.types)
+        columns.locations.extend(store.locations)
+        if intervals is not None:
+            starts.extend(intervals.starts)
+            ends.extend(intervals.ends)
+
+    strings = json.dumps({"types": types.values, "ports": ports.values}).encode("utf-8")
+    offsets = _layout(len(stores), len(columns.days), len(starts), len(ids))
+    sections = [("travelers", _little_endian(records)), ("ids", bytes(ids)),
+                ("days", _little_endian(columns.days)), ("locations", _little_endian(columns.locations)),
+                ("starts", _little_endian(starts)), ("ends", _little_endian(ends)),
+                ("types", columns.types.tobytes()), ("strings", strings)]
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(stores), len(columns.days), len(starts), len(ids), len(strings)))
+        for name, data in sections:
+            f.write(b"\0" * (offsets[name] - f.tell()))
+            f.write(data)
+    return len(stores)
+
+def build_store(path: str, travel_logs: Union[Mapping[str, str], Iterable[Tuple[str, str]]]) -> int:
+    # Parses raw logs (traveler ID -> log text) and writes them to path
+    if isinstance(travel_logs, Mapping):
+        travel_logs = travel_logs.items()
+    return write_store(path, ((traveler_id, parse_travel_log(log)) for traveler_id, log in travel_logs))
+
+class HistoryStore:
+    # Read-only view of a file written by write_store. Columns are
+    # memoryviews over the mapped file (copied arrays on big-endian
+    # machines); entry_columns and interval_index return slices of them,
+    # which must be dropped before close().
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            # Also keeps mmap off empty files, which it refuses to map
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path}: not a travel history store")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, travelers, entries, intervals, ids_size, strings_size = HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: not a travel history store")
+            if version != VERSION:
+                raise ValueError(f"{path}: unsupported store version {version}")
+            offsets = _layout(travelers, entries, intervals, ids_size)
+            if len(self._mmap) < offsets["strings"] + strings_size:
+                raise ValueError(f"{path}: store file is truncated")
+        except Exception:
+            self._mmap.close()
+            raise
+        self.path = path
+        self.entry_count = entries
+        self.interval_count = intervals
+        self._views: List[memoryview] = []
+        self._records = self._column(offsets["travelers"], travelers * RECORD_FIELDS, 'I')
+        self._ids_offset = offsets["ids"]
+        self.days = self._column(offsets["days"], entries, 'i')
+        self.locations = self._column(offsets["locations"], entries, 'I')
+        self.starts = self._column(offsets["starts"], intervals, 'i')
+        self.ends = self._column(offsets["ends"], intervals, 'i')
+        self.types = self._column(offsets["types"], entries, 'B')
+        strings = json.loads(self._mmap[offsets["strings"]:offsets["strings"] + strings_size])
+        self.type_table = StringTable(strings["types"])
+        self.ports = StringTable(strings["ports"])
+        self._traveler_count = travelers
+
+    def _column(self, offset: int, count: int, typecode: str) -> Sequence[int]:
+        view = memoryview(self._mmap)[offset:offset + count * array(typecode).itemsize].cast(typecode)
+        if sys.byteorder == "little" or typecode == 'B':
+            self._views.append(view)
+            return view
+        column = array(typecode, view)
+        view.release()
+        column.byteswap()
+        return column
+
+    def close(self) -> None:
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._traveler_count
+
+    def _record(self, i: int) -> Sequence[int]:
+        return self._records[i * RECORD_FIELDS:(i + 1) * RECORD_FIELDS]
+
+    def _id_bytes(self, i: int) -> bytes:
+        id_offset, id_length = self._record(i)[:2]
+        start = self._ids_offset + id_offset
+        return self._mmap[start:start + id_length]
+
+    def traveler_ids(self) -> Iterator[str]:
+        for i in range(self._traveler_count):
+            yield self._id_bytes(i).decode("utf-8")
+
+    __iter__ = traveler_ids
+
+    def find(self, traveler_id: str) -> Optional[int]:
+        # Position of traveler_id in the sorted traveler table, or None
+        key = traveler_id.encode("utf-8")
+        lo, hi = 0, self._traveler_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._traveler_count and self._id_bytes(lo) == key:
+            return lo
+        return None
+
+    def __contains__(self, traveler_id: str) -> bool:
+        return self.find(traveler_id) is not None
+
+    def _lookup(self, traveler_id: str) -> Sequence[int]:
+        i = self.find(traveler_id)
+        if i is None:
+            raise KeyError(traveler_id)
+        return self._record(i)
+
+    def entry_columns(self, traveler_id: str) -> Tuple[Sequence[int], Sequence[int], Sequence[int]]:
+        # (days, types, locations) of one traveler, without copying
+        _, _, first, count, _, _ = self._lookup(traveler_id)
+        return (self.days[first:first + count], self.types[first:first + count],
+                self.locations[first:first + count])
+
+    def entries(self, traveler_id: str) -> List[Tuple[date, str, str]]:
+        # Same as parse_travel_log on the traveler's original log
+        days, types, locations = self.entry_columns(traveler_id)
+        fromordinal = date.fromordinal
+        type_names = self.type_table.values
+        port_names = self.ports.values
+        return [(fromordinal(day), type_names[typ], port_names[location])
+                for day, typ, location in zip(days, types, locations)]
+
+    def interval_index(self, traveler_id: str) -> IntervalIndex:
+        _, _, _, _, first, count = self._lookup(traveler_id)
+        return IntervalIndex.from_arrays(self.starts[first:first + count], self.ends[first:first + count])
+
+    def intervals_as_of(self, traveler_id: str, as_of_date: date) -> List[Tuple[date, date]]:
+        return self.interval_index(traveler_id).intervals_as_of(as_of_date)
+
+    def days_as_of(self, traveler_id: str, as_of_date: date, window_days: int = 365) -> int:
+        # Same as count_us_days(entries(traveler_id), as_of_date, window_days)
+        return self.interval_index(traveler_id).days_as_of(as_of_date, window_days)
+
+def _days_as_of(index: IntervalIndex, as_of_dates: Sequence[date], window_days: int) -> Tuple[int, ...]:
+    return tuple(index.days_as_of(as_of_date, window_days) for as_of_date in as_of_dates)
+
+def iter_days_from_store(store: HistoryStore, as_of_dates: Sequence[date], window_days: int = 365,
+                         traveler_ids: Optional[Iterable[str]] = None) -> Iterator[TravelerResult]:
+    # Like iter_days_parallel, for travelers in a store (all of them by
+    # default). Only the travelers asked for are read; an unknown ID gives
+    # an error result instead of stopping the batch.
+    for traveler_id in traveler_ids if traveler_ids is not None else store.traveler_ids():
+        try:
+            days = _days_as_of(store.interval_index(traveler_id), as_of_dates, window_days)
+        except KeyError:
+            yield TravelerResult(traveler_id, None, "not in store")
+            continue
+        # The index (and its views of the file) is gone before the caller
+        # resumes, so the store can be closed at any point
+        yield TravelerResult(traveler_id, days)
+
+def calculate_days_from_store(path: str, as_of_date: date, window_days: int = 365,
+                              traveler_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    # Store counterpart of calculate_days_batch
+    with HistoryStore(path) as store:
+        results = {}
+        for result in iter_days_from_store(store, [as_of_date], window_days, traveler_ids):
+            if result.error is not None:
+                raise KeyError(result.traveler_id)
+            results[result.traveler_id] = result.days[0]
+        return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m i94calculator.store",
+                                     description="Parse travel logs into a store file for fast batch queries.")
+    parser.add_argument("output", help="store file to write")
+    parser.add_argument("paths", nargs="+", help="travel log files or directories of them (one traveler per file)")
+    args = parser.parse_args(argv)
+    try:
+        files = traveler_files(args.paths)
+    except ValueError as e:
+        parser.error(str(e))
+
+    def iter_logs():
+        for traveler_id, log_path in files:
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                yield traveler_id, f.read()
+
+    travelers = build_store(args.output, iter_logs())
+    sys.stderr.write(f"wrote {travelers} travelers to {args.output}\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import mmap
+import os
+import tempfile
+from contextlib import ExitStack, contextmanager
+from datetime import date, timedelta
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from i94calculator.us_days import is_header_line, parse_travel_log_line
+
+# Streaming pipeline for exports too large to hold in memory. The file is
+# memory-mapped and read a line at a time, so only the current row (and rows
+# sharing its date) are held in Python objects. I-94 exports list the newest
+# row first; those files are read backwards so rows still come out oldest
+# first, in the same order parse_travel_log would sort them into.
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+_SPOOL_CHUNK = 1 << 20
+
+@contextmanager
+def _mapped(source: Source) -> Iterator[Optional[mmap.mmap]]:
+    with ExitStack() as stack:
+        if isinstance(source, (str, os.PathLike)):
+            f = stack.enter_context(open(source, 'rb'))
+        else:
+            f = source
+            try:
+                f.fileno()
+                mappable = f.seekable()
+            except (AttributeError, OSError, ValueError):
+                mappable = False
+            if not mappable:
+                # Pipes (e.g. stdin) and in-memory files are copied to a
+                # temporary file first, which keeps memory bounded as well
+                spool = stack.enter_context(tempfile.TemporaryFile())
+                reader = getattr(f, 'buffer', f)
+                while True:
+                    chunk = reader.read(_SPOOL_CHUNK)
+                    if not chunk:
+                        break
+                    spool.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+                spool.flush()
+                f = spool
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        stack.callback(mm.close)
+        yield mm
+
+def _iter_lines(mm: mmap.mmap, start: int, reverse: bool = False) -> Iterator[str]:
+    end = len(mm)
+    if reverse:
+        while end > start:
+            newline = mm.rfind(b'\n', start, end)
+            if newline < 0:
+                yield mm[start:end].decode('utf-8', 'replace')
+                break
+            yield mm[newline + 1:end].decode('utf-8', 'replace')
+            end = newline
+    else:
+        while start < end:
+            newline = mm.find(b'\n', start, end)
+            if newline < 0:
+                newline = end
+            yield mm[start:newline].decode('utf-8', 'replace')
+            start = newline + 1
+
+def _data_start(mm: mmap.mmap) -> int:
+    # Offset of the first row after an optional header on the first non-blank line
+    start = 0
+    end = len(mm)
+    while start < end:
+        newline = mm.find(b'\n', start, end)
+        if newline < 0:
+            newline = end
+        line = mm[start:newline].decode('utf-8', 'replace')
+        if line.strip():
+            return newline + 1 if is_header_line(line) else start
+        start = newline + 1
+    return end
+
+def _is_newest_first(mm: mmap.mmap, start: int) -> bool:
+    first_date = None
+    for line in _iter_lines(mm, start):
+        parsed = parse_travel_log_line(line)
+        if parsed is None:
+            continue
+        if first_date is None:
+            first_date = parsed[0]
+        elif parsed[0] != first_date:
+            return parsed[0] < first_date
+    return False
+
+def _check_order(previous: Optional[date], current: date) -> None:
+    if previous is not None and current < previous:
+        raise ValueError(
+            f"travel log is not in date order near {current}; use parse_travel_log for unsorted logs")
+
+def iter_sorted_travel_log(source: Source) -> Iterator[Tuple[date, str, str]]:
+    # Yields the same entries, in the same order, as parse_travel_log(text)
+    # for a log whose rows are in date order (oldest or newest first).
+    # `source` is a path or a binary/text file object, including stdin.
+    with _mapped(source) as mm:
+        if mm is None:
+            return
+        start = _data_start(mm)
+        previous = None
+        if not _is_newest_first(mm, start):
+            for line in _iter_lines(mm, start):
+                parsed = parse_travel_log_line(line)
+                if parsed:
+                    _check_order(previous, parsed[0])
+                    previous = parsed[0]
+                    yield parsed
+            return
+        # Rows sharing a date are buffered so they can be yielded in file
+        # order, matching the stable sort in parse_travel_log
+        same_day: List[Tuple[date, str, str]] = []
+        for line in _iter_lines(mm, start, reverse=True):
+            parsed = parse_travel_log_line(line)
+            if not parsed:
+                continue
+            if same_day and parsed[0] != same_day[0][0]:
+                yield from reversed(same_day)
+                same_day.clear()
+            _check_order(previous, parsed[0])
+            previous = parsed[0]
+            same_day.append(parsed)
+        yield from reversed(same_day)
+
+def iter_us_intervals(entries: Iterator[Tuple[date, str, str]], as_of_date: date) -> Iterator[Tuple[date, date]]:
+    # Streaming build_us_intervals for entries already in date order
+    in_us = False
+    last_date = None
+    for dt, typ, _ in entries:
+        if dt > as_of_date:
+            break
+        if typ == "Arrival":
+            if not in_us:
+                last_date = dt
+                in_us = True
+        elif typ == "Departure":
+            if in_us and last_date:
+                yield (last_date, dt)
+                in_us = False
+
+def stream_us_intervals(source: Source, as_of_date: date) -> Iterator[Tuple[date, date]]:
+    return iter_us_intervals(iter_sorted_travel_log(source), as_of_date)
+
+def count_us_days_streaming(source: Source, as_of_date: date, window_days: int = 365) -> int:
+    # Same result as count_us_days(parse_travel_log(text), as_of_date, window_days)
+    window_start = as_of_date - timedelta(days=window_days)
+    total_days = 0
+    for start, end in stream_us_intervals(source, as_of_date):
+        overlap_start = max(start, window_start)
+        overlap_end = min(end, as_of_date)
+        if overlap_start < overlap_end:
+            total_days += (overlap_end - overlap_start).days
+    return total_days
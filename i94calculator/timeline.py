@@ -0,0 +1,76 @@
+from array import array
+from datetime import date, timedelta
+from itertools import accumulate, repeat
+from operator import sub
+from typing import List, Optional, Tuple
+
+class DayTimeline:
+    # Day-indexed view of a list of US intervals (as returned by
+    # build_us_intervals). presence[i] is the number of intervals covering
+    # day origin + i, and prefix[i] is the number of US days before it, so
+    # any window count is two lookups instead of a walk over the intervals.
+
+    def __init__(self, intervals: List[Tuple[date, date]]):
+        spans = [(start.toordinal(), end.toordinal()) for start, end in intervals if start < end]
+        if spans:
+            self.origin = min(start for start, _ in spans)
+            self.length = max(end for _, end in spans) - self.origin
+        else:
+            self.origin = 0
+            self.length = 0
+        diff = [0] * (self.length + 1)
+        for start, end in spans:
+            diff[start - self.origin] += 1
+            diff[end - self.origin] -= 1
+        self.presence = array('i', accumulate(diff[:self.length]))
+        self.prefix = array('q', [0])
+        self.prefix.extend(accumulate(self.presence))
+
+    @property
+    def first_day(self) -> Optional[date]:
+        return date.fromordinal(self.origin) if self.length else None
+
+    @property
+    def last_day(self) -> Optional[date]:
+        return date.fromordinal(self.origin + self.length - 1) if self.length else None
+
+    def _cover(self, ordinal: int) -> int:
+        # Number of US days strictly before the given day ordinal
+        i = ordinal - self.origin
+        if i <= 0:
+            return 0
+        if i >= self.length:
+            return self.prefix[self.length]
+        return self.prefix[i]
+
+    def _cover_series(self, first: int, count: int) -> List[int]:
+        # _cover for `count` consecutive ordinals starting at `first`
+        i = first - self.origin
+        head = min(max(-i, 0), count)
+        tail = min(max(i + count - self.length - 1, 0), count - head)
+        series = list(repeat(0, head))
+        series.extend(self.prefix[i + head:i + count - tail])
+        series.extend(repeat(self.prefix[self.length], tail))
+        return series
+
+    def is_in_us(self, day: date) -> bool:
+        i = day.toordinal() - self.origin
+        return 0 <= i < self.length and self.presence[i] > 0
+
+    def days_in_window(self, window_start: date, window_end: date) -> int:
+        # Same count as calculate_overlap_days(intervals, window_start, window_end)
+        if window_end <= window_start:
+            return 0
+        return self._cover(window_end.toordinal()) - self._cover(window_start.toordinal())
+
+    def days_as_of(self, as_of_date: date, window_days: int = 365) -> int:
+        return self.days_in_window(as_of_date - timedelta(days=window_days), as_of_date)
+
+    def rolling_counts(self, first_day: date, last_day: date, window_days: int = 365) -> array:
+        # counts[k] == days_as_of(first_day + k days), for every day up to and including last_day
+        count = last_day.toordinal() - first_day.toordinal() + 1
+        if count <= 0:
+            return array('i')
+        ends = self._cover_series(first_day.toordinal(), count)
+        starts = self._cover_series(first_day.toordinal() - window_days, count)
+        return array('i', map(sub, ends, starts))
@@ -1,33 +1,115 @@
+import io
+import sys
 from datetime import datetime, date, timedelta
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Tuple, Optional, Union
+
+from i94calculator import instrumentation
+from i94calculator.columnar import EntryStore, IntervalStore
+from i94calculator.interval_index import IntervalIndex
+
+@lru_cache(maxsize=1 << 16)
+def parse_iso_date(date_str: str) -> Optional[date]:
+    # Exports use fixed-width YYYY-MM-DD, which date.fromisoformat decodes far
+    # faster than strptime. Anything it rejects still goes through strptime,
+    # so the accepted formats are the same as before (e.g. "2024-5-1").
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return date.fromisoformat(date_str)
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return None
 
 def parse_travel_log_line(line: str) -> Optional[Tuple[date, str, str]]:
-    parts: List[str] = line.split()
+    parts: List[str] = line.split(None, 4)
     if len(parts) < 4:
         return None
-    date_str: str = parts[1]
-    typ: str = parts[2]
-    location: str = parts[3]
-    try:
-        dt: date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        return (dt, typ, location)
-    except Exception:
+    dt = parse_iso_date(parts[1])
+    if dt is None:
         return None
+    # TYPE and LOCATION repeat on almost every row, so share one string object
+    return (dt, sys.intern(parts[2]), sys.intern(parts[3]))
+
+def is_header_line(line: str) -> bool:
+    line = line.lstrip().lower()
+    return line.startswith('row') or 'date' in line
 
-def parse_travel_log(travel_log: str) -> List[Tuple[date, str, str]]:
-    lines = [line for line in travel_log.strip().split('\n') if line.strip()]
-    # Skip header row if present
-    if lines and (lines[0].lower().startswith('row') or 'date' in lines[0].lower()):
-        lines = lines[1:]
-    entries = []
+def iter_travel_log(source: Union[str, Iterable[str]]) -> Iterator[Tuple[date, str, str]]:
+    # Yields parsed rows in input order from a pasted log or any iterable of
+    # lines (e.g. an open file), without building a list of all lines.
+    # A header is only recognised on the first non-blank line.
+    lines = iter(io.StringIO(source) if isinstance(source, str) else source)
     for line in lines:
-        parsed = parse_travel_log_line(line)
-        if parsed:
-            entries.append(parsed)
-    entries.sort(key=lambda x: x[0])
+        if not line.strip():
+            continue
+        if not is_header_line(line):
+            parsed = parse_travel_log_line(line)
+            if parsed:
+                yield parsed
+        break
+    # Same as parse_travel_log_line, inlined for the bulk of the rows
+    parse_date = parse_iso_date
+    intern = sys.intern
+    for line in lines:
+        parts = line.split(None, 4)
+        if len(parts) < 4:
+            continue
+        dt = parse_date(parts[1])
+        if dt is not None:
+            yield (dt, intern(parts[2]), intern(parts[3]))
+
+def parse_travel_log(travel_log: Union[str, Iterable[str]]) -> List[Tuple[date, str, str]]:
+    recorder = instrumentation.active
+    if recorder is not None:
+        return _parse_travel_log_instrumented(travel_log, recorder)
+    entries = list(iter_travel_log(travel_log))
+    entries.sort(key=itemgetter(0))
+    return entries
+
+class _LineCounter:
+    # Counts the non-blank lines passing through, to derive rejected rows
+    def __init__(self, source: Union[str, Iterable[str]]):
+        self.source = io.StringIO(source) if isinstance(source, str) else source
+        self.count = 0
+        self.header = False
+
+    def __iter__(self) -> Iterator[str]:
+        for line in self.source:
+            if line.strip():
+                if self.count == 0:
+                    self.header = is_header_line(line)
+                self.count += 1
+            yield line
+
+def _parse_travel_log_instrumented(travel_log: Union[str, Iterable[str]],
+                                   recorder: instrumentation.Recorder) -> List[Tuple[date, str, str]]:
+    lines = _LineCounter(travel_log)
+    token = recorder.begin()
+    entries = list(iter_travel_log(lines))
+    rows = lines.count - lines.header
+    recorder.end("parse", token, rows_in=rows, rows_out=len(entries), rejected=rows - len(entries))
+    token = recorder.begin()
+    entries.sort(key=itemgetter(0))
+    recorder.end("sort", token, rows_in=len(entries), rows_out=len(entries))
     return entries
 
 def build_us_intervals(entries: List[Tuple[date, str, str]], as_of_date: date) -> List[Tuple[date, date]]:
+    recorder = instrumentation.active
+    if recorder is None:
+        return _build_us_intervals(entries, as_of_date)
+    token = recorder.begin()
+    intervals = _build_us_intervals(entries, as_of_date)
+    recorder.end("build_us_intervals", token, rows_in=len(entries), rows_out=len(intervals))
+    return intervals
+
+def _build_us_intervals(entries: List[Tuple[date, str, str]], as_of_date: date) -> List[Tuple[date, date]]:
+    # Columnar stores run the same logic on their arrays and return an IntervalStore
+    if isinstance(entries, EntryStore):
+        return entries.build_us_intervals(as_of_date)
     filtered_entries = [e for e in entries if e[0] <= as_of_date]
     intervals: List[Tuple[date, date]] = []
     in_us = False
@@ -58,6 +140,18 @@ def add_window_start_interval(entries: List[Tuple[date, str, str]], intervals: L
     return intervals
 
 def calculate_overlap_days(intervals: List[Tuple[date, date]], window_start: date, window_end: date) -> int:
+    recorder = instrumentation.active
+    if recorder is None:
+        return _calculate_overlap_days(intervals, window_start, window_end)
+    token = recorder.begin()
+    days = _calculate_overlap_days(intervals, window_start, window_end)
+    recorder.end("calculate_overlap_days", token, rows_in=len(intervals), rows_out=1)
+    return days
+
+def _calculate_overlap_days(intervals: List[Tuple[date, date]], window_start: date, window_end: date) -> int:
+    # Columnar stores and interval indexes answer from their own arrays
+    if isinstance(intervals, (IntervalStore, IntervalIndex)):
+        return intervals.overlap_days(window_start, window_end)
     total_days = 0
     for start, end in intervals:
         overlap_start = max(start, window_start)
@@ -66,3 +160,10 @@ def calculate_overlap_days(intervals: List[Tuple[date, date]], window_start: dat
             days = (overlap_end - overlap_start).days
             total_days += days
     return total_days
+
+def count_us_days(entries: List[Tuple[date, str, str]], as_of_date: date, window_days: int = 365) -> int:
+    # Same steps the GUI tabs run: days in the US during [as_of - window, as_of)
+    window_start = as_of_date - timedelta(days=window_days)
+    intervals = build_us_intervals(entries, as_of_date)
+    intervals = add_window_start_interval(entries, intervals, window_start)
+    return calculate_overlap_days(intervals, window_start, as_of_date)
@@ -0,0 +1,89 @@
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+# How long a date picker must be left alone before the tabs recalculate
+LIVE_DELAY_MS = 300
+
+class BackgroundTask:
+    # Runs calculations for a tab on a worker thread so the Tk event loop
+    # never waits on them. Results are handed back to the Tk thread by
+    # polling a queue with widget.after(), the only safe way to touch
+    # widgets from another thread.
+    #
+    # Only the latest calculation matters: start() and cancel() bump a
+    # generation number and results from older generations are dropped.
+    # A cancelled calculation still runs to the end on its thread (Python
+    # threads cannot be stopped), but nothing it returns reaches the UI.
+    #
+    # widget only needs after(ms, func) and after_cancel(id), so tests can
+    # pass a fake.
+
+    def __init__(self, widget, on_busy: Optional[Callable[[bool], None]] = None, poll_ms: int = 50):
+        self.widget = widget
+        self.on_busy = on_busy
+        self.poll_ms = poll_ms
+        self.generation = 0
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._running: Optional[int] = None
+        self._poll_id = None
+        self._debounce_id = None
+
+    @property
+    def busy(self) -> bool:
+        return self._running is not None
+
+    def start(self, func: Callable[[], Any], on_result: Callable[[Any], None],
+              on_error: Optional[Callable[[Exception], None]] = None) -> int:
+        self.generation += 1
+        generation = self.generation
+
+        def work():
+            try:
+                self._results.put((generation, True, func(), on_result, on_error))
+            except Exception as e:
+                self._results.put((generation, False, e, on_result, on_error))
+
+        threading.Thread(target=work, daemon=True).start()
+        self._set_running(generation)
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+        return generation
+
+    def cancel(self) -> None:
+        self.generation += 1
+        self._set_running(None)
+
+    def debounce(self, delay_ms: int, func: Callable[[], None]) -> None:
+        # Calls func once, delay_ms after the last of a burst of calls
+        if self._debounce_id is not None:
+            self.widget.after_cancel(self._debounce_id)
+
+        def fire():
+            self._debounce_id = None
+            func()
+
+        self._debounce_id = self.widget.after(delay_ms, fire)
+
+    def _set_running(self, generation: Optional[int]) -> None:
+        was_busy = self.busy
+        self._running = generation
+        if self.on_busy is not None and was_busy != self.busy:
+            self.on_busy(self.busy)
+
+    def _poll(self) -> None:
+        self._poll_id = None
+        while True:
+            try:
+                generation, ok, value, on_result, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._running:
+                continue
+            self._set_running(None)
+            if ok:
+                on_result(value)
+            elif on_error is not None:
+                on_error(value)
+        if self.busy:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
@@ -1,18 +1,21 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
+from tkinter import ttk
 from tkinter.ttk import Notebook
-from tkcalendar import DateEntry
-from datetime import datetime, date, timedelta
-from i94calculator.us_days import (
-    parse_travel_log,
-    build_us_intervals,
-    add_window_start_interval,
-    calculate_overlap_days
-)
+from datetime import datetime, date
+from typing import Optional
+from i94calculator.cache import default_cache
+from tabs.background import BackgroundTask, LIVE_DELAY_MS
 
 def create_calculate_days_tab(notebook: Notebook) -> tk.Frame:
     tab = tk.Frame(notebook)
     notebook.add(tab, text="Calculate Days")
+    populate_calculate_days_tab(tab)
+    return tab
+
+def populate_calculate_days_tab(tab: tk.Frame) -> tk.Frame:
+    # Imported here so tkcalendar is only loaded once the tab is shown
+    from tkcalendar import DateEntry
 
     log_label = tk.Label(tab, text="Paste your travel log (tab-separated, with headers):")
     log_label.pack(anchor="w")
@@ -27,28 +30,79 @@ def create_calculate_days_tab(notebook: Notebook) -> tk.Frame:
     as_of_date_entry.set_date(date.today())
     as_of_date_entry.pack(anchor="w")
 
-    def calculate_days_gui():
+    def calculate_days_gui(live=False):
+        # Reads the inputs here on the Tk thread; the calculation runs on
+        # the worker. Live updates (from the date picker) only refresh the
+        # result line and never pop up dialogs.
         travel_log = travel_log_text.get("1.0", tk.END).strip()
         as_of_date_str = as_of_date_entry.get().strip()
         if not travel_log:
-            messagebox.showerror("Input Error", "Please paste your travel log.")
+            if not live:
+                messagebox.showerror("Input Error", "Please paste your travel log.")
             return
         try:
             as_of_date = datetime.strptime(as_of_date_str, "%Y-%m-%d").date()
         except Exception:
-            messagebox.showerror("Input Error", "Please select a valid 'as of' date.")
+            if not live:
+                messagebox.showerror("Input Error", "Please select a valid 'as of' date.")
             return
-        window_start = as_of_date - timedelta(days=365)
-        entries = parse_travel_log(travel_log)
-        if not entries:
-            messagebox.showinfo("Result", f"No valid entries found.\nDays in US: 0")
-            return
-        intervals = build_us_intervals(entries, as_of_date)
-        intervals = add_window_start_interval(entries, intervals, window_start)
-        days = calculate_overlap_days(intervals, window_start, as_of_date)
-        messagebox.showinfo("Result", f"Days spent in the US in the 12 months before {as_of_date}: {days}")
 
-    calc_button = tk.Button(tab, text="Calculate Days", command=calculate_days_gui)
-    calc_button.pack(pady=(10,0))
+        def show_result(days):
+            if days is None:
+                result_var.set("No valid entries found. Days in US: 0")
+                if not live:
+                    messagebox.showinfo("Result", f"No valid entries found.\nDays in US: 0")
+                return
+            message = f"Days spent in the US in the 12 months before {as_of_date}: {days}"
+            result_var.set(message)
+            if not live:
+                messagebox.showinfo("Result", message)
+
+        def show_error(error):
+            message = f"Could not calculate days: {error}"
+            if live:
+                result_var.set(message)
+                return
+            result_var.set("")
+            messagebox.showerror("Error", message)
+
+        task.start(lambda: calculate_days(travel_log, as_of_date), show_result, show_error)
+
+    controls = tk.Frame(tab)
+    controls.pack(pady=(10,0))
+
+    calc_button = tk.Button(controls, text="Calculate Days", command=calculate_days_gui)
+    calc_button.pack(side=tk.LEFT)
+
+    cancel_button = tk.Button(controls, text="Cancel", state=tk.DISABLED)
+    cancel_button.pack(side=tk.LEFT, padx=(5,0))
+
+    progress = ttk.Progressbar(controls, mode="indeterminate", length=120)
+    progress.pack(side=tk.LEFT, padx=(10,0))
+
+    result_var = tk.StringVar()
+    result_label = tk.Label(tab, textvariable=result_var)
+    result_label.pack(pady=(5,0))
+
+    def set_busy(busy):
+        cancel_button.config(state=tk.NORMAL if busy else tk.DISABLED)
+        if busy:
+            progress.start(10)
+        else:
+            progress.stop()
+
+    task = BackgroundTask(tab, on_busy=set_busy)
+    cancel_button.config(command=task.cancel)
+    # Recalculate shortly after the date changes; quick successive picks run once
+    as_of_date_entry.bind("<<DateEntrySelected>>",
+                          lambda event: task.debounce(LIVE_DELAY_MS, lambda: calculate_days_gui(live=True)))
 
     return tab
+
+def calculate_days(travel_log: str, as_of_date: date) -> Optional[int]:
+    # Runs on the worker thread; None means the log had no valid entries.
+    # Repeated runs on an unchanged log skip parsing via the cache
+    calculator = default_cache.calculator(travel_log)
+    if not len(calculator):
+        return None
+    return calculator.days_as_of(as_of_date)
@@ -0,0 +1,226 @@
+import math
+import tkinter as tk
+from tkinter import messagebox, scrolledtext, ttk
+from tkinter.ttk import Notebook
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from i94calculator.cache import default_cache
+from i94calculator.export import calendar_columns
+from tabs.background import BackgroundTask
+
+# Layout of the heatmap canvas, in pixels. Weeks run left to right, one
+# column of seven day cells each, with the rolling count curve below.
+CELL_HEIGHT = 12
+HEATMAP_TOP = 16
+CURVE_TOP = HEATMAP_TOP + 7 * CELL_HEIGHT + 16
+CURVE_HEIGHT = 120
+CANVAS_HEIGHT = CURVE_TOP + CURVE_HEIGHT + 10
+MIN_WEEK_WIDTH = 2
+MAX_WEEK_WIDTH = 60
+
+OUT_COLOR = "#ebedf0"
+# In-US cell colors by rolling count, up to the day limit and over it
+IN_COLORS = [(0.5, "#9be9a8"), (0.8, "#40c463"), (1.0, "#f0b429")]
+OVER_COLOR = "#d1242f"
+
+class HeatmapModel:
+    # Everything the canvas shows, computed once per history: the in-US
+    # flag and rolling count of every day from the Monday on or before the
+    # first entry to the end of the week of the last one
+
+    def __init__(self, entries: List[Tuple[date, str, str]], day_limit: int = 180, window_days: int = 365):
+        self.day_limit = day_limit
+        first = min(e[0] for e in entries)
+        last = max(e[0] for e in entries)
+        self.first_day = first - timedelta(days=first.weekday())
+        self.last_day = last + timedelta(days=6 - last.weekday())
+        self.in_us, self.counts = calendar_columns(entries, self.first_day, self.last_day, window_days)
+        self.weeks = len(self.counts) // 7
+        self.peak = max(self.counts) if self.counts else 0
+
+    def day(self, week: int, weekday: int) -> date:
+        return self.first_day + timedelta(days=7 * week + weekday)
+
+    def color(self, i: int) -> str:
+        if not self.in_us[i]:
+            return OUT_COLOR
+        share = self.counts[i] / self.day_limit
+        for limit, color in IN_COLORS:
+            if share <= limit:
+                return color
+        return OVER_COLOR
+
+    def curve_y(self, count: int) -> float:
+        top = max(self.peak, self.day_limit) * 1.1
+        return CURVE_TOP + CURVE_HEIGHT - count * CURVE_HEIGHT / top
+
+class HeatmapView:
+    # Draws a HeatmapModel on a canvas one week column at a time. Only the
+    # weeks in view (plus a screen's width either side) are drawn, and each
+    # drawn week's items are kept, so scrolling back costs nothing and
+    # scrolling on only draws the new weeks. Zooming rescales the existing
+    # items with canvas.scale instead of redrawing them.
+    #
+    # canvas only needs the Canvas methods used here, so tests can pass a fake.
+
+    def __init__(self, canvas, model: HeatmapModel, week_width: float = 12):
+        self.canvas = canvas
+        self.model = model
+        self.week_width = week_width
+        self.items: Dict[int, List[int]] = {}
+        canvas.delete("heatmap")
+        limit_y = model.curve_y(model.day_limit)
+        canvas.create_line(0, limit_y, self.width, limit_y, fill=OVER_COLOR, dash=(4, 2), tags=("heatmap",))
+        self._update_scrollregion()
+
+    @property
+    def width(self) -> float:
+        return self.model.weeks * self.week_width
+
+    def _update_scrollregion(self) -> None:
+        self.canvas.configure(scrollregion=(0, 0, self.width, CANVAS_HEIGHT))
+
+    def visible_weeks(self) -> range:
+        low, high = self.canvas.xview()
+        first = math.floor(low * self.width / self.week_width)
+        last = math.ceil(high * self.width / self.week_width)
+        margin = last - first
+        return range(max(first - margin, 0), min(last + margin, self.model.weeks))
+
+    def redraw(self) -> int:
+        # Draws the weeks that came into view; returns how many were drawn
+        drawn = 0
+        for week in self.visible_weeks():
+            if week not in self.items:
+                self.items[week] = self._draw_week(week)
+                drawn += 1
+        return drawn
+
+    def zoom(self, factor: float) -> None:
+        factor = min(max(self.week_width * factor, MIN_WEEK_WIDTH), MAX_WEEK_WIDTH) / self.week_width
+        if factor == 1:
+            return
+        self.canvas.scale("heatmap", 0, 0, factor, 1)
+        self.week_width *= factor
+        self._update_scrollregion()
+        self.redraw()
+
+    def _draw_week(self, week: int) -> List[int]:
+        canvas = self.canvas
+        model = self.model
+        x0 = week * self.week_width
+        x1 = x0 + self.week_width
+        items = []
+        for weekday in range(7):
+            i = 7 * week + weekday
+            y0 = HEATMAP_TOP + weekday * CELL_HEIGHT
+            items.append(canvas.create_rectangle(x0, y0, x1, y0 + CELL_HEIGHT, fill=model.color(i), outline="white",
+                                                 tags=("heatmap",)))
+        # The curve runs through each day of the week and on to the next Monday
+        step = self.week_width / 7
+        end = min(7 * week + 8, len(model.counts))
+        points = []
+        for i in range(7 * week, end):
+            points.extend((x0 + (i - 7 * week) * step, model.curve_y(model.counts[i])))
+        items.append(canvas.create_line(*points, fill="#0969da", tags=("heatmap",)))
+        first_day = model.day(week, 0)
+        if first_day.day <= 7:
+            label = first_day.strftime("%b %Y" if first_day.month == 1 else "%b")
+            items.append(canvas.create_text(x0, HEATMAP_TOP - 2, text=label, anchor="sw", font=("TkDefaultFont", 8),
+                                             tags=("heatmap",)))
+        return items
+
+def create_heatmap_tab(notebook: Notebook) -> tk.Frame:
+    tab = tk.Frame(notebook)
+    notebook.add(tab, text="Heatmap")
+    populate_heatmap_tab(tab)
+    return tab
+
+def populate_heatmap_tab(tab: tk.Frame) -> tk.Frame:
+    log_label = tk.Label(tab, text="Paste your travel log (tab-separated, with headers):")
+    log_label.pack(anchor="w")
+
+    log_text = scrolledtext.ScrolledText(tab, width=80, height=8)
+    log_text.pack(fill=tk.X)
+
+    controls = tk.Frame(tab)
+    controls.pack(anchor="w", pady=(10,0))
+    draw_button = tk.Button(controls, text="Draw")
+    draw_button.pack(side=tk.LEFT)
+    zoom_out_button = tk.Button(controls, text="-", width=2)
+    zoom_out_button.pack(side=tk.LEFT, padx=(10,0))
+    zoom_in_button = tk.Button(controls, text="+", width=2)
+    zoom_in_button.pack(side=tk.LEFT)
+    status_var = tk.StringVar()
+    tk.Label(controls, textvariable=status_var).pack(side=tk.LEFT, padx=(10,0))
+
+    canvas = tk.Canvas(tab, height=CANVAS_HEIGHT, background="white")
+    canvas.pack(fill=tk.BOTH, expand=True, pady=(10,0))
+    scrollbar = ttk.Scrollbar(tab, orient=tk.HORIZONTAL, command=canvas.xview)
+    scrollbar.pack(fill=tk.X)
+
+    view: Optional[HeatmapView] = None
+    pending_redraw = None
+
+    def schedule_redraw():
+        # Scrolling fires many events; draw once the burst is over
+        nonlocal pending_redraw
+        if pending_redraw is None and view is not None:
+            pending_redraw = canvas.after_idle(redraw)
+
+    def redraw():
+        nonlocal pending_redraw
+        pending_redraw = None
+        if view is not None:
+            view.redraw()
+
+    def on_xscroll(low, high):
+        scrollbar.set(low, high)
+        schedule_redraw()
+
+    canvas.configure(xscrollcommand=on_xscroll)
+    canvas.bind("<ButtonPress-1>", lambda event: canvas.scan_mark(event.x, 0))
+    canvas.bind("<B1-Motion>", lambda event: canvas.scan_dragto(event.x, 0, gain=1))
+    canvas.bind("<Configure>", lambda event: schedule_redraw())
+
+    def zoom(factor):
+        if view is not None:
+            view.zoom(factor)
+
+    zoom_in_button.config(command=lambda: zoom(1.5))
+    zoom_out_button.config(command=lambda: zoom(1 / 1.5))
+    canvas.bind("<Control-MouseWheel>", lambda event: zoom(1.25 if event.delta > 0 else 0.8))
+    canvas.bind("<Control-Button-4>", lambda event: zoom(1.25))
+    canvas.bind("<Control-Button-5>", lambda event: zoom(0.8))
+
+    def show_model(model):
+        nonlocal view
+        if model is None:
+            status_var.set("No valid entries found.")
+            return
+        view = HeatmapView(canvas, model)
+        # Start at the most recent weeks
+        canvas.xview_moveto(1.0)
+        view.redraw()
+        status_var.set(f"{model.first_day} to {model.last_day}, peak {model.peak} days")
+
+    def show_error(error):
+        messagebox.showerror("Error", f"Could not draw the heatmap: {error}")
+
+    task = BackgroundTask(tab)
+
+    def draw():
+        travel_log = log_text.get("1.0", tk.END).strip()
+        if not travel_log:
+            messagebox.showerror("Input Error", "Please paste your travel log.")
+            return
+        status_var.set("Calculating...")
+        task.start(lambda: heatmap_model(travel_log), show_model, show_error)
+
+    draw_button.config(command=draw)
+    return tab
+
+def heatmap_model(travel_log: str) -> Optional[HeatmapModel]:
+    # Runs on the worker thread; None means the log had no valid entries
+    entries = default_cache.entries(travel_log)
+    return HeatmapModel(entries) if entries else None
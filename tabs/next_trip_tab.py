@@ -1,19 +1,29 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
-from tkcalendar import DateEntry
-from datetime import datetime, timedelta
+from tkinter import ttk
+from datetime import date, datetime, timedelta
+from typing import Optional
 from i94calculator.us_days import (
-    parse_travel_log,
     build_us_intervals,
     add_window_start_interval,
     calculate_overlap_days
 )
+from i94calculator.planner import TripPlanner
+from i94calculator.crossings import crossings_for_entries
+from i94calculator.cache import default_cache
+from tabs.background import BackgroundTask, LIVE_DELAY_MS
 
 from tkinter.ttk import Notebook
 
 def create_next_trip_tab(notebook: Notebook) -> tk.Frame:
     tab = tk.Frame(notebook)
     notebook.add(tab, text="Next Trip")
+    populate_next_trip_tab(tab)
+    return tab
+
+def populate_next_trip_tab(tab: tk.Frame) -> tk.Frame:
+    # Deferred import, see populate_calculate_days_tab
+    from tkcalendar import DateEntry
 
     trip_log_label = tk.Label(tab, text="Paste your I-94 history (tab-separated, with headers):")
     trip_log_label.pack(anchor="w")
@@ -33,13 +43,14 @@ def create_next_trip_tab(notebook: Notebook) -> tk.Frame:
     trip_end_entry = DateEntry(tab, width=20, date_pattern='yyyy-mm-dd')
     trip_end_entry.pack(anchor="w")
 
-    def calculate_next_trip_days():
+    def calculate_next_trip_days(live=False):
         travel_log = trip_log_text.get("1.0", tk.END).strip()
         trip_start_str = trip_start_entry.get().strip()
         trip_end_str = trip_end_entry.get().strip()
         
         if not travel_log:
-            messagebox.showerror("Input Error", "Please paste your I-94 history.")
+            if not live:
+                messagebox.showerror("Input Error", "Please paste your I-94 history.")
             return
             
         try:
@@ -47,37 +58,97 @@ def create_next_trip_tab(notebook: Notebook) -> tk.Frame:
             trip_end = datetime.strptime(trip_end_str, "%Y-%m-%d").date()
             
             if trip_start >= trip_end:
-                messagebox.showerror("Input Error", "Trip start date must be before trip end date.")
+                if not live:
+                    messagebox.showerror("Input Error", "Trip start date must be before trip end date.")
                 return
                 
         except Exception:
-            messagebox.showerror("Input Error", "Please select valid trip dates.")
-            return
-            
-        # Calculate days spent in the US in the 12 months before the trip end date
-        window_start = trip_end - timedelta(days=365)
-        entries = parse_travel_log(travel_log)
-        if not entries:
-            messagebox.showinfo("Result", f"No valid entries found.\nDays in US: 0")
+            if not live:
+                messagebox.showerror("Input Error", "Please select valid trip dates.")
             return
-            
-        # Add the upcoming trip as an interval
-        # Format matches what parse_travel_log returns
-        entries.append((trip_start, 'Arrival', 'Next Trip Start'))
-        entries.append((trip_end, 'Departure', 'Next Trip End'))
-        
-        intervals = build_us_intervals(entries, trip_end)
-        intervals = add_window_start_interval(entries, intervals, window_start)
-        days = calculate_overlap_days(intervals, window_start, trip_end)
-        
-        # Calculate days remaining before reaching 180
-        days_remaining = 180 - days
-        
-        messagebox.showinfo("Result", 
-            f"Days spent in the US in the 12 months before {trip_end}: {days}\n"
-            f"Days remaining before reaching 180: {days_remaining if days_remaining > 0 else '0'}")
 
-    calc_next_trip_button = tk.Button(tab, text="Calculate Days for Next Trip", command=calculate_next_trip_days)
-    calc_next_trip_button.pack(pady=(10,0))
+        def show_result(message):
+            if message is None:
+                result_var.set("No valid entries found. Days in US: 0")
+                if not live:
+                    messagebox.showinfo("Result", f"No valid entries found.\nDays in US: 0")
+                return
+            result_var.set(message)
+            if not live:
+                messagebox.showinfo("Result", message)
+
+        def show_error(error):
+            message = f"Could not calculate days: {error}"
+            if live:
+                result_var.set(message)
+                return
+            result_var.set("")
+            messagebox.showerror("Error", message)
+
+        task.start(lambda: next_trip_message(travel_log, trip_start, trip_end), show_result, show_error)
+
+    controls = tk.Frame(tab)
+    controls.pack(pady=(10,0))
+
+    calc_next_trip_button = tk.Button(controls, text="Calculate Days for Next Trip", command=calculate_next_trip_days)
+    calc_next_trip_button.pack(side=tk.LEFT)
+
+    cancel_button = tk.Button(controls, text="Cancel", state=tk.DISABLED)
+    cancel_button.pack(side=tk.LEFT, padx=(5,0))
+
+    progress = ttk.Progressbar(controls, mode="indeterminate", length=120)
+    progress.pack(side=tk.LEFT, padx=(10,0))
+
+    result_var = tk.StringVar()
+    result_label = tk.Label(tab, textvariable=result_var, justify=tk.LEFT)
+    result_label.pack(pady=(5,0))
+
+    def set_busy(busy):
+        cancel_button.config(state=tk.NORMAL if busy else tk.DISABLED)
+        if busy:
+            progress.start(10)
+        else:
+            progress.stop()
+
+    task = BackgroundTask(tab, on_busy=set_busy)
+    cancel_button.config(command=task.cancel)
+    for entry in (trip_start_entry, trip_end_entry):
+        entry.bind("<<DateEntrySelected>>",
+                   lambda event: task.debounce(LIVE_DELAY_MS, lambda: calculate_next_trip_days(live=True)))
 
     return tab
+
+def next_trip_message(travel_log: str, trip_start: date, trip_end: date) -> Optional[str]:
+    # Runs on the worker thread; None means the log had no valid entries
+    # Calculate days spent in the US in the 12 months before the trip end date
+    window_start = trip_end - timedelta(days=365)
+    entries = default_cache.entries(travel_log)
+    if not entries:
+        return None
+        
+    # Solve for the longest safe trip before the history is extended below
+    planner = TripPlanner(entries)
+    latest_end = planner.max_trip_end(trip_start)
+    earliest_start = planner.earliest_trip_start((trip_end - trip_start).days, trip_start)
+    # First date from the trip start on with more than 180 days in the window
+    over_limit = next((max(crossing.first_day, trip_start)
+                       for crossing in crossings_for_entries(entries, planned_trips=[(trip_start, trip_end)])
+                       if crossing.last_day >= trip_start), None)
+
+    # Add the upcoming trip as an interval
+    # Format matches what parse_travel_log returns
+    entries.append((trip_start, 'Arrival', 'Next Trip Start'))
+    entries.append((trip_end, 'Departure', 'Next Trip End'))
+    
+    intervals = build_us_intervals(entries, trip_end)
+    intervals = add_window_start_interval(entries, intervals, window_start)
+    days = calculate_overlap_days(intervals, window_start, trip_end)
+    
+    # Calculate days remaining before reaching 180
+    days_remaining = 180 - days
+    
+    return (f"Days spent in the US in the 12 months before {trip_end}: {days}\n"
+            f"Days remaining before reaching 180: {days_remaining if days_remaining > 0 else '0'}\n"
+            f"Latest trip end date starting {trip_start} that stays within 180 days: {latest_end or 'none'}\n"
+            f"Earliest start date for a trip of this length: {earliest_start or 'none'}\n"
+            f"First date over 180 days in the previous 12 months with this trip: {over_limit or 'none'}")
@@ -0,0 +1,82 @@
+import threading
+from datetime import date
+import pytest
+
+pytest.importorskip("tkinter")
+
+from tabs.background import BackgroundTask
+from tabs.calculate_days_tab import calculate_days
+from tabs.next_trip_tab import next_trip_message
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+class FakeWidget:
+    # Stands in for a Tk widget: callbacks run only when run_pending() is called
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.pending[self.next_id] = func
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        pending, self.pending = self.pending, {}
+        for func in pending.values():
+            func()
+
+def wait_for(task, widget):
+    for _ in range(1000):
+        if not task.busy:
+            return
+        widget.run_pending()
+        threading.Event().wait(0.005)
+    raise AssertionError("task did not finish")
+
+def test_result_is_delivered_on_poll():
+    widget, results, busy = FakeWidget(), [], []
+    task = BackgroundTask(widget, on_busy=busy.append)
+    task.start(lambda: 42, results.append)
+    assert task.busy and results == []
+    wait_for(task, widget)
+    assert results == [42]
+    assert busy == [True, False]
+
+def test_errors_go_to_on_error():
+    widget, errors = FakeWidget(), []
+    task = BackgroundTask(widget)
+    task.start(lambda: 1 / 0, lambda value: None, errors.append)
+    wait_for(task, widget)
+    assert isinstance(errors[0], ZeroDivisionError)
+
+def test_newer_start_and_cancel_drop_older_results():
+    widget, results = FakeWidget(), []
+    task = BackgroundTask(widget)
+    release = threading.Event()
+    task.start(lambda: release.wait() and "old", results.append)
+    task.start(lambda: "new", results.append)
+    wait_for(task, widget)
+    release.set()
+    task.start(lambda: release.wait() and "cancelled", results.append)
+    task.cancel()
+    assert not task.busy
+    for _ in range(20):
+        widget.run_pending()
+    assert results == ["new"]
+
+def test_debounce_runs_last_call_once():
+    widget, calls = FakeWidget(), []
+    task = BackgroundTask(widget)
+    for value in range(3):
+        task.debounce(300, lambda value=value: calls.append(value))
+    widget.run_pending()
+    assert calls == [2]
+
+def test_tab_calculations():
+    assert calculate_days("", date(2025, 6, 1)) is None
+    assert calculate_days(SAMPLE_DATA, date(2025, 6, 1)) > 0
+    message = next_trip_message(SAMPLE_DATA, date(2025, 7, 1), date(2025, 7, 10))
+    assert message.startswith("Days spent in the US in the 12 months before 2025-07-10:")
@@ -0,0 +1,36 @@
+import pytest
+from datetime import date
+from i94calculator.us_days import parse_travel_log, count_us_days
+from i94calculator.batch import (
+    calculate_days_batch,
+    load_travel_logs
+)
+
+LOG_A = "Row DATE TYPE LOCATION\n1 2024-05-10 Departure NYC\n2 2024-05-01 Arrival NYC"
+LOG_B = "Row DATE TYPE LOCATION\n1 2024-06-15 Departure LAX\n2 2024-06-01 Arrival LAX\n3 BADDATE Arrival SFO"
+
+def test_calculate_days_batch():
+    results = calculate_days_batch({"a": LOG_A, "b": LOG_B, "empty": ""}, date(2024, 7, 1))
+    assert results == {"a": 9, "b": 14, "empty": 0}
+
+def test_calculate_days_batch_matches_single_traveler_path():
+    as_of_date = date(2024, 6, 10)
+    results = calculate_days_batch({"a": LOG_A, "b": LOG_B}, as_of_date)
+    for traveler_id, log in (("a", LOG_A), ("b", LOG_B)):
+        assert results[traveler_id] == count_us_days(parse_travel_log(log), as_of_date)
+
+def test_load_travel_logs_from_directory(tmp_path):
+    (tmp_path / "alice.txt").write_text(LOG_A)
+    (tmp_path / "bob.txt").write_text(LOG_B)
+    assert load_travel_logs([str(tmp_path)]) == {"alice": LOG_A, "bob": LOG_B}
+
+def test_duplicate_traveler_ids_are_rejected(tmp_path):
+    (tmp_path / "alice.txt").write_text(LOG_A)
+    (tmp_path / "alice.csv").write_text(LOG_B)
+    with pytest.raises(ValueError, match="duplicate traveler ID 'alice'"):
+        load_travel_logs([str(tmp_path)])
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "alice.txt").write_text(LOG_B)
+    with pytest.raises(ValueError):
+        load_travel_logs([str(tmp_path / "alice.txt"), str(other)])
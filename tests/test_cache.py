@@ -0,0 +1,38 @@
+from datetime import date
+from i94calculator.us_days import parse_travel_log, build_us_intervals, count_us_days
+from i94calculator.cache import LogCache
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+OTHER_LOG = "Row DATE TYPE LOCATION\n1 2024-05-10 Departure NYC\n2 2024-05-01 Arrival NYC"
+
+def test_results_match_uncached_path():
+    cache = LogCache()
+    entries = parse_travel_log(SAMPLE_DATA)
+    for as_of_date in (date(2024, 3, 1), date(2024, 12, 5), date(2025, 6, 1)):
+        assert cache.entries(SAMPLE_DATA) == entries
+        assert cache.intervals(SAMPLE_DATA, as_of_date) == build_us_intervals(entries, as_of_date)
+        assert cache.count_us_days(SAMPLE_DATA, as_of_date) == count_us_days(entries, as_of_date)
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (8, 1, 1)
+
+def test_entries_are_copies():
+    cache = LogCache()
+    cache.entries(OTHER_LOG).append((date(2024, 6, 1), "Arrival", "SFO"))
+    assert len(cache.entries(OTHER_LOG)) == 2
+
+def test_lru_eviction():
+    cache = LogCache(maxsize=2)
+    cache.count_us_days(SAMPLE_DATA, date(2025, 6, 1))
+    cache.count_us_days(OTHER_LOG, date(2025, 6, 1))
+    cache.count_us_days(SAMPLE_DATA, date(2025, 6, 1))
+    cache.count_us_days("", date(2025, 6, 1))
+    assert cache.cache_info().currsize == 2
+    cache.count_us_days(SAMPLE_DATA, date(2025, 6, 1))
+    cache.count_us_days(OTHER_LOG, date(2025, 6, 1))
+    assert cache.cache_info() == (2, 4, 2, 2)
+
+def test_cache_clear():
+    cache = LogCache()
+    cache.count_us_days(OTHER_LOG, date(2025, 6, 1))
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 128, 0)
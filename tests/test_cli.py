@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+import pytest
+import subprocess
+import sys
+from i94calculator.cli import main
+
+LOG_A = "Row DATE TYPE LOCATION\n1 2024-05-10 Departure NYC\n2 2024-05-01 Arrival NYC"
+LOG_B = "Row DATE TYPE LOCATION\n1 2024-06-15 Departure LAX\n2 2024-06-01 Arrival LAX"
+
+def write_logs(tmp_path):
+    (tmp_path / "alice.txt").write_text(LOG_A)
+    (tmp_path / "bob.txt").write_text(LOG_B)
+
+def test_json_output(tmp_path, capsys):
+    write_logs(tmp_path)
+    assert main([str(tmp_path), "--as-of", "2024-07-01"]) == 0
+    assert json.loads(capsys.readouterr().out) == [
+        {"traveler": "alice", "as_of": "2024-07-01", "days": 9, "days_remaining": 171},
+        {"traveler": "bob", "as_of": "2024-07-01", "days": 14, "days_remaining": 166}
+    ]
+
+def test_csv_output_for_date_range(tmp_path):
+    write_logs(tmp_path)
+    output = tmp_path / "out.csv"
+    main([str(tmp_path / "bob.txt"), "--from", "2024-06-10", "--to", "2024-06-20", "--step", "5",
+          "--format", "csv", "-o", str(output)])
+    rows = list(csv.DictReader(io.StringIO(output.read_text())))
+    assert [(row["as_of"], row["days"]) for row in rows] == [
+        ("2024-06-10", "0"), ("2024-06-15", "14"), ("2024-06-20", "14")
+    ]
+
+def test_reversed_date_range_is_rejected(tmp_path, capsys):
+    write_logs(tmp_path)
+    with pytest.raises(SystemExit) as exc:
+        main([str(tmp_path), "--from", "2024-06-20", "--to", "2024-06-10"])
+    assert exc.value.code == 2
+    assert "--from must not be after --to" in capsys.readouterr().err
+
+def test_jsonl_output_with_window(tmp_path, capsys):
+    write_logs(tmp_path)
+    main([str(tmp_path / "alice.txt"), "--as-of", "2024-05-10", "--as-of", "2024-05-20", "--window", "12",
+          "--format", "jsonl"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["days"] for line in lines] == [9, 2]
+
+def test_stdin(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(LOG_A))
+    main(["-", "--as-of", "2024-07-01", "--format", "csv"])
+    assert capsys.readouterr().out == "traveler,as_of,days,days_remaining\nstdin,2024-07-01,9,171\n"
+
+def test_does_not_import_tkinter():
+    code = "import sys, i94calculator.cli; print('tkinter' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+@pytest.mark.parametrize("module", ["reconcile", "export"])
+def test_other_tools_do_not_import_cli(module):
+    code = f"import sys, i94calculator.{module}; print('i94calculator.cli' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+def test_duplicate_traveler_ids_are_rejected(tmp_path, capsys):
+    write_logs(tmp_path)
+    (tmp_path / "alice.csv").write_text(LOG_B)
+    with pytest.raises(SystemExit):
+        main([str(tmp_path), "--as-of", "2024-07-01"])
+    captured = capsys.readouterr()
+    assert captured.out == "" and "duplicate traveler ID 'alice'" in captured.err
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+import pytest
+from i94calculator.us_days import (
+    parse_travel_log,
+    build_us_intervals,
+    calculate_overlap_days,
+    count_us_days
+)
+from i94calculator.columnar import StringTable, EntryStore, IntervalStore, ARRIVAL, DEPARTURE
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+def test_round_trip_entries():
+    entries = parse_travel_log(SAMPLE_DATA + "\n27\t2025-04-22\tOther\tSFR")
+    store = EntryStore.from_entries(entries)
+    assert len(store) == len(entries)
+    assert store.to_entries() == entries
+    assert store[0] == entries[0]
+    assert store.type_table.codes["Arrival"] == ARRIVAL
+    assert store.type_table.codes["Departure"] == DEPARTURE
+
+def test_shared_port_table():
+    ports = StringTable()
+    first = EntryStore.from_entries([(date(2024, 5, 1), "Arrival", "SFO")], ports)
+    second = EntryStore.from_entries([(date(2024, 6, 1), "Arrival", "JFK"), (date(2024, 6, 9), "Departure", "SFO")], ports)
+    assert ports.values == ["SFO", "JFK"]
+    assert first.locations[0] == second.locations[1]
+
+def test_build_us_intervals_matches_tuple_api():
+    entries = parse_travel_log(SAMPLE_DATA)
+    store = EntryStore.from_entries(entries)
+    for as_of_date in (date(2023, 12, 1), date(2024, 5, 8), date(2025, 6, 1)):
+        intervals = build_us_intervals(store, as_of_date)
+        assert isinstance(intervals, IntervalStore)
+        assert intervals.to_intervals() == build_us_intervals(entries, as_of_date)
+
+def test_calculate_overlap_days_on_interval_store():
+    intervals = [
+        (date(2024, 4, 1), date(2024, 5, 5)),
+        (date(2024, 5, 10), date(2024, 6, 1))
+    ]
+    store = IntervalStore.from_intervals(intervals)
+    assert calculate_overlap_days(store, date(2024, 5, 1), date(2024, 5, 15)) == 9
+    assert store.to_intervals() == intervals
+
+def test_count_us_days_on_store():
+    entries = parse_travel_log(SAMPLE_DATA)
+    store = EntryStore.from_entries(entries)
+    day = date(2024, 1, 1)
+    while day < date(2025, 9, 1):
+        assert count_us_days(store, day) == count_us_days(entries, day)
+        day += timedelta(days=11)
+
+def test_too_many_types():
+    store = EntryStore()
+    with pytest.raises(ValueError):
+        for i in range(300):
+            store.append((date(2024, 1, 1), f"Type{i}", "SFO"))
+    # The failed append left the table and the columns unchanged
+    assert len(store.type_table) == 256 and len(store) == 254
+    assert "Type254" not in store.type_table.codes
+
+def test_type_table_must_fix_arrival_and_departure_codes():
+    with pytest.raises(ValueError):
+        EntryStore(types=StringTable())
+    with pytest.raises(ValueError):
+        EntryStore.from_entries([(date(2024, 1, 1), "Departure", "SFO")], types=StringTable(["Departure"]))
+    assert EntryStore(types=StringTable(["Arrival", "Departure", "Parole"])).type_table[ARRIVAL] == "Arrival"
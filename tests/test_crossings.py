@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+from i94calculator.us_days import parse_travel_log, build_us_intervals
+from i94calculator.timeline import DayTimeline
+from i94calculator.crossings import (
+    Crossing,
+    threshold_crossings,
+    crossings_for_entries,
+    first_crossing,
+    iter_fleet_crossings
+)
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+def stay(start, days):
+    return (start, start + timedelta(days=days))
+
+def test_single_long_stay():
+    # 200 days from 2024-01-01: the count first reaches 181 on the day after the 181st day
+    crossings = threshold_crossings([stay(date(2024, 1, 1), 200)])
+    assert crossings == [Crossing(date(2024, 6, 30), date(2025, 1, 19), date(2024, 7, 19), 200)]
+
+def test_matches_day_by_day_counts():
+    intervals = [stay(date(2023, 1, 10), 100), stay(date(2023, 6, 1), 90), stay(date(2024, 1, 5), 60)]
+    timeline = DayTimeline(intervals)
+    expected = []
+    day = date(2023, 1, 1)
+    while day < date(2025, 6, 1):
+        if timeline.days_as_of(day) > 180:
+            expected.append(day)
+        day += timedelta(days=1)
+    crossings = threshold_crossings(intervals)
+    assert len(crossings) >= 1
+    covered = [c.first_day + timedelta(days=k) for c in crossings for k in range((c.last_day - c.first_day).days + 1)]
+    assert covered == expected
+    for crossing in crossings:
+        assert timeline.days_as_of(crossing.peak_day) == crossing.peak_days
+
+SHORT_LOG = "Row DATE TYPE LOCATION\n1 2025-03-01 Departure NYC\n2 2024-11-01 Arrival NYC"
+LONG_LOG = "Row DATE TYPE LOCATION\n1 2024-09-01 Departure NYC\n2 2024-01-01 Arrival NYC"
+
+def test_planned_trip():
+    entries = parse_travel_log(SHORT_LOG)
+    assert crossings_for_entries(entries) == []
+    trip = (date(2025, 5, 1), date(2025, 9, 1))
+    first = first_crossing(entries, planned_trips=[trip])
+    assert first is not None and trip[0] < first <= trip[1]
+    timeline = DayTimeline(build_us_intervals(entries, date(2025, 3, 1)) + [trip])
+    assert timeline.days_as_of(first) == 181
+    assert timeline.days_as_of(first - timedelta(days=1)) == 180
+
+def test_sample_history_crossings_match_timeline():
+    entries = parse_travel_log(SAMPLE_DATA)
+    timeline = DayTimeline(build_us_intervals(entries, date(2025, 4, 21)))
+    for crossing in crossings_for_entries(entries):
+        assert timeline.days_as_of(crossing.first_day) > 180
+        assert timeline.days_as_of(crossing.first_day - timedelta(days=1)) <= 180
+        assert timeline.days_as_of(crossing.last_day + timedelta(days=1)) <= 180
+
+def test_fleet_skips_travelers_under_limit():
+    results = dict(iter_fleet_crossings({"a": SHORT_LOG, "b": LONG_LOG, "c": ""}))
+    assert list(results) == ["b"]
+    assert results["b"][0].peak_days == 244
+    planned = {"a": [(date(2025, 5, 1), date(2025, 9, 1))]}
+    assert list(dict(iter_fleet_crossings({"a": SHORT_LOG}, planned_trips=planned))) == ["a"]
@@ -0,0 +1,179 @@
+import io
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from typing import Callable, Dict, List, NamedTuple, Tuple
+import pytest
+
+from i94calculator.us_days import build_us_intervals, count_us_days, iter_travel_log, parse_travel_log
+from i94calculator.batch import calculate_days_batch
+from i94calculator.cache import LogCache
+from i94calculator.columnar import EntryStore
+from i94calculator.export import calendar_columns
+from i94calculator.incremental import IncrementalCalculator
+from i94calculator.ingest import group_combined_log, iter_partitioned
+from i94calculator.interval_index import IntervalIndex
+from i94calculator.parallel import count_travelers
+from i94calculator.reconcile import count_reconciled_days
+from i94calculator.store import HistoryStore, write_store
+from i94calculator.stream import count_us_days_streaming
+from i94calculator.timeline import DayTimeline
+
+# Differential tests: every engine that counts US days must give the same
+# count as count_us_days on randomized histories. The histories are messy
+# on purpose (repeated Arrivals, Departures with no Arrival, same-day rows,
+# unknown types, stays still open) and their dates cluster around the
+# 'as of' dates and the window starts, where off-by-one errors live (e.g.
+# a stay that begins before the window, see add_window_start_interval).
+#
+# A failure names the engine and the seed; random_log(random.Random(seed))
+# rebuilds the history.
+
+HISTORIES = 250
+WINDOWS = (365, 30, 1)
+TYPES = ["Arrival"] * 10 + ["Departure"] * 10 + ["Parole"]
+AS_OF_DATE = date(2025, 6, 1)
+
+class Case(NamedTuple):
+    traveler_id: str
+    log: str
+    entries: List[Tuple[date, str, str]]
+    dates: List[date]
+
+def random_log(rng: random.Random, window_days: int = 365) -> str:
+    # A pasted log, newest first. Trips mostly alternate, with a few rows
+    # dropped, doubled or given an unknown type.
+    anchors = [AS_OF_DATE, AS_OF_DATE - timedelta(days=window_days)]
+    days = []
+    for _ in range(rng.choice([0, 1, 2, 3, 6, 10, 20])):
+        if rng.random() < 0.5:
+            days.append(rng.choice(anchors) + timedelta(days=rng.randint(-2, 2)))
+        else:
+            days.append(AS_OF_DATE - timedelta(days=rng.randint(-20, 2 * window_days + 30)))
+    days.sort()
+    rows = []
+    typ = rng.choice(["Arrival", "Departure"])
+    for day in days:
+        rows.append((day, typ if rng.random() < 0.8 else rng.choice(TYPES)))
+        typ = "Departure" if typ == "Arrival" else "Arrival"
+    lines = ["Row\tDATE\tTYPE\tLOCATION"]
+    for row, (day, typ) in enumerate(reversed(rows), start=1):
+        lines.append(f"{row}\t{day.isoformat()}\t{typ}\tSFO")
+    return "\n".join(lines)
+
+def query_dates(entries: List[Tuple[date, str, str]], window_days: int) -> List[date]:
+    # The fixed 'as of' date plus the days either side of every row and of
+    # every row's window end
+    dates = {AS_OF_DATE}
+    for day, _, _ in entries:
+        for offset in (-1, 0, 1, window_days - 1, window_days, window_days + 1):
+            dates.add(day + timedelta(days=offset))
+    return sorted(dates)
+
+def make_cases(window_days: int) -> List[Case]:
+    cases = []
+    for seed in range(HISTORIES):
+        log = random_log(random.Random(seed), window_days)
+        entries = parse_travel_log(log)
+        cases.append(Case(f"seed{seed}", log, entries, query_dates(entries, window_days)))
+    return cases
+
+def each_date(count: Callable[[Case, date, int], int]):
+    # Adapts a per-date count to an engine over the whole fleet
+    def engine(cases: List[Case], window_days: int) -> Dict[str, List[int]]:
+        return {case.traveler_id: [count(case, d, window_days) for d in case.dates] for case in cases}
+    return engine
+
+def each_case(counts: Callable[[Case, int], List[int]]):
+    def engine(cases: List[Case], window_days: int) -> Dict[str, List[int]]:
+        return {case.traveler_id: list(counts(case, window_days)) for case in cases}
+    return engine
+
+def incremental_counts(case: Case, window_days: int) -> List[int]:
+    # Rows arrive in paste order (newest first), so nearly every row is
+    # inserted before the existing ones
+    calculator = IncrementalCalculator()
+    for entry in iter_travel_log(case.log):
+        calculator.add(entry)
+    return [calculator.days_as_of(d, window_days) for d in case.dates]
+
+def calendar_counts(case: Case, window_days: int) -> List[int]:
+    first_day = case.dates[0]
+    _, counts = calendar_columns(case.entries, first_day, case.dates[-1], window_days)
+    return [counts[(d - first_day).days] for d in case.dates]
+
+def store_engine(cases: List[Case], window_days: int) -> Dict[str, List[int]]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fleet.i94")
+        write_store(path, [(case.traveler_id, case.entries) for case in cases])
+        with HistoryStore(path) as store:
+            return {case.traveler_id: [store.days_as_of(case.traveler_id, d, window_days) for d in case.dates]
+                    for case in cases}
+
+def combined_log(cases: List[Case]) -> str:
+    # All histories in one export with a traveler ID column, interleaved
+    # round-robin; each traveler's rows stay in paste order
+    lines = ["TRAVELER\tRow\tDATE\tTYPE\tLOCATION"]
+    rows = [[f"{case.traveler_id}\t{line}" for line in case.log.split("\n")[1:]] for case in cases]
+    for i in range(max(map(len, rows))):
+        lines.extend(traveler_rows[i] for traveler_rows in rows if i < len(traveler_rows))
+    return "\n".join(lines)
+
+def grouped_engine(group):
+    def engine(cases: List[Case], window_days: int) -> Dict[str, List[int]]:
+        histories = dict(group(combined_log(cases)))
+        return {case.traveler_id: [count_us_days(histories.get(case.traveler_id, []), d, window_days)
+                                   for d in case.dates] for case in cases}
+    return engine
+
+ENGINES = {
+    "timeline": each_date(lambda case, d, w: DayTimeline(build_us_intervals(case.entries, d)).days_as_of(d, w)),
+    "rolling_counts": each_case(lambda case, w: [
+        DayTimeline(build_us_intervals(case.entries, d)).rolling_counts(d, d, w)[0] for d in case.dates]),
+    "interval_index": each_case(lambda case, w: map(
+        IntervalIndex.from_entries(case.entries).days_as_of, case.dates, [w] * len(case.dates))),
+    "incremental": each_case(incremental_counts),
+    "columnar": each_date(lambda case, d, w: count_us_days(EntryStore.from_entries(case.entries), d, w)),
+    "stream": each_date(lambda case, d, w: count_us_days_streaming(io.BytesIO(case.log.encode()), d, w)),
+    "cache": each_date(lambda case, d, w: LogCache().count_us_days(case.log, d, w)),
+    "reconcile": each_date(lambda case, d, w: count_reconciled_days(case.entries, d, w)),
+    "calendar_columns": each_case(calendar_counts),
+    "batch": each_date(lambda case, d, w: calculate_days_batch({case.traveler_id: case.log}, d, w)[case.traveler_id]),
+    "parallel": each_case(lambda case, w: count_travelers([(case.traveler_id, case.log)], case.dates, w)[0].days),
+    "store": store_engine,
+    "ingest": grouped_engine(group_combined_log),
+    "ingest_partitioned": grouped_engine(lambda source: iter_partitioned(source, partitions=4)),
+}
+
+@pytest.fixture(scope="module", params=WINDOWS)
+def fleet(request):
+    window_days = request.param
+    cases = make_cases(window_days)
+    expected = {case.traveler_id: [count_us_days(case.entries, d, window_days) for d in case.dates]
+                for case in cases}
+    return cases, window_days, expected
+
+@pytest.mark.parametrize("name", sorted(ENGINES))
+def test_engine_matches_count_us_days(fleet, name):
+    cases, window_days, expected = fleet
+    actual = ENGINES[name](cases, window_days)
+    for case in cases:
+        if actual[case.traveler_id] != expected[case.traveler_id]:
+            day = next(d for d, a, e in zip(case.dates, actual[case.traveler_id], expected[case.traveler_id])
+                       if a != e)
+            pytest.fail(f"{name} differs from count_us_days for {case.traveler_id} "
+                        f"(window {window_days}) as of {day}:\n{case.log}")
+
+def test_histories_cover_edge_cases():
+    # Guards the generator: the cases above must keep hitting the messy inputs
+    cases = make_cases(365)
+    window_start = AS_OF_DATE - timedelta(days=365)
+    intervals = [build_us_intervals(case.entries, AS_OF_DATE) for case in cases]
+    assert any(not case.entries for case in cases)
+    assert any(start < window_start < end for found in intervals for start, end in found)
+    assert any(entries[i][0] == entries[i + 1][0] for entries in (c.entries for c in cases)
+               for i in range(len(entries) - 1))
+    assert any(c.entries and c.entries[-1][1] == "Arrival" for c in cases)
+    assert any(e[1] == "Parole" for c in cases for e in c.entries)
+    assert any(c.entries and c.entries[0][1] == "Departure" for c in cases)
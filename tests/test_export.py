@@ -0,0 +1,70 @@
+import csv
+from datetime import date, timedelta
+import pytest
+from i94calculator.us_days import parse_travel_log, count_us_days
+from i94calculator import export
+from i94calculator.export import calendar_columns, export_calendar, main
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+LOG_A = "Row DATE TYPE LOCATION\n1 2024-05-10 Departure NYC\n2 2024-05-01 Arrival NYC"
+HISTORIES = [("alice", parse_travel_log(LOG_A)), ("bob", parse_travel_log(SAMPLE_DATA)), ("carol", [])]
+FIRST_DAY, LAST_DAY = date(2024, 4, 1), date(2025, 5, 31)
+
+def test_columns_match_count_us_days():
+    entries = parse_travel_log(SAMPLE_DATA)
+    in_us, counts = calendar_columns(entries, FIRST_DAY, LAST_DAY)
+    assert len(in_us) == len(counts) == (LAST_DAY - FIRST_DAY).days + 1
+    for k in range(len(counts)):
+        assert counts[k] == count_us_days(entries, FIRST_DAY + timedelta(days=k))
+    # In the US from 2025-04-05 (arrival) to 2025-04-20, out on the departure day
+    offset = (date(2025, 4, 5) - FIRST_DAY).days
+    assert in_us[offset - 1:offset + 17] == b"\0" + b"\1" * 16 + b"\0"
+
+def test_csv_export_in_chunks(tmp_path):
+    path = str(tmp_path / "calendar.csv")
+    assert export_calendar(path, iter(HISTORIES), FIRST_DAY, LAST_DAY, output_format="csv", chunk_rows=100) == "csv"
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    days = (LAST_DAY - FIRST_DAY).days + 1
+    assert len(rows) == 3 * days
+    alice = {row["date"]: row for row in rows if row["traveler"] == "alice"}
+    assert alice["2024-05-01"]["in_us"] == "1" and alice["2024-05-10"]["in_us"] == "0"
+    assert alice["2024-05-10"]["rolling_days"] == "9"
+    assert alice["2024-05-09"]["rolling_days"] == "0"
+
+def test_auto_format_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "pyarrow", None)
+    assert export_calendar(str(tmp_path / "out"), HISTORIES[:1], FIRST_DAY, FIRST_DAY) == "csv"
+    with pytest.raises(RuntimeError):
+        export_calendar(str(tmp_path / "out.parquet"), HISTORIES[:1], FIRST_DAY, FIRST_DAY, output_format="parquet")
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_arrow_formats(tmp_path, output_format):
+    pyarrow = pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"calendar.{output_format}")
+    export_calendar(path, HISTORIES, FIRST_DAY, LAST_DAY, output_format=output_format, chunk_rows=1000)
+    if output_format == "parquet":
+        import pyarrow.parquet
+        table = pyarrow.parquet.read_table(path)
+    else:
+        import pyarrow.ipc
+        table = pyarrow.ipc.open_file(path).read_all()
+    assert table.num_rows == 3 * ((LAST_DAY - FIRST_DAY).days + 1)
+    rows = table.slice(0, 40).to_pylist()
+    assert rows[30] == {"traveler": "alice", "date": date(2024, 5, 1), "in_us": True, "rolling_days": 0}
+
+def test_cli(tmp_path):
+    (tmp_path / "alice.txt").write_text(LOG_A)
+    output = tmp_path / "calendar.csv"
+    assert main([str(output), str(tmp_path / "alice.txt"), "--from", "2024-05-01", "--to", "2024-05-11",
+                 "--format", "csv"]) == 0
+    assert output.read_text().splitlines()[-1] == "alice,2024-05-11,0,9"
+
+def test_cli_rejects_reversed_range(tmp_path, capsys):
+    (tmp_path / "alice.txt").write_text(LOG_A)
+    output = tmp_path / "calendar.csv"
+    with pytest.raises(SystemExit) as exc:
+        main([str(output), str(tmp_path / "alice.txt"), "--from", "2024-05-11", "--to", "2024-05-01"])
+    assert exc.value.code == 2
+    assert "--from must not be after --to" in capsys.readouterr().err
+    assert not output.exists()
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+import pytest
+
+pytest.importorskip("tkinter")
+
+def test_gui_module_defers_tab_imports():
+    code = ("import sys, calculate_us_days_gui; "
+            "print(sorted(m for m in sys.modules if m.startswith(('tabs', 'tkcalendar', 'i94calculator'))))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.stdout.strip() == "[]"
+
+def test_tabs_have_populate_functions():
+    import calculate_us_days_gui
+    for _, module_name, function_name in calculate_us_days_gui.TABS:
+        # Importing a tab module must not need tkcalendar
+        module = __import__(module_name, fromlist=[function_name])
+        assert callable(getattr(module, function_name))
@@ -0,0 +1,106 @@
+from datetime import timedelta
+import pytest
+
+pytest.importorskip("tkinter")
+
+from i94calculator.us_days import count_us_days, parse_travel_log
+from tabs.heatmap_tab import (HeatmapModel, HeatmapView, MAX_WEEK_WIDTH, OUT_COLOR, OVER_COLOR, heatmap_model)
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+class FakeCanvas:
+    # Records the items a HeatmapView creates; xview() is the visible
+    # fraction of the scroll region, as on a Tk canvas
+    def __init__(self, view=(0.0, 0.1)):
+        self.view = view
+        self.items = {}
+        self.scaled = []
+        self.next_id = 0
+
+    def _create(self, kind, *coords, **options):
+        self.next_id += 1
+        self.items[self.next_id] = (kind, options.get("tags", ()))
+        return self.next_id
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", *coords, **options)
+
+    def create_line(self, *coords, **options):
+        return self._create("line", *coords, **options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", *coords, **options)
+
+    def delete(self, tag):
+        self.items = {i: item for i, item in self.items.items() if tag not in item[1]}
+
+    def scale(self, tag, x, y, x_factor, y_factor):
+        self.scaled.append((tag, x_factor, y_factor))
+
+    def configure(self, **options):
+        self.scrollregion = options["scrollregion"]
+
+    def xview(self):
+        return self.view
+
+def test_model_counts_match_count_us_days():
+    entries = parse_travel_log(SAMPLE_DATA)
+    model = HeatmapModel(entries)
+    assert model.first_day.weekday() == 0
+    assert model.last_day.weekday() == 6
+    assert len(model.counts) == 7 * model.weeks
+    for week in range(0, model.weeks, 5):
+        for weekday in (0, 3, 6):
+            day = model.day(week, weekday)
+            assert model.counts[7 * week + weekday] == count_us_days(entries, day)
+    assert model.peak == max(model.counts)
+
+def test_model_colors():
+    model = HeatmapModel(parse_travel_log(SAMPLE_DATA))
+    colors = [model.color(i) for i in range(len(model.counts))]
+    for i, color in enumerate(colors):
+        assert (color == OUT_COLOR) == (not model.in_us[i])
+        if model.counts[i] > model.day_limit and model.in_us[i]:
+            assert color == OVER_COLOR
+    assert model.curve_y(0) > model.curve_y(model.day_limit)
+
+def test_view_draws_only_visible_weeks_once():
+    model = HeatmapModel(parse_travel_log(SAMPLE_DATA))
+    canvas = FakeCanvas(view=(0.0, 0.1))
+    view = HeatmapView(canvas, model)
+    assert canvas.scrollregion[2] == model.weeks * view.week_width
+    drawn = view.redraw()
+    assert 0 < drawn < model.weeks
+    assert set(view.items) == set(view.visible_weeks())
+    assert view.redraw() == 0
+    # Scrolling right only draws the weeks that came into view
+    canvas.view = (0.05, 0.15)
+    count = len(canvas.items)
+    drawn = view.redraw()
+    assert 0 < drawn < len(view.visible_weeks())
+    assert len(canvas.items) - count == sum(len(view.items[w]) for w in list(view.items)[-drawn:])
+
+def test_zoom_rescales_existing_items():
+    model = HeatmapModel(parse_travel_log(SAMPLE_DATA))
+    canvas = FakeCanvas(view=(0.0, 0.2))
+    view = HeatmapView(canvas, model, week_width=10)
+    view.redraw()
+    before = set(view.items)
+    view.zoom(2)
+    assert canvas.scaled == [("heatmap", 2, 1)]
+    assert view.week_width == 20
+    assert canvas.scrollregion[2] == model.weeks * 20
+    assert before <= set(view.items)
+    # Zoom is clamped
+    view.zoom(100)
+    assert view.week_width == MAX_WEEK_WIDTH
+
+def test_new_view_clears_previous_items():
+    canvas = FakeCanvas()
+    HeatmapView(canvas, HeatmapModel(parse_travel_log(SAMPLE_DATA))).redraw()
+    HeatmapView(canvas, HeatmapModel(parse_travel_log(SAMPLE_DATA)))
+    assert len(canvas.items) == 1
+
+def test_heatmap_model_for_empty_log():
+    assert heatmap_model("") is None
+    model = heatmap_model(SAMPLE_DATA)
+    assert model.first_day <= min(e[0] for e in parse_travel_log(SAMPLE_DATA)) < model.first_day + timedelta(days=7)
@@ -0,0 +1,40 @@
+import random
+from datetime import date, timedelta
+from operator import itemgetter
+from i94calculator.us_days import parse_travel_log, build_us_intervals, count_us_days
+from i94calculator.incremental import IncrementalCalculator
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+def test_initial_entries_match_reference():
+    entries = parse_travel_log(SAMPLE_DATA)
+    calculator = IncrementalCalculator(reversed(entries))
+    assert calculator.entries == entries
+    assert calculator.intervals == build_us_intervals(entries, entries[-1][0])
+    assert calculator.days_as_of(date(2025, 6, 1)) == 172
+
+def test_append_rows():
+    calculator = IncrementalCalculator()
+    assert calculator.add_line("1 2024-05-01 Arrival NYC")
+    assert calculator.intervals == []
+    assert not calculator.add_line("bad line")
+    calculator.add_line("2 2024-05-10 Departure NYC")
+    assert calculator.intervals == [(date(2024, 5, 1), date(2024, 5, 10))]
+    assert calculator.days_as_of(date(2024, 6, 1)) == 9
+
+def test_random_inserts_match_reference():
+    rng = random.Random(7)
+    types = ["Arrival", "Arrival", "Departure", "Departure", "Other"]
+    for _ in range(30):
+        calculator = IncrementalCalculator()
+        added = []
+        for _ in range(40):
+            entry = (date(2024, 1, 1) + timedelta(days=rng.randint(0, 60)), rng.choice(types), "SFO")
+            calculator.add(entry)
+            added.append(entry)
+            entries = sorted(added, key=itemgetter(0))
+            assert calculator.entries == entries
+            assert calculator.intervals == build_us_intervals(entries, entries[-1][0])
+        for offset in range(-5, 70, 3):
+            as_of_date = date(2024, 1, 1) + timedelta(days=offset)
+            assert calculator.intervals_as_of(as_of_date) == build_us_intervals(entries, as_of_date)
+            assert calculator.days_as_of(as_of_date, 30) == count_us_days(entries, as_of_date, 30)
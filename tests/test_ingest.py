@@ -0,0 +1,106 @@
+import io
+import pytest
+from datetime import date
+from i94calculator.us_days import parse_travel_log, count_us_days
+from i94calculator.cli import main
+from i94calculator.parallel import TravelerResult
+from i94calculator.store import HistoryStore, write_store
+from i94calculator.ingest import (
+    Columns,
+    detect_columns,
+    group_combined_log,
+    iter_partitioned,
+    iter_traveler_histories,
+    iter_ingested_days
+)
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+LOG_A = "Row DATE TYPE LOCATION\n1 2024-05-10 Departure NYC\n2 2024-05-01 Arrival NYC"
+
+def combine(logs, header="TRAVELER\tRow\tDATE\tTYPE\tLOCATION"):
+    # Interleaves the logs' rows the way a combined export might
+    rows = {traveler_id: log.splitlines()[1:] for traveler_id, log in logs.items()}
+    lines = [header] if header else []
+    for k in range(max(len(r) for r in rows.values())):
+        for traveler_id, traveler_rows in rows.items():
+            if k < len(traveler_rows):
+                lines.append(f"{traveler_id}\t{traveler_rows[k]}")
+    return "\n".join(lines)
+
+LOGS = {"alice": LOG_A, "bob": SAMPLE_DATA, "carol": SAMPLE_DATA + "\n26\t2025-04-21\tArrival\tSEA\n27\tbad row"}
+EXPECTED = {traveler_id: parse_travel_log(log) for traveler_id, log in LOGS.items()}
+
+def test_group_in_memory():
+    groups = group_combined_log(combine(LOGS))
+    assert list(groups) == ["alice", "bob", "carol"]
+    assert groups == EXPECTED
+
+def test_group_without_header():
+    assert group_combined_log(combine(LOGS, header=None)) == EXPECTED
+
+def test_partitioned_matches_in_memory(tmp_path):
+    groups = dict(iter_partitioned(io.StringIO(combine(LOGS)), partitions=2, directory=str(tmp_path)))
+    assert groups == EXPECTED
+    # The spill files are removed afterwards
+    assert list(tmp_path.iterdir()) == []
+
+def test_header_columns():
+    assert detect_columns("Row DATE TYPE LOCATION Employee") == Columns(4, 1, 2, 3)
+    with pytest.raises(ValueError):
+        detect_columns("Row DATE TYPE LOCATION")
+    text = "1 2024-05-01 Arrival NYC alice\n2 2024-05-10 Departure NYC alice"
+    assert group_combined_log(text, Columns(4, 1, 2, 3)) == {"alice": EXPECTED["alice"]}
+
+def test_header_without_location_column():
+    for header in ("TRAVELER Row DATE TYPE PORT", "TRAVELER DATE TYPE"):
+        with pytest.raises(ValueError, match="no LOCATION column"):
+            detect_columns(header)
+    text = "TRAVELER Row DATE TYPE PORT\nalice 1 2024-05-10 Departure NYC\nalice 2 2024-05-01 Arrival NYC"
+    with pytest.raises(ValueError):
+        group_combined_log(text)
+    # Explicit columns still read it
+    assert group_combined_log(text, Columns()) == {"alice": EXPECTED["alice"]}
+
+def test_headerless_ids_that_look_like_headers():
+    # is_header_line alone would take these first rows for headers
+    for traveler_id in ("Rowan", "candidate7"):
+        text = combine({traveler_id: LOG_A}, header=None)
+        assert group_combined_log(text) == {traveler_id: EXPECTED["alice"]}
+        assert group_combined_log(text, Columns()) == {traveler_id: EXPECTED["alice"]}
+
+def test_days_for_every_traveler():
+    as_of_dates = [date(2024, 7, 1), date(2025, 6, 1)]
+    results = list(iter_ingested_days(combine(LOGS), as_of_dates, partitions=3))
+    assert sorted(results) == sorted(
+        TravelerResult(t, tuple(count_us_days(e, d) for d in as_of_dates)) for t, e in EXPECTED.items())
+
+def test_histories_feed_store(tmp_path):
+    path = str(tmp_path / "fleet.i94")
+    write_store(path, iter_traveler_histories(combine(LOGS)))
+    with HistoryStore(path) as store:
+        assert store.entries("carol") == EXPECTED["carol"]
+
+def test_cli_combined(tmp_path, capsys):
+    export = tmp_path / "export.txt"
+    export.write_text(combine(LOGS))
+    assert main([str(export), "--combined", "--partitions", "4", "--as-of", "2024-07-01", "--format", "csv"]) == 0
+    lines = sorted(capsys.readouterr().out.splitlines())
+    assert "alice,2024-07-01,9,171" in lines
+    assert len(lines) == 4
+
+def test_cli_combined_bad_header(tmp_path, capsys, monkeypatch):
+    export = tmp_path / "export.txt"
+    export.write_text(combine(LOGS))
+    bad = tmp_path / "names.txt"
+    bad.write_text("NAME Row DATE TYPE LOCATION\nalice 1 2024-05-10 Departure NYC\n")
+    with pytest.raises(SystemExit) as exc:
+        main([str(export), str(bad), "--combined", "--as-of", "2024-07-01", "--format", "csv"])
+    assert exc.value.code == 2
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "names.txt: no traveler ID column" in captured.err
+    monkeypatch.setattr("sys.stdin", io.StringIO("TRAVELER DATE TYPE\nalice 2024-05-10 Departure\n"))
+    with pytest.raises(SystemExit) as exc:
+        main(["-", "--combined", "--as-of", "2024-07-01"])
+    assert exc.value.code == 2
+    assert "-: no LOCATION column" in capsys.readouterr().err
@@ -0,0 +1,36 @@
+from datetime import date
+from i94calculator import instrumentation
+from i94calculator.instrumentation import instrument
+from i94calculator.us_days import parse_travel_log, count_us_days
+from i94calculator.cli import main
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+def test_records_pipeline_stages():
+    log = SAMPLE_DATA + "\n27\tBADDATE\tArrival\tNYC\nbad line"
+    with instrument() as recorder:
+        count_us_days(parse_travel_log(log), date(2025, 6, 1))
+    stats = recorder.as_dict()
+    assert list(stats) == ["parse", "sort", "build_us_intervals", "calculate_overlap_days"]
+    assert (stats["parse"]["rows_in"], stats["parse"]["rows_out"], stats["parse"]["rejected"]) == (28, 26, 2)
+    assert stats["build_us_intervals"]["rows_in"] == 26
+    assert all(s["calls"] == 1 and s["seconds"] >= 0 for s in stats.values())
+    assert "calculate_overlap_days" in recorder.report()
+
+def test_disabled_outside_block():
+    with instrument() as recorder:
+        pass
+    assert instrumentation.active is None
+    parse_travel_log(SAMPLE_DATA)
+    assert recorder.stages == {}
+
+def test_callback_and_allocations():
+    records = []
+    with instrument(callback=records.append, track_allocations=True):
+        parse_travel_log(SAMPLE_DATA)
+    assert [r.stage for r in records] == ["parse", "sort"]
+    assert records[0].allocated_bytes > 0
+
+def test_cli_profile(tmp_path, capsys):
+    (tmp_path / "alice.txt").write_text(SAMPLE_DATA)
+    main([str(tmp_path), "--as-of", "2025-06-01", "--profile"])
+    assert "build_us_intervals" in capsys.readouterr().err
@@ -0,0 +1,53 @@
+import random
+from datetime import date, timedelta
+from i94calculator.us_days import (
+    parse_travel_log,
+    build_us_intervals,
+    calculate_overlap_days,
+    count_us_days
+)
+from i94calculator.interval_index import IntervalIndex
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+def test_matches_pipeline_for_any_as_of_date():
+    entries = parse_travel_log(SAMPLE_DATA)
+    index = IntervalIndex.from_entries(entries)
+    day = date(2023, 12, 1)
+    while day <= date(2025, 6, 1):
+        assert index.intervals_as_of(day) == build_us_intervals(entries, day)
+        assert index.days_as_of(day) == count_us_days(entries, day)
+        assert index.days_as_of(day, 30) == count_us_days(entries, day, 30)
+        day += timedelta(days=3)
+
+def test_random_histories():
+    rng = random.Random(7)
+    base = date(2020, 1, 1)
+    for _ in range(300):
+        entries = sorted(((base + timedelta(days=rng.randint(0, 700)), rng.choice(["Arrival", "Departure", "Other"]), "X")
+                          for _ in range(rng.randint(0, 25))), key=lambda e: e[0])
+        index = IntervalIndex.from_entries(entries)
+        for _ in range(5):
+            as_of_date = base + timedelta(days=rng.randint(-30, 760))
+            assert index.intervals_as_of(as_of_date) == build_us_intervals(entries, as_of_date)
+            assert index.days_as_of(as_of_date, 180) == count_us_days(entries, as_of_date, 180)
+
+def test_overlap_days_delegation():
+    intervals = build_us_intervals(parse_travel_log(SAMPLE_DATA), date(2025, 6, 1))
+    index = IntervalIndex(intervals)
+    assert index.to_intervals() == intervals
+    for window_start, window_end in [(date(2024, 6, 1), date(2025, 6, 1)), (date(2024, 7, 1), date(2024, 7, 5)),
+                                     (date(2026, 1, 1), date(2026, 2, 1)), (date(2025, 1, 1), date(2024, 1, 1))]:
+        assert calculate_overlap_days(index, window_start, window_end) == \
+            calculate_overlap_days(intervals, window_start, window_end)
+
+def test_overlapping_intervals_are_merged():
+    index = IntervalIndex([(date(2024, 1, 10), date(2024, 1, 20)), (date(2024, 1, 1), date(2024, 1, 15)),
+                           (date(2024, 1, 20), date(2024, 1, 25)), (date(2024, 2, 5), date(2024, 2, 1))])
+    assert index.to_intervals() == [(date(2024, 1, 1), date(2024, 1, 20)), (date(2024, 1, 20), date(2024, 1, 25))]
+    assert index.overlap_days(date(2024, 1, 5), date(2024, 1, 22)) == 17
+
+def test_empty():
+    index = IntervalIndex.from_entries([])
+    assert len(index) == 0
+    assert index.days_as_of(date(2025, 1, 1)) == 0
+    assert index.intervals_as_of(date(2025, 1, 1)) == []
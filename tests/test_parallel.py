@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from i94calculator.us_days import parse_travel_log, count_us_days
+from i94calculator.batch import calculate_days_batch
+from i94calculator.parallel import TravelerResult, calculate_days_parallel, iter_days_parallel
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+LOG_A = "Row DATE TYPE LOCATION\n1 2024-05-10 Departure NYC\n2 2024-05-01 Arrival NYC"
+AS_OF_DATES = [date(2024, 7, 1), date(2025, 6, 1)]
+
+def expected(travel_log):
+    entries = parse_travel_log(travel_log)
+    return tuple(count_us_days(entries, as_of_date) for as_of_date in AS_OF_DATES)
+
+def test_process_pool_keeps_input_order():
+    logs = [(f"t{i}", SAMPLE_DATA if i % 3 else LOG_A) for i in range(50)]
+    results = calculate_days_parallel(logs, AS_OF_DATES, workers=2, chunksize=4)
+    assert [r.traveler_id for r in results] == [traveler_id for traveler_id, _ in logs]
+    assert [r.days for r in results] == [expected(log) for _, log in logs]
+
+def test_bad_log_does_not_stop_batch():
+    logs = {"a": LOG_A, "broken": None, "b": SAMPLE_DATA}
+    results = calculate_days_parallel(logs, AS_OF_DATES, workers=1)
+    assert results[0] == TravelerResult("a", expected(LOG_A))
+    assert results[1].days is None and results[1].error.startswith("TypeError")
+    assert results[2] == TravelerResult("b", expected(SAMPLE_DATA))
+
+def test_custom_executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(iter_days_parallel({"a": LOG_A}, AS_OF_DATES, executor=executor))
+    assert results == [TravelerResult("a", expected(LOG_A))]
+
+def test_batch_with_workers():
+    logs = {"a": LOG_A, "b": SAMPLE_DATA}
+    assert calculate_days_batch(logs, date(2025, 6, 1), workers=2) == calculate_days_batch(logs, date(2025, 6, 1))
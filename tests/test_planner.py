@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from i94calculator.us_days import parse_travel_log, count_us_days
+from i94calculator.planner import TripPlanner, max_trip_end, earliest_trip_start
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+def next_trip_days(entries, trip_start, trip_end):
+    # What the Next Trip tab reports for a trip ending on trip_end
+    entries = entries + [(trip_start, 'Arrival', 'Next Trip Start'), (trip_end, 'Departure', 'Next Trip End')]
+    return count_us_days(entries, trip_end)
+
+def brute_force_fits(entries, trip_start, trip_end):
+    day = trip_start + timedelta(days=1)
+    while day <= trip_end:
+        if next_trip_days(entries, trip_start, day) > 180:
+            return False
+        day += timedelta(days=1)
+    return True
+
+def test_max_trip_end_matches_next_trip_tab():
+    entries = parse_travel_log(SAMPLE_DATA)
+    for trip_start in (date(2025, 4, 25), date(2025, 6, 1), date(2025, 9, 15), date(2026, 3, 1)):
+        trip_end = max_trip_end(entries, trip_start)
+        assert trip_end is not None
+        assert brute_force_fits(entries, trip_start, trip_end)
+        assert not brute_force_fits(entries, trip_start, trip_end + timedelta(days=1))
+
+def test_max_trip_end_without_history():
+    assert max_trip_end([], date(2025, 1, 1)) == date(2025, 6, 30)
+
+def test_max_trip_end_when_no_trip_fits():
+    entries = [(date(2024, 1, 1), 'Arrival', 'SFO'), (date(2024, 6, 29), 'Departure', 'SFO')]
+    assert max_trip_end(entries, date(2024, 7, 1)) is None
+
+def test_earliest_trip_start():
+    entries = parse_travel_log(SAMPLE_DATA)
+    not_before = date(2025, 4, 22)
+    trip_start = earliest_trip_start(entries, 60, not_before)
+    assert brute_force_fits(entries, trip_start, trip_start + timedelta(days=60))
+    day = not_before
+    while day < trip_start:
+        assert not brute_force_fits(entries, day, day + timedelta(days=60))
+        day += timedelta(days=1)
+
+def test_earliest_trip_start_impossible_length():
+    assert earliest_trip_start([], 200, date(2025, 1, 1)) is None
+
+def test_earliest_trip_start_matches_trip_fits():
+    # Against a check of every start day, with short windows so the
+    # history's stays cross many of them
+    entries = parse_travel_log(SAMPLE_DATA)
+    for day_limit, window_days in ((180, 365), (20, 45), (3, 7)):
+        planner = TripPlanner(entries, day_limit, window_days)
+        for trip_days in (0, 1, day_limit // 2, day_limit):
+            for not_before in (date(2024, 1, 1), date(2025, 3, 1), date(2025, 6, 1)):
+                day = not_before
+                while not planner.trip_fits(day, day + timedelta(days=trip_days)):
+                    day += timedelta(days=1)
+                assert planner.earliest_trip_start(trip_days, not_before) == day
+
+def test_peak_days_includes_later_windows():
+    planner = TripPlanner([
+        (date(2025, 3, 1), 'Arrival', 'SFO'),
+        (date(2025, 4, 1), 'Departure', 'SFO')
+    ])
+    assert planner.peak_days(date(2024, 12, 1), date(2025, 1, 1)) == 62
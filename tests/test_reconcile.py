@@ -0,0 +1,91 @@
+import json
+import random
+from datetime import date, timedelta
+import pytest
+from i94calculator.us_days import parse_travel_log, build_us_intervals, count_us_days
+from i94calculator.reconcile import (
+    Anomaly,
+    ReconcilePolicy,
+    STRICT_POLICY,
+    DOUBLE_ARRIVAL,
+    ORPHAN_DEPARTURE,
+    SAME_DAY_PAIR,
+    MISSING_DEPARTURE,
+    UNKNOWN_TYPE,
+    KEEP_LAST,
+    build_reconciled_intervals,
+    count_reconciled_days,
+    iter_fleet_anomalies,
+    main
+)
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+# Newest first, like the sample export: the same-day pair on 07-02 is listed Departure first
+MESSY_LOG = """Row DATE TYPE LOCATION
+-5 2025-07-17 Departure SMF
+-4 2025-07-13 Arrival SMF
+-3 2025-07-02 Departure SMF
+-2 2025-07-02 Arrival SMF
+-1 2025-06-01 Departure SMF
+0 2025-05-22 Arrival SFO
+1 2025-05-01 Arrival SFO
+2 2025-04-20 Other SFO"""
+
+def test_default_policy_matches_build_us_intervals():
+    rng = random.Random(11)
+    base = date(2024, 1, 1)
+    for _ in range(500):
+        entries = sorted(((base + timedelta(days=rng.randint(0, 200)), rng.choice(["Arrival", "Departure", "Other"]), "X")
+                          for _ in range(rng.randint(0, 15))), key=lambda e: e[0])
+        as_of_date = base + timedelta(days=rng.randint(-5, 210))
+        assert build_reconciled_intervals(entries, as_of_date).intervals == build_us_intervals(entries, as_of_date)
+        assert count_reconciled_days(entries, as_of_date, 90) == count_us_days(entries, as_of_date, 90)
+
+def test_anomalies_are_reported():
+    entries = parse_travel_log(MESSY_LOG)
+    result = build_reconciled_intervals(entries, date(2025, 8, 1))
+    assert [(a.kind, a.date) for a in result.anomalies] == [
+        (UNKNOWN_TYPE, date(2025, 4, 20)),
+        (DOUBLE_ARRIVAL, date(2025, 5, 22)),
+        (SAME_DAY_PAIR, date(2025, 7, 2)),
+        (ORPHAN_DEPARTURE, date(2025, 7, 2)),
+        (DOUBLE_ARRIVAL, date(2025, 7, 13)),
+    ]
+    assert result.intervals == [(date(2025, 5, 1), date(2025, 6, 1)), (date(2025, 7, 2), date(2025, 7, 17))]
+
+def test_policies():
+    entries = parse_travel_log(MESSY_LOG)
+    strict = build_reconciled_intervals(entries, date(2025, 8, 1), STRICT_POLICY)
+    assert strict.intervals == [(date(2025, 5, 1), date(2025, 6, 1)), (date(2025, 7, 2), date(2025, 7, 2)),
+                                (date(2025, 7, 13), date(2025, 7, 17))]
+    keep_last = build_reconciled_intervals(entries, date(2025, 8, 1), ReconcilePolicy(double_arrival=KEEP_LAST))
+    assert keep_last.intervals[0] == (date(2025, 5, 22), date(2025, 6, 1))
+    open_stay = build_reconciled_intervals(entries, date(2025, 7, 15), STRICT_POLICY)
+    assert open_stay.anomalies[-1] == Anomaly(MISSING_DEPARTURE, date(2025, 7, 13), 6, "open on 2025-07-15")
+    assert open_stay.intervals[-1] == (date(2025, 7, 13), date(2025, 7, 15))
+    with pytest.raises(ValueError):
+        build_reconciled_intervals(entries, date(2025, 8, 1), ReconcilePolicy(open_stay="sometimes"))
+
+def test_missing_departure_reports_opening_row():
+    entries = [(date(2025, 1, 1), "Arrival", "SFO"), (date(2025, 1, 5), "Arrival", "SFO"),
+               (date(2025, 1, 9), "Parole", "SFO")]
+    first = build_reconciled_intervals(entries, date(2025, 2, 1))
+    assert first.anomalies[-1] == Anomaly(MISSING_DEPARTURE, date(2025, 1, 1), 0, "open on 2025-02-01")
+    last = build_reconciled_intervals(entries, date(2025, 2, 1), ReconcilePolicy(double_arrival=KEEP_LAST))
+    assert last.anomalies[-1] == Anomaly(MISSING_DEPARTURE, date(2025, 1, 5), 1, "open on 2025-02-01")
+
+def test_cli_rejects_bad_date(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main([str(tmp_path), "--as-of", "2025-13-01"])
+    assert exc.value.code == 2
+    assert "invalid date" in capsys.readouterr().err
+
+def test_fleet_and_cli(tmp_path, capsys):
+    logs = {"clean": SAMPLE_DATA, "messy": MESSY_LOG}
+    assert [t for t, _ in iter_fleet_anomalies(logs, date(2025, 8, 1))] == ["messy"]
+    for traveler_id, log in logs.items():
+        (tmp_path / f"{traveler_id}.txt").write_text(log)
+    assert main([str(tmp_path), "--as-of", "2025-08-01"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert {row["traveler"] for row in rows} == {"messy"}
+    assert rows[0] == {"traveler": "messy", "kind": UNKNOWN_TYPE, "date": "2025-04-20", "row": 0, "detail": "Other"}
@@ -0,0 +1,71 @@
+from datetime import date
+from i94calculator.us_days import parse_travel_log, build_us_intervals, count_us_days
+from i94calculator.rules import (
+    Rule,
+    ROLLING_180_IN_365,
+    SUBSTANTIAL_PRESENCE,
+    CALENDAR_YEAR_TOTAL,
+    evaluate_rules,
+    evaluate_rules_for_entries
+)
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+def test_rolling_rule_matches_count_us_days():
+    entries = parse_travel_log(SAMPLE_DATA)
+    for as_of_date in (date(2024, 6, 1), date(2025, 6, 1)):
+        result = evaluate_rules_for_entries(entries, as_of_date, [ROLLING_180_IN_365])[0]
+        assert result.period_days == (count_us_days(entries, as_of_date),)
+        assert result.met == (result.total > 180)
+
+def test_substantial_presence():
+    intervals = [
+        (date(2022, 1, 1), date(2022, 12, 31)),
+        (date(2023, 1, 1), date(2023, 4, 10)),
+        (date(2024, 3, 1), date(2024, 4, 30))
+    ]
+    result = evaluate_rules(intervals, date(2025, 1, 1), [SUBSTANTIAL_PRESENCE])[0]
+    # Departure days count: 61, 100 and 365 days in 2024, 2023 and 2022
+    assert result.period_days == (61, 100, 365)
+    assert round(result.total, 6) == round(61 + 100 / 3 + 365 / 6, 6)
+    assert result.met is False
+
+def test_substantial_presence_exactly_at_threshold():
+    # 31 + 292/3 + 328/6 is exactly 183, which float weights summed to just under it
+    intervals = [
+        (date(2023, 1, 1), date(2023, 11, 24)),
+        (date(2024, 1, 1), date(2024, 10, 18)),
+        (date(2025, 1, 1), date(2025, 1, 31)),
+    ]
+    result = evaluate_rules(intervals, date(2025, 12, 31), [SUBSTANTIAL_PRESENCE])[0]
+    assert result.period_days == (31, 292, 328)
+    assert result.total == 183
+    assert result.met is True
+
+def test_same_day_reentry_counts_once():
+    split = [(date(2025, 3, 1), date(2025, 3, 10)), (date(2025, 3, 10), date(2025, 3, 20))]
+    continuous = [(date(2025, 3, 1), date(2025, 3, 20))]
+    as_of_date = date(2026, 1, 1)
+    assert evaluate_rules(split, as_of_date, [SUBSTANTIAL_PRESENCE])[0].period_days[0] == 20
+    assert evaluate_rules(split, as_of_date, [SUBSTANTIAL_PRESENCE]) == \
+        evaluate_rules(continuous, as_of_date, [SUBSTANTIAL_PRESENCE])
+
+def test_substantial_presence_needs_31_current_days():
+    intervals = [(date(2022, 1, 1), date(2023, 12, 31)), (date(2024, 1, 1), date(2024, 1, 30))]
+    result = evaluate_rules(intervals, date(2025, 1, 1), [SUBSTANTIAL_PRESENCE])[0]
+    assert result.total >= 183
+    assert result.met is False
+
+def test_calendar_year_total_is_clipped_to_as_of_date():
+    intervals = [(date(2024, 12, 20), date(2025, 1, 10))]
+    result = evaluate_rules(intervals, date(2025, 1, 5), [CALENDAR_YEAR_TOTAL])[0]
+    assert result.period_days == (4,)
+    assert result.met is None
+
+def test_results_in_rule_order():
+    entries = parse_travel_log(SAMPLE_DATA)
+    custom = Rule("90 in 180", threshold=91, window_days=180, weights=(1, 1))
+    results = evaluate_rules(build_us_intervals(entries, date(2025, 6, 1)), date(2025, 6, 1),
+                             [custom, ROLLING_180_IN_365])
+    assert [r.name for r in results] == ["90 in 180", "180 days in 365"]
+    assert len(results[0].period_days) == 2
+    assert sum(results[0].period_days) == results[1].period_days[0]
@@ -0,0 +1,66 @@
+import random
+from datetime import date, timedelta
+import pytest
+from i94calculator.us_days import parse_travel_log, build_us_intervals
+from i94calculator.timeline import DayTimeline
+from i94calculator.planner import TripPlanner
+from i94calculator.scenarios import Plan, ScenarioEvaluator, evaluate_plans
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+SHORT_LOG = "Row DATE TYPE LOCATION\n1 2025-03-01 Departure NYC\n2 2024-11-01 Arrival NYC"
+
+def brute_force(entries, plan, day_limit=180, window_days=365):
+    # Rebuilds the full timeline with the plan's trips added, day by day
+    timeline = DayTimeline(build_us_intervals(entries, max(e[0] for e in entries)) + list(plan.trips))
+    day = min(start for start, _ in plan.trips) + timedelta(days=1)
+    last_day = max(end for _, end in plan.trips) + timedelta(days=window_days)
+    counts = []
+    while day <= last_day:
+        counts.append((day, timeline.days_as_of(day, window_days)))
+        day += timedelta(days=1)
+    peak_days = max(count for _, count in counts)
+    peak_day = next(day for day, count in counts if count == peak_days)
+    violation = next((day for day, count in counts if count > day_limit), None)
+    return peak_days, peak_day, violation
+
+def test_matches_brute_force():
+    entries = parse_travel_log(SHORT_LOG)
+    rng = random.Random(3)
+    plans = []
+    for k in range(20):
+        trips = []
+        start = date(2025, 3, 1) + timedelta(days=rng.randint(0, 60))
+        for _ in range(rng.randint(1, 4)):
+            end = start + timedelta(days=rng.randint(1, 80))
+            trips.append((start, end))
+            start = end + timedelta(days=rng.randint(1, 60))
+        plans.append(Plan(f"plan{k}", tuple(trips)))
+    evaluator = ScenarioEvaluator(entries)
+    for result in evaluator.evaluate_all(plans, ranked=False):
+        plan = next(p for p in plans if p.name == result.name)
+        assert (result.peak_days, result.peak_day, result.first_violation) == brute_force(entries, plan)
+        assert result.days_remaining == max(180 - result.peak_days, 0)
+
+def test_ranking():
+    entries = parse_travel_log(SHORT_LOG)
+    results = evaluate_plans(entries, {
+        "long": [(date(2025, 5, 1), date(2025, 9, 1))],
+        "short": [(date(2025, 5, 1), date(2025, 5, 10))],
+        "two trips": [(date(2025, 5, 1), date(2025, 5, 20)), (date(2025, 7, 1), date(2025, 7, 20))],
+    })
+    assert [r.name for r in results] == ["short", "two trips", "long"]
+    assert results[0].fits and not results[-1].fits
+
+def test_single_trip_matches_planner():
+    entries = parse_travel_log(SAMPLE_DATA)
+    trip = (date(2025, 6, 1), date(2025, 6, 20))
+    result = ScenarioEvaluator(entries).evaluate(Plan("june", (trip,)))
+    assert result.peak_days == TripPlanner(entries).peak_days(*trip)
+
+def test_invalid_plans():
+    evaluator = ScenarioEvaluator(parse_travel_log(SHORT_LOG))
+    with pytest.raises(ValueError):
+        evaluator.evaluate(Plan("empty", ()))
+    with pytest.raises(ValueError):
+        evaluator.evaluate(Plan("backwards", ((date(2025, 6, 2), date(2025, 6, 1)),)))
+    assert evaluator.evaluate_all([]) == []
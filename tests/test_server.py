@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from i94calculator.us_days import parse_travel_log, count_us_days
+from i94calculator.server import DayCountServer
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+LOG_A = "Row DATE TYPE LOCATION\n1 2024-05-10 Departure NYC\n2 2024-05-01 Arrival NYC"
+
+async def request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if payload is None or isinstance(payload, bytes):
+        body = payload or b""
+    else:
+        body = json.dumps(payload).encode("utf-8")
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(data)
+
+def run_with_server(scenario, executor=None):
+    async def main():
+        server = DayCountServer(port=0, executor=executor)
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+def test_days_matches_count_us_days():
+    async def scenario(server):
+        return await request(server.port, "POST", "/days", {"log": SAMPLE_DATA, "as_of": "2025-06-01"})
+    status, payload = run_with_server(scenario)
+    assert status == 200
+    assert payload == {"days": count_us_days(parse_travel_log(SAMPLE_DATA), date(2025, 6, 1))}
+
+def test_batch_with_several_dates():
+    async def scenario(server):
+        return await request(server.port, "POST", "/batch", {
+            "logs": {"a": LOG_A, "b": SAMPLE_DATA}, "as_of": ["2024-07-01", "2025-06-01"], "window_days": 365})
+    status, payload = run_with_server(scenario)
+    assert status == 200
+    assert [r["traveler"] for r in payload["results"]] == ["a", "b"]
+    expected_b = [count_us_days(parse_travel_log(SAMPLE_DATA), d) for d in (date(2024, 7, 1), date(2025, 6, 1))]
+    assert payload["results"][0]["days"] == [9, 0]
+    assert payload["results"][1]["days"] == expected_b
+
+def test_errors():
+    async def scenario(server):
+        return [
+            await request(server.port, "POST", "/days", b"not json"),
+            await request(server.port, "POST", "/days", {"log": LOG_A, "as_of": "June 1"}),
+            await request(server.port, "GET", "/days"),
+            await request(server.port, "POST", "/nope", {}),
+            await request(server.port, "GET", "/health"),
+        ]
+    statuses = [status for status, _ in run_with_server(scenario)]
+    assert statuses == [400, 400, 405, 404, 200]
+
+def test_keep_alive_connection_serves_several_requests():
+    async def scenario(server):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        body = json.dumps({"log": LOG_A, "as_of": "2024-07-01"}).encode("utf-8")
+        results = []
+        for _ in range(3):
+            writer.write(f"POST /days HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            results.append(json.loads(await reader.readexactly(length)))
+        writer.close()
+        return results
+    assert run_with_server(scenario) == [{"days": 9}] * 3
+
+class SlowExecutor(ThreadPoolExecutor):
+    # Holds each calculation long enough for identical requests to overlap
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.submitted = 0
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        with self.lock:
+            self.submitted += 1
+        def slow():
+            time.sleep(0.2)
+            return fn(*args, **kwargs)
+        return super().submit(slow)
+
+def test_identical_requests_are_coalesced():
+    executor = SlowExecutor()
+    async def scenario(server):
+        payload = {"log": SAMPLE_DATA, "as_of": "2025-06-01"}
+        results = await asyncio.gather(*(request(server.port, "POST", "/days", payload) for _ in range(5)))
+        return results, server.coalesced
+    with executor:
+        results, coalesced = run_with_server(scenario, executor)
+    assert len({json.dumps(payload) for _, payload in results}) == 1
+    assert executor.submitted == 1
+    assert coalesced == 4
+
+async def raw_request(port, data):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(body)
+
+def test_negative_content_length():
+    async def scenario(server):
+        return await raw_request(server.port, b"POST /days HTTP/1.1\r\nContent-Length: -5\r\n"
+                                              b"Connection: close\r\n\r\n")
+    status, payload = run_with_server(scenario)
+    assert status == 400 and payload == {"error": "invalid Content-Length"}
+
+class BrokenExecutor(ThreadPoolExecutor):
+    def submit(self, fn, *args, **kwargs):
+        raise RuntimeError("pool is broken")
+
+def test_executor_failure_is_a_server_error():
+    async def scenario(server):
+        return await request(server.port, "POST", "/days", {"log": LOG_A, "as_of": "2024-07-01"})
+    with BrokenExecutor() as executor:
+        status, payload = run_with_server(scenario, executor)
+    assert status == 500
+    assert payload == {"error": "RuntimeError: pool is broken"}
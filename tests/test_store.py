@@ -0,0 +1,88 @@
+import pytest
+from datetime import date
+from i94calculator.us_days import parse_travel_log, build_us_intervals, count_us_days
+from i94calculator.batch import calculate_days_batch
+from i94calculator.cli import main
+from i94calculator.parallel import TravelerResult
+from i94calculator import store as store_module
+from i94calculator.store import (
+    HistoryStore,
+    build_store,
+    write_store,
+    iter_days_from_store,
+    calculate_days_from_store
+)
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+LOG_A = "Row DATE TYPE LOCATION\n1 2024-05-10 Departure NYC\n2 2024-05-01 Arrival NYC"
+LOGS = {"bob": SAMPLE_DATA, "alice": LOG_A, "émile": "", "zoe": SAMPLE_DATA + "\n26\t2025-05-01\tArrival\tSEA"}
+AS_OF_DATES = [date(2024, 1, 1), date(2024, 7, 1), date(2025, 5, 20), date(2026, 1, 1)]
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = str(tmp_path / "histories.i94")
+    assert build_store(path, LOGS) == len(LOGS)
+    return path
+
+def test_round_trip(store_path):
+    with HistoryStore(store_path) as store:
+        assert len(store) == 4
+        assert list(store) == ["alice", "bob", "zoe", "émile"]
+        assert store.entry_count == sum(len(parse_travel_log(log)) for log in LOGS.values())
+        for traveler_id, log in LOGS.items():
+            entries = parse_travel_log(log)
+            assert store.entries(traveler_id) == entries
+            for as_of_date in AS_OF_DATES:
+                assert store.intervals_as_of(traveler_id, as_of_date) == build_us_intervals(entries, as_of_date)
+                assert store.days_as_of(traveler_id, as_of_date, 180) == count_us_days(entries, as_of_date, 180)
+
+def test_lookup(store_path):
+    with HistoryStore(store_path) as store:
+        assert "bob" in store and "carol" not in store
+        with pytest.raises(KeyError):
+            store.entries("carol")
+        days, types, locations = store.entry_columns("alice")
+        assert list(days) == [date(2024, 5, 1).toordinal(), date(2024, 5, 10).toordinal()]
+        del days, types, locations
+
+def test_batch_queries(store_path):
+    with HistoryStore(store_path) as store:
+        results = list(iter_days_from_store(store, AS_OF_DATES, traveler_ids=["zoe", "carol"]))
+    entries = parse_travel_log(LOGS["zoe"])
+    assert results == [TravelerResult("zoe", tuple(count_us_days(entries, d) for d in AS_OF_DATES)),
+                       TravelerResult("carol", None, "not in store")]
+    assert calculate_days_from_store(store_path, date(2025, 6, 1)) == calculate_days_batch(LOGS, date(2025, 6, 1))
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_store"
+    path.write_bytes(b"Row DATE TYPE LOCATION\n" * 4)
+    with pytest.raises(ValueError):
+        HistoryStore(str(path))
+
+def test_duplicate_traveler_ids_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_store(str(tmp_path / "dup.i94"), [("alice", []), ("alice", parse_travel_log(LOG_A))])
+
+def test_rejects_histories_over_uint32_offsets(tmp_path, monkeypatch):
+    monkeypatch.setattr(store_module, "UINT32_MAX", 20)
+    with pytest.raises(ValueError, match="too many entries"):
+        write_store(str(tmp_path / "big.i94"), {"bob": parse_travel_log(SAMPLE_DATA)})
+
+def test_empty_store(tmp_path):
+    path = str(tmp_path / "empty.i94")
+    write_store(path, {})
+    with HistoryStore(path) as store:
+        assert len(store) == 0 and "alice" not in store
+
+def test_cli_reads_store(store_path, capsys):
+    assert main(["--store", store_path, "alice", "--as-of", "2024-07-01", "--format", "csv"]) == 0
+    assert capsys.readouterr().out == "traveler,as_of,days,days_remaining\nalice,2024-07-01,9,171\n"
+
+@pytest.mark.parametrize("content", [b"", b"not a travel history store\n" * 4])
+def test_cli_rejects_non_store_file(tmp_path, capsys, content):
+    path = tmp_path / "bad.i94"
+    path.write_bytes(content)
+    with pytest.raises(SystemExit) as exc:
+        main(["--store", str(path), "--as-of", "2024-07-01"])
+    assert exc.value.code == 2
+    assert "not a travel history store" in capsys.readouterr().err
@@ -0,0 +1,59 @@
+import io
+from datetime import date
+import pytest
+from i94calculator.us_days import parse_travel_log, build_us_intervals, count_us_days
+from i94calculator.stream import (
+    iter_sorted_travel_log,
+    iter_us_intervals,
+    stream_us_intervals,
+    count_us_days_streaming
+)
+
+NEWEST_FIRST = ("Row\tDATE\tTYPE\tLOCATION\n"
+                "1\t2024-05-20\tDeparture\tSFO\n"
+                "2\t2024-05-10\tDeparture\tSFO\n"
+                "3\t2024-05-10\tArrival\tSFO\n"
+                "4\tBADDATE\tArrival\tSFO\n"
+                "5\t2024-05-01\tArrival\tNYC\n")
+
+def test_newest_first_file_matches_parse_travel_log(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_text(NEWEST_FIRST)
+    assert list(iter_sorted_travel_log(str(path))) == parse_travel_log(NEWEST_FIRST)
+
+def test_oldest_first_file_without_header(tmp_path):
+    log = "\n1 2024-05-01 Arrival NYC\n2 2024-05-10 Departure NYC"
+    path = tmp_path / "log.txt"
+    path.write_text(log)
+    assert list(iter_sorted_travel_log(path)) == parse_travel_log(log)
+
+def test_sample_data_matches_reference():
+    with open("sample_data.txt") as f:
+        text = f.read()
+    entries = parse_travel_log(text)
+    for as_of_date in (date(2024, 1, 1), date(2024, 6, 15), date(2025, 6, 1), date(2025, 8, 1)):
+        assert list(stream_us_intervals("sample_data.txt", as_of_date)) == build_us_intervals(entries, as_of_date)
+        assert count_us_days_streaming("sample_data.txt", as_of_date) == count_us_days(entries, as_of_date)
+
+def test_non_seekable_text_stream():
+    assert list(iter_sorted_travel_log(io.StringIO(NEWEST_FIRST))) == parse_travel_log(NEWEST_FIRST)
+
+def test_empty_source(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+    assert list(iter_sorted_travel_log(path)) == []
+    assert list(iter_sorted_travel_log(io.BytesIO(b"Row DATE TYPE LOCATION\n"))) == []
+
+def test_unsorted_log_raises():
+    log = "1 2024-05-10 Arrival NYC\n2 2024-05-01 Departure NYC\n3 2024-05-20 Arrival NYC"
+    with pytest.raises(ValueError):
+        list(iter_sorted_travel_log(io.StringIO(log)))
+
+def test_iter_us_intervals_stops_at_as_of_date():
+    entries = iter([
+        (date(2024, 1, 1), "Arrival", "NYC"),
+        (date(2024, 1, 10), "Departure", "NYC"),
+        (date(2024, 2, 1), "Arrival", "NYC"),
+        (date(2024, 2, 10), "Departure", "NYC"),
+    ])
+    assert list(iter_us_intervals(entries, date(2024, 2, 5))) == [(date(2024, 1, 1), date(2024, 1, 10))]
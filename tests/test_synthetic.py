@@ -0,0 +1,25 @@
+from i94calculator.us_days import parse_travel_log
+from benchmarks.synthetic import HEADER, generate_log, generate_fleet
+
+def test_generate_log_is_reproducible():
+    assert generate_log(seed=3) == generate_log(seed=3)
+    assert generate_log(seed=3) != generate_log(seed=4)
+
+def test_generate_log_parses_cleanly():
+    log = generate_log(seed=1, trips_per_year=10, years=4)
+    lines = log.split("\n")
+    assert lines[0] == HEADER
+    entries = parse_travel_log(log)
+    assert len(entries) == len(lines) - 1
+    assert [typ for _, typ, _ in entries[:4]] == ["Arrival", "Departure", "Arrival", "Departure"]
+
+def test_malformed_rows_are_rejected():
+    log = generate_log(seed=2, trips_per_year=12, years=10, malformed_rate=0.2)
+    rows = len(log.split("\n")) - 1
+    rejected = rows - len(parse_travel_log(log))
+    assert 0.1 * rows < rejected < 0.3 * rows
+
+def test_generate_fleet():
+    fleet = generate_fleet(5, seed=0, years=2)
+    assert list(fleet) == [f"traveler{i:06d}" for i in range(5)]
+    assert len(set(fleet.values())) == 5
@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+from i94calculator.us_days import parse_travel_log, build_us_intervals, calculate_overlap_days
+from i94calculator.timeline import DayTimeline
+from tests.test_next_trip_tab import SAMPLE_DATA
+
+def test_days_in_window_matches_calculate_overlap_days():
+    intervals = build_us_intervals(parse_travel_log(SAMPLE_DATA), date(2025, 6, 1))
+    timeline = DayTimeline(intervals)
+    day = date(2023, 11, 1)
+    while day < date(2026, 3, 1):
+        for window_days in (1, 30, 365):
+            window_start = day - timedelta(days=window_days)
+            assert timeline.days_in_window(window_start, day) == calculate_overlap_days(intervals, window_start, day)
+        day += timedelta(days=7)
+
+def test_days_as_of_sample():
+    intervals = build_us_intervals(parse_travel_log(SAMPLE_DATA), date(2025, 6, 1))
+    assert DayTimeline(intervals).days_as_of(date(2025, 6, 1)) == 172
+
+def test_rolling_counts_matches_days_as_of():
+    intervals = [
+        (date(2024, 1, 1), date(2024, 2, 1)),
+        (date(2024, 3, 1), date(2024, 4, 1))
+    ]
+    timeline = DayTimeline(intervals)
+    first_day = date(2023, 12, 1)
+    counts = timeline.rolling_counts(first_day, date(2025, 6, 1), window_days=60)
+    assert len(counts) == (date(2025, 6, 1) - first_day).days + 1
+    for k, count in enumerate(counts):
+        assert count == timeline.days_as_of(first_day + timedelta(days=k), window_days=60)
+
+def test_overlapping_intervals_counted_like_calculate_overlap_days():
+    intervals = [
+        (date(2024, 1, 1), date(2024, 1, 20)),
+        (date(2024, 1, 10), date(2024, 1, 15))
+    ]
+    timeline = DayTimeline(intervals)
+    assert timeline.days_in_window(date(2024, 1, 1), date(2024, 2, 1)) == 24
+    assert timeline.is_in_us(date(2024, 1, 19))
+    assert not timeline.is_in_us(date(2024, 1, 20))
+
+def test_empty_timeline():
+    timeline = DayTimeline([])
+    assert timeline.first_day is None
+    assert timeline.days_as_of(date(2024, 5, 1)) == 0
+    assert list(timeline.rolling_counts(date(2024, 1, 1), date(2024, 1, 3))) == [0, 0, 0]
@@ -1,7 +1,9 @@
 from datetime import date
 import pytest
 from i94calculator.us_days import (
+    parse_iso_date,
     parse_travel_log_line,
+    iter_travel_log,
     parse_travel_log,
     build_us_intervals,
     add_window_start_interval,
@@ -162,6 +164,36 @@ def test_calculate_overlap_days_multiple_partial_overlaps():
     # 2024-05-01 to 2024-05-05 (4 days), 2024-05-10 to 2024-05-15 (5 days)
     assert days == 9
 
+def test_parse_iso_date():
+    assert parse_iso_date("2024-05-01") == date(2024, 5, 1)
+    assert parse_iso_date("2024-5-1") == date(2024, 5, 1)
+    assert parse_iso_date("2024-02-30") is None
+    assert parse_iso_date("BADDATE") is None
+
+def test_parse_travel_log_line_interns_strings():
+    first = parse_travel_log_line("1 2024-05-01 Arrival " + "".join(["N", "YC"]))
+    second = parse_travel_log_line("2 2024-05-02 Arrival " + "".join(["NY", "C"]))
+    assert first[2] is second[2]
+
+def test_iter_travel_log_from_lines():
+    lines = iter(["\n", "Row DATE TYPE LOCATION\n", "1 2024-05-10 Departure NYC\n", "bad\n", "2 2024-05-01 Arrival NYC\n"])
+    assert list(iter_travel_log(lines)) == [
+        (date(2024, 5, 10), "Departure", "NYC"),
+        (date(2024, 5, 1), "Arrival", "NYC")
+    ]
+
+def test_iter_travel_log_header_only_on_first_line():
+    log = "1 2024-05-10 Departure NYC\nRow DATE TYPE LOCATION"
+    assert list(iter_travel_log(log)) == [(date(2024, 5, 10), "Departure", "NYC")]
+
+def test_parse_travel_log_keeps_input_order_for_same_day():
+    log = "1 2024-05-02 Departure SFO\n2 2024-05-02 Arrival SFO\n3 2024-05-01 Arrival SFO"
+    assert parse_travel_log(log) == [
+        (date(2024, 5, 1), "Arrival", "SFO"),
+        (date(2024, 5, 2), "Departure", "SFO"),
+        (date(2024, 5, 2), "Arrival", "SFO")
+    ]
+
 # To run all tests, use the command:
 # pytest tests/test_us_days.py
 